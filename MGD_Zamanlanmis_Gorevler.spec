@@ -3,7 +3,8 @@ from PyInstaller.utils.hooks import collect_all
 
 datas = []
 binaries = []
-hiddenimports = []
+# Lazy import edilen modüller (importlib ile yüklendikleri için analiz göremez)
+hiddenimports = ['requests', 'pystray', 'PIL.Image', 'PIL.ImageDraw', 'plyer', 'plyer.platforms.win.notification']
 tmp_ret = collect_all('telegram')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 tmp_ret = collect_all('selenium')
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# benchmark.py - Performans Ölçüm Scripti
+"""
+MGD Task Scheduler Pro v4.0 - Benchmark
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Görev veritabanı formatlarının yükleme/kaydetme sürelerini, görev süreci
+başlatma gecikmesini ve zamanlayıcının yük altındaki davranışını ölçer.
+
+Kullanım:
+    python benchmark.py                       # 1k / 10k / 100k görev
+    python benchmark.py --sizes 1000 5000     # Özel boyutlar
+    python benchmark.py --spawn               # Süreç başlatma yöntemleri (--spawn-runs 200)
+    python benchmark.py --load                # Yük simülasyonu: 1000 görev aynı dakikada, sahte executor
+    python benchmark.py --load --load-tasks 100 --executor echo   # Gerçek süreçlerle 100 eşzamanlı çalıştırma
+    python benchmark.py --json sonuc.json     # Sonuçları JSON'a yaz (sürümler arası karşılaştırma için)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import threading
+import argparse
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from config import AppConfig, TASK_CATEGORIES, FREQUENCY_TYPES
+from task_repository import TaskRepository
+from task_storage import available_backends
+from task_history import TaskHistoryRecord
+from scheduler_service import SchedulerService
+from spawn_server import SpawnServer, SPAWN_SERVER_AVAILABLE
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def make_synthetic_tasks(count: int):
+    """Gerçekçi alanlara sahip sentetik görev listesi üret."""
+    now = datetime.now()
+    tasks = []
+    for i in range(count):
+        start = now + timedelta(minutes=i % 1440)
+        tasks.append({
+            "id": str(uuid4()), "name": f"Görev {i:06d}", "path": f"C:\\Scripts\\job_{i:06d}.py",
+            "start": start.strftime("%d.%m.%Y %H:%M"),
+            "end": (start + timedelta(days=365)).strftime("%d.%m.%Y %H:%M"),
+            "freq_type": FREQUENCY_TYPES[i % len(FREQUENCY_TYPES)], "freq_val": 1 + i % 12,
+            "last_run": "Bekliyor", "next_run": start.strftime("%d.%m.%Y %H:%M"), "status": "idle",
+            "paused": False, "category": TASK_CATEGORIES[i % len(TASK_CATEGORIES)],
+            "priority": 1 + i % 4, "run_count": i, "success_count": i, "fail_count": 0,
+            "max_retries": 3, "retry_delay": 60, "current_retry": 0, "last_error": "",
+            "telegram_notify": True
+        })
+    return tasks
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def _percentiles(samples_ms):
+    """p50/p95/p99/max (ms) - boş listede None."""
+    if not samples_ms:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    ordered = sorted(samples_ms)
+
+    def pick(ratio):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * ratio))], 3)
+
+    return {"p50_ms": round(statistics.median(ordered), 3), "p95_ms": pick(0.95),
+            "p99_ms": pick(0.99), "max_ms": round(ordered[-1], 3)}
+
+
+def _rss_mb():
+    """Sürecin bellek kullanımı (MB): Linux'ta anlık, diğer Unix'lerde tepe değer; ölçülemezse None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+    except ImportError:
+        return None
+
+
+def bench_storage(sizes, backends):
+    """Her format ve boyut için save/load sürelerini ölç."""
+    results = []
+    for size in sizes:
+        tasks = make_synthetic_tasks(size)
+        for backend in backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                config = AppConfig(
+                    tasks_db=str(Path(tmp) / "tasks.json"),
+                    backups_dir=str(Path(tmp) / "backups"),
+                    tasks_storage=backend,
+                    auto_backup=False
+                )
+                repo = TaskRepository(config)
+                save_time, _ = _timed(repo.save_tasks, tasks)
+                load_time, loaded = _timed(repo.load_tasks)
+                # SQLite için -wal dosyası da dahil
+                file_size = sum(f.stat().st_size for f in Path(tmp).glob(f"{repo.db_path.name}*"))
+                repo.storage.close()
+
+            assert len(loaded) == size
+            results.append({
+                "backend": backend, "tasks": size,
+                "save_s": round(save_time, 4), "load_s": round(load_time, 4),
+                "file_bytes": file_size
+            })
+            print(f"{backend:<8} {size:>8} görev | save {save_time * 1000:>9.1f} ms | "
+                  f"load {load_time * 1000:>9.1f} ms | {file_size / 1024:>10.1f} KB")
+    return results
+
+
+def bench_spawn(runs: int):
+    """
+    Kısa bir süreci başlatıp bitmesini bekleme süresi (yöntem başına p50/p95).
+    Ana süreç büyüdükçe (GUI, thread'ler) fork maliyeti de büyür; spawn server küçük kalır.
+    """
+    target = shutil.which("true")
+    argv = [target] if target else [sys.executable, "-c", "pass"]
+    cached_env = dict(os.environ)
+
+    def popen(cmd, shell, env_factory):
+        def run():
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    shell=shell, env=env_factory())
+            proc.stdout.read()
+            proc.wait()
+        return run
+
+    methods = [
+        ("popen_shell", popen(subprocess.list2cmdline(argv) if sys.platform == 'win32' else " ".join(argv),
+                              True, os.environ.copy)),
+        ("popen_env_copy", popen(argv, False, os.environ.copy)),
+        ("popen_cached_env", popen(argv, False, lambda: cached_env)),
+    ]
+
+    server = None
+    if SPAWN_SERVER_AVAILABLE:
+        server = SpawnServer()
+
+        def spawn_server_run():
+            proc = server.spawn(argv, "bench", cached_env)
+            proc.stdout.read()
+            proc.stdout.close()
+            proc.wait()
+        methods.append(("spawn_server", spawn_server_run))
+
+    results = []
+    try:
+        for name, run in methods:
+            run()  # Isınma
+            samples = []
+            for _ in range(runs):
+                elapsed, _ = _timed(run)
+                samples.append(elapsed * 1000)
+            stats = _percentiles(samples)
+            results.append({"method": name, "runs": runs, "p50_ms": stats["p50_ms"], "p95_ms": stats["p95_ms"]})
+            print(f"{name:<18} {runs:>6} çalıştırma | p50 {stats['p50_ms']:>8.2f} ms | p95 {stats['p95_ms']:>8.2f} ms")
+    finally:
+        if server:
+            server.close()
+    return results
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# YÜK SİMÜLASYONU
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class BenchService(SchedulerService):
+    """
+    Ölçüm noktaları eklenmiş servis. Gecikme her görev için kendi zamanı
+    (next_run) → görevin başlaması olarak ölçülür; zamanlar duvar saatidir.
+
+    executor="fake" ise süreç açılmaz: çalıştırma run_ms kadar uyur ve history kaydı
+    yazar (zamanlayıcı, thread ve history yükü ölçülür, süreç maliyeti hariç).
+    """
+
+    def __init__(self, config, executor: str, run_ms: float):
+        self.executor = executor
+        self.run_seconds = run_ms / 1000
+        self.due = {}
+        self.started = {}
+        self.finished = {}
+        self.ticks = []
+        self.errors = []
+        self.all_done = threading.Event()
+        self._bench_lock = threading.Lock()
+        super().__init__(config, log_callback=self._collect_log)
+
+    def _collect_log(self, message):
+        if message.startswith("!!!") or "HATA" in message:
+            self.errors.append(message)
+
+    def load_tasks(self):
+        tasks = super().load_tasks()
+        self.expected = len(tasks)
+        self.due = {task['id']: datetime.strptime(task['next_run'], "%d.%m.%Y %H:%M").timestamp()
+                    for task in tasks}
+        return tasks
+
+    def scheduler_tick(self, now):
+        started = time.perf_counter()
+        super().scheduler_tick(now)
+        self.ticks.append((time.perf_counter() - started) * 1000)
+
+    def _mark_started(self, task_id):
+        with self._bench_lock:
+            self.started.setdefault(task_id, time.time())
+
+    def emit(self, event):
+        # Gerçek executor'da başlama anı "started" olayıdır (shard'larda koordinatöre gelir)
+        if event.kind == "started":
+            self._mark_started(event.task_id)
+        super().emit(event)
+
+    def execute_task(self, task, context=None):
+        if self.executor != "fake":
+            return super().execute_task(task, context)
+        self._mark_started(task['id'])
+        start_time = time.time()
+        time.sleep(self.run_seconds)
+        self.history.add_record(TaskHistoryRecord(
+            id=str(uuid4()), task_id=task['id'], task_name=task['name'],
+            start_time=datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S'),
+            end_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            duration=time.time() - start_time, success=True, exit_code=0
+        ))
+        return {'success': True}
+
+    def task_finished(self, task, result):
+        super().task_finished(task, result)
+        with self._bench_lock:
+            self.finished.setdefault(task['id'], time.time())
+            if len(self.finished) >= self.expected:
+                self.all_done.set()
+
+
+def _write_load_script(directory: Path, executor: str) -> Path:
+    """Gerçek executor için önemsiz görev script'i."""
+    if executor == "python":
+        script = directory / "job.py"
+        script.write_text("print('ok')\n", encoding="utf-8")
+    elif sys.platform == "win32":
+        script = directory / "job.bat"
+        script.write_text("@echo ok\r\n", encoding="utf-8")
+    else:
+        script = directory / "job.sh"
+        script.write_text("#!/bin/sh\necho ok\n", encoding="utf-8")
+        script.chmod(0o755)
+    return script
+
+
+def _seed_history(history_dir: Path, tasks, records: int):
+    """Sorgu ölçümü için sentetik history kayıtları (son 30 güne yayılmış)."""
+    from task_history import TaskHistoryManager
+    history = TaskHistoryManager(str(history_dir))
+    now = datetime.now()
+    for i in range(records):
+        task = tasks[i % len(tasks)]
+        start = now - timedelta(minutes=(i * 7) % (30 * 1440))
+        history.add_record(TaskHistoryRecord(
+            id=str(uuid4()), task_id=task['id'], task_name=task['name'],
+            start_time=start.strftime('%Y-%m-%d %H:%M:%S'),
+            end_time=(start + timedelta(seconds=5)).strftime('%Y-%m-%d %H:%M:%S'),
+            duration=5.0, success=i % 10 != 0, exit_code=0 if i % 10 else 1,
+            error_message="" if i % 10 else "Exit code: 1", output="ok"
+        ))
+    history.flush_daily_stats()
+
+
+def bench_load(task_count: int, executor: str, run_ms: float, workers: int,
+               history_records: int, backend: str, timeout: float):
+    """
+    Zamanlayıcı çekirdeğini, görev deposunu ve history'i ekransız olarak sentetik
+    görevlerle çalıştır. Tüm görevler aynı anda zamanı gelmiş durumdadır.
+    """
+    if executor == "fake" and workers > 1:
+        raise SystemExit("❌ Sahte executor süreç içinde çalışır - --workers için --executor echo/python kullanın")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        config = AppConfig(
+            tasks_db=str(tmp_path / "tasks.json"), tasks_storage=backend, auto_backup=False,
+            backup_on_exit=False, logs_dir=str(tmp_path / "logs"), backups_dir=str(tmp_path / "backups"),
+            templates_dir=str(tmp_path / "templates"), history_dir=str(tmp_path / "history"),
+            input_cache_file=str(tmp_path / "input_cache.json"),
+            telegram_enabled=False, desktop_notifications_enabled=False, cluster_enabled=False,
+            scheduler_interval=1, worker_processes=workers
+        )
+
+        # Hepsinin zamanı bir sonraki dakika başı, günlük tekrar (ölçüm süresince bir kez çalışır).
+        # next_run dakika hassasiyetinde olduğu için zaman gelecekte seçilir; geçmiş bir
+        # dakika, görevin zamanı ile zamanlayıcının onu görmesi arasına sahte gecikme katar
+        script = _write_load_script(tmp_path, executor) if executor != "fake" else tmp_path / "job.py"
+        due = (datetime.now() + timedelta(minutes=1)).replace(second=0, microsecond=0)
+        tasks = make_synthetic_tasks(task_count)
+        for task in tasks:
+            task.update(path=str(script), next_run=due.strftime("%d.%m.%Y %H:%M"), freq_type="Günlük",
+                        freq_val=1, telegram_notify=False)
+
+        # Kaydetme / yükleme
+        repo = TaskRepository(config)
+        save_time, _ = _timed(repo.save_tasks, tasks)
+        load_time, _ = _timed(repo.load_tasks)
+        repo.storage.close()
+
+        if history_records:
+            _seed_history(Path(config.history_dir), tasks, history_records)
+
+        rss_before = _rss_mb()
+        service = BenchService(config, executor, run_ms)
+        service.start_in_background()
+        wait = max(0.0, due.timestamp() - time.time())
+        print(f"⏳ Görevlerin zamanı {due.strftime('%H:%M')} ({wait:.0f} sn bekleniyor)")
+        completed = service.all_done.wait(timeout + wait)
+        first_due = min(service.due.values(), default=due.timestamp())
+        wall = max(service.finished.values(), default=first_due) - first_due
+        rss_peak = _rss_mb()
+        time.sleep(2.5)  # Boşta turlar (görevler yarına kaydı)
+        service.stop()
+        if service.monitor_thread:
+            service.monitor_thread.join(timeout=5)
+
+        latencies = [(started - service.due[task_id]) * 1000 for task_id, started in service.started.items()]
+        run_times = [(service.finished[task_id] - started) * 1000
+                     for task_id, started in service.started.items() if task_id in service.finished]
+        last_start = max(service.started.values(), default=first_due)
+        last_finish = max(service.finished.values(), default=first_due)
+
+        # History sorguları (çalıştırmaların kayıtları + tohum kayıtlar)
+        service.history.flush_daily_stats()
+        today = datetime.now().strftime('%Y-%m-%d')
+        queries = {}
+        for name, func, args in (
+            ("statistics_30d", service.history.get_statistics, (30,)),
+            ("task_history_30d", service.history.get_task_history, (tasks[0]['id'], 30)),
+            ("daily_report", service.history.build_daily_report, (today, service.tasks)),
+            ("most_failed", service.history.get_most_failed_tasks, (5,)),
+        ):
+            elapsed, _ = _timed(func, *args)
+            queries[name + "_ms"] = round(elapsed * 1000, 3)
+        service.repo.storage.close()
+
+    result = {
+        "tasks": task_count, "executor": executor, "run_ms": run_ms if executor == "fake" else None,
+        "workers": workers, "backend": backend, "history_seed_records": history_records,
+        "completed": len(service.finished), "timed_out": not completed, "errors": len(service.errors),
+        "dispatch_latency": _percentiles(latencies),
+        "run_time": _percentiles(run_times),
+        "dispatch_throughput_per_s": round(len(latencies) / max(last_start - first_due, 1e-9), 1),
+        "throughput_per_s": round(len(run_times) / max(last_finish - first_due, 1e-9), 1),
+        "wall_s": round(wall, 3),
+        "busy_tick_ms": round(max(service.ticks), 3) if service.ticks else None,
+        "idle_tick_ms": round(statistics.median(service.ticks), 3) if service.ticks else None,
+        "rss_before_mb": rss_before, "rss_peak_mb": rss_peak,
+        "save_s": round(save_time, 4), "load_s": round(load_time, 4),
+        "history_query": queries,
+    }
+
+    latency = result["dispatch_latency"]
+    print(f"{task_count} görev | executor {executor} | workers {workers} | {backend}")
+    print(f"  Gecikme (zamanı geldi → başladı): p50 {latency['p50_ms']} ms | p95 {latency['p95_ms']} ms | "
+          f"p99 {latency['p99_ms']} ms | max {latency['max_ms']} ms")
+    print(f"  Verim: {result['dispatch_throughput_per_s']} başlatma/s | {result['throughput_per_s']} tamamlanan/s | "
+          f"{result['completed']}/{task_count} tamamlandı ({result['wall_s']} s)" + (" ⚠️ ZAMAN AŞIMI" if not completed else ""))
+    print(f"  Tur: en yoğun {result['busy_tick_ms']} ms | boşta {result['idle_tick_ms']} ms")
+    print(f"  Bellek: {rss_before} → {rss_peak} MB | save {save_time * 1000:.1f} ms | load {load_time * 1000:.1f} ms")
+    print("  History: " + " | ".join(f"{name} {value} ms" for name, value in queries.items()))
+    if service.errors:
+        print(f"  ⚠️ {len(service.errors)} hata, ilki: {service.errors[0]}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MGD Scheduler benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--backends", nargs="+", default=available_backends())
+    parser.add_argument("--spawn", action="store_true", help="Sadece süreç başlatma gecikmesini ölç")
+    parser.add_argument("--spawn-runs", type=int, default=200)
+    parser.add_argument("--load", action="store_true", help="Zamanlayıcı yük simülasyonu")
+    parser.add_argument("--load-tasks", type=int, default=1000)
+    parser.add_argument("--executor", choices=("fake", "echo", "python"), default="fake",
+                        help="fake: süreç açmadan run-ms uyur; echo/python: gerçek önemsiz script")
+    parser.add_argument("--run-ms", type=float, default=50.0)
+    parser.add_argument("--workers", type=int, default=0, help="worker_processes (gerçek executor ile)")
+    parser.add_argument("--history-records", type=int, default=0, help="Sorgu ölçümü için eklenecek sentetik kayıt")
+    parser.add_argument("--load-backend", default="json")
+    parser.add_argument("--load-timeout", type=float, default=300.0)
+    parser.add_argument("--json", dest="json_path", help="Sonuçları bu JSON dosyasına yaz")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("MGD TASK SCHEDULER PRO v4.0 - BENCHMARK")
+    print("=" * 70)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+    }
+    if args.spawn:
+        report["spawn"] = bench_spawn(args.spawn_runs)
+    elif args.load:
+        report["load"] = bench_load(args.load_tasks, args.executor, args.run_ms, args.workers,
+                                    args.history_records, args.load_backend, args.load_timeout)
+    else:
+        report["storage"] = bench_storage(args.sizes, args.backends)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"📄 Sonuçlar yazıldı: {args.json_path}")
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ def check_installation():
     # Gerekli dosyaları kontrol et
     required_files = [
         "main.py",
+        "app_window.py",
         "config.py",
         "telegram_manager.py",
         "utils.py",
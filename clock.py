@@ -0,0 +1,67 @@
+# clock.py - Zaman Kaynağı
+"""
+MGD Task Scheduler Pro v4.0 - Clock
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Zamanlayıcının "şimdi" ve "bekle" işlemleri bu sınıflar üzerinden yapılır:
+
+- SystemClock: Gerçek saat (varsayılan)
+- SimulatedClock: Sanal saat - bekleme anında biter, zaman ileri sarılır.
+  Aylarca süren zamanlamalar saniyeler içinde oynatılabilir (simulation.py)
+"""
+
+import time
+import threading
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    """Gerçek saat."""
+
+    simulated = False
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def time(self) -> float:
+        return time.time()
+
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        """seconds kadar veya event set edilene kadar bekle; event set edildiyse True."""
+        return event.wait(seconds)
+
+
+class SimulatedClock:
+    """Elle ilerletilen sanal saat (thread-safe)."""
+
+    simulated = True
+
+    def __init__(self, start: datetime):
+        self._now = start
+        self._lock = threading.Lock()
+
+    def now(self) -> datetime:
+        with self._lock:
+            return self._now
+
+    def time(self) -> float:
+        return self.now().timestamp()
+
+    def set(self, moment: datetime):
+        """Saati verilen ana getir (geri alınamaz)."""
+        with self._lock:
+            if moment < self._now:
+                raise ValueError(f"Sanal saat geri alınamaz: {moment} < {self._now}")
+            self._now = moment
+
+    def advance(self, seconds: float):
+        with self._lock:
+            self._now += timedelta(seconds=seconds)
+
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        """Beklemeden zamanı ileri sar."""
+        if event.is_set():
+            return True
+        self.advance(seconds)
+        return event.is_set()
@@ -0,0 +1,250 @@
+# cluster.py - Çok Sunuculu Çalışma (Lease Tabanlı)
+"""
+MGD Task Scheduler Pro v4.0 - Cluster Mode
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Aynı görev listesini çalıştıran birden fazla sunucu, paylaşılan bir SQLite
+dosyası üzerinden her çalıştırmayı (görev id + planlanan zaman) "lease" ile
+sahiplenir. Böylece:
+- Her planlanmış çalıştırma tek bir sunucuda çalışır
+- Görevler sunuculara hash ile dağıtılır (rendezvous hashing)
+- Heartbeat göndermeyen sunucunun görevleri lease süresi dolunca devralınır
+
+Not: SQLite ağ paylaşımında WAL kullanamaz; bu dosya klasik rollback journal
+ile açılır. Sunucu saatlerinin NTP ile senkron olması gerekir.
+"""
+
+import os
+import time
+import socket
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+class LeaseStore:
+    """Paylaşılan SQLite dosyasındaki node ve lease tabloları."""
+
+    # Tamamlanan lease'ler tekrar çalıştırmayı engellemek için bu süre tutulur
+    DONE_RETENTION = 7 * 24 * 3600
+
+    def __init__(self, path: Path, node_id: str, ttl: int):
+        self.path = Path(path)
+        self.node_id = node_id
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None: transaction'lar elle (BEGIN IMMEDIATE) açılır
+            self._conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None,
+                                         check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=DELETE")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS nodes ("
+                "node_id TEXT PRIMARY KEY, host TEXT, pid INTEGER, started REAL, heartbeat REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "task_id TEXT NOT NULL, slot TEXT NOT NULL, node_id TEXT NOT NULL, "
+                "state TEXT NOT NULL, acquired REAL, expires REAL, "
+                "PRIMARY KEY (task_id, slot))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_leases_expires ON leases(state, expires)")
+        return self._conn
+
+    def _transaction(self, work):
+        """Yazma kilidini baştan alan transaction (iki node aynı anda sahiplenemez)."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(conn)
+                conn.execute("COMMIT")
+                return result
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self):
+        """Node'un canlı olduğunu bildir ve çalışan lease'lerini uzat."""
+        now = time.time()
+
+        def work(conn):
+            conn.execute(
+                "INSERT INTO nodes (node_id, host, pid, started, heartbeat) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(node_id) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (self.node_id, socket.gethostname(), os.getpid(), now, now)
+            )
+            conn.execute(
+                "UPDATE leases SET expires = ? WHERE node_id = ? AND state = 'running'",
+                (now + self.ttl, self.node_id)
+            )
+            conn.execute(
+                "DELETE FROM leases WHERE state = 'done' AND expires < ?",
+                (now - self.DONE_RETENTION,)
+            )
+
+        self._transaction(work)
+
+    def live_nodes(self) -> List[str]:
+        """Heartbeat'i lease süresi içinde olan node'lar."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT node_id FROM nodes WHERE heartbeat >= ? ORDER BY node_id",
+                (time.time() - self.ttl,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim(self, task_id: str, slot: str) -> bool:
+        """Çalıştırmayı sahiplen - başka node sahiplendiyse veya tamamlandıysa False."""
+        now = time.time()
+
+        def work(conn):
+            row = conn.execute(
+                "SELECT node_id, state, expires FROM leases WHERE task_id = ? AND slot = ?",
+                (task_id, slot)
+            ).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO leases (task_id, slot, node_id, state, acquired, expires) "
+                    "VALUES (?, ?, ?, 'running', ?, ?)",
+                    (task_id, slot, self.node_id, now, now + self.ttl)
+                )
+                return True
+            return row[0] == self.node_id and row[1] == 'running'
+
+        return self._transaction(work)
+
+    def claim_orphans(self) -> List[Tuple[str, str]]:
+        """Süresi dolmuş (sahibi ölmüş) çalışan lease'leri devral."""
+        now = time.time()
+
+        def work(conn):
+            rows = conn.execute(
+                "SELECT task_id, slot FROM leases WHERE state = 'running' AND expires < ? AND node_id != ?",
+                (now, self.node_id)
+            ).fetchall()
+            for task_id, slot in rows:
+                conn.execute(
+                    "UPDATE leases SET node_id = ?, acquired = ?, expires = ? WHERE task_id = ? AND slot = ?",
+                    (self.node_id, now, now + self.ttl, task_id, slot)
+                )
+            return [(task_id, slot) for task_id, slot in rows]
+
+        return self._transaction(work)
+
+    def release(self, task_id: str, slot: str):
+        """Çalıştırma bitti - lease 'done' olarak kalır (tekrar sahiplenilmez)."""
+        def work(conn):
+            conn.execute(
+                "UPDATE leases SET state = 'done', expires = ? WHERE task_id = ? AND slot = ? AND node_id = ?",
+                (time.time(), task_id, slot, self.node_id)
+            )
+
+        self._transaction(work)
+
+    def leave(self):
+        """Node kaydını sil (diğer node'lar görevleri hemen üstlenir)."""
+        self._transaction(lambda conn: conn.execute("DELETE FROM nodes WHERE node_id = ?", (self.node_id,)))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ClusterNode:
+    """
+    Scheduler ile lease deposu arasındaki karar katmanı.
+
+    try_claim() sonuçları:
+    CLAIMED : Bu node çalıştırır
+    WAIT    : Tercih edilen node'un sırası - sonraki turda tekrar denenir
+    TAKEN   : Başka node çalıştırdı/çalıştırıyor - sadece next_run ilerletilir
+    """
+
+    CLAIMED = "claimed"
+    WAIT = "wait"
+    TAKEN = "taken"
+
+    def __init__(self, config):
+        self.node_id = config.cluster_node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.ttl = max(config.cluster_lease_ttl, 2 * config.cluster_heartbeat_interval)
+        self.heartbeat_interval = config.cluster_heartbeat_interval
+        self.store = LeaseStore(Path(config.cluster_db), self.node_id, self.ttl)
+
+        self._live_nodes: List[str] = [self.node_id]
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, on_orphan=None):
+        """Heartbeat thread'ini başlat. on_orphan(task_id, slot) devralınan çalıştırmalar için."""
+        self.store.heartbeat()
+        self._live_nodes = self.store.live_nodes()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._heartbeat_loop, args=(on_orphan,),
+                                        name="cluster-heartbeat", daemon=True)
+        self._thread.start()
+        print(f"🌐 Cluster node: {self.node_id} ({len(self._live_nodes)} aktif node)")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        try:
+            self.store.leave()
+        except sqlite3.Error as e:
+            print(f"⚠️ Cluster çıkış hatası: {e}")
+        self.store.close()
+
+    def _heartbeat_loop(self, on_orphan):
+        while not self._stop_event.wait(self.heartbeat_interval):
+            try:
+                self.store.heartbeat()
+                self._live_nodes = self.store.live_nodes() or [self.node_id]
+                for task_id, slot in self.store.claim_orphans():
+                    if on_orphan:
+                        on_orphan(task_id, slot)
+            except sqlite3.Error as e:
+                print(f"⚠️ Cluster heartbeat hatası: {e}")
+
+    @property
+    def live_nodes(self) -> List[str]:
+        return list(self._live_nodes)
+
+    def preferred_node(self, task_id: str) -> str:
+        """Rendezvous hashing - node eklenip çıkınca sadece o node'un görevleri yer değiştirir."""
+        return max(
+            self._live_nodes,
+            key=lambda node: hashlib.md5(f"{node}|{task_id}".encode()).hexdigest()
+        )
+
+    def try_claim(self, task_id: str, slot: str, overdue_seconds: float) -> str:
+        """
+        Planlanan çalıştırmayı sahiplenmeyi dene.
+        Tercih edilen node değilsek önce ona lease süresi kadar fırsat verilir.
+        """
+        if self.preferred_node(task_id) != self.node_id and overdue_seconds < self.ttl:
+            return self.WAIT
+        try:
+            return self.CLAIMED if self.store.claim(task_id, slot) else self.TAKEN
+        except sqlite3.Error as e:
+            print(f"⚠️ Lease alınamadı [{task_id}]: {e}")
+            return self.WAIT
+
+    def release(self, task_id: str, slot: str):
+        try:
+            self.store.release(task_id, slot)
+        except sqlite3.Error as e:
+            print(f"⚠️ Lease bırakılamadı [{task_id}]: {e}")
+
+    def status(self) -> dict:
+        return {'node_id': self.node_id, 'live_nodes': self.live_nodes, 'lease_ttl': self.ttl}
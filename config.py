@@ -8,6 +8,7 @@ Support: Ahmet KAHREMAN (CMX)
 import json
 import sys
 import os
+import secrets
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from typing import Optional
@@ -31,12 +32,32 @@ class AppConfig:
     backups_dir: str = str(SCRIPT_DIR / "backups")
     templates_dir: str = str(SCRIPT_DIR / "templates")
     history_dir: str = str(SCRIPT_DIR / "history")
+    tasks_storage: str = "json"  # json / msgpack / sqlite
     
     # Zamanlama Ayarları
     scheduler_interval: int = 15  # saniye
+    worker_processes: int = 0  # >1 ise görevler bu kadar alt sürece dağıtılır
+    python_warm_workers: int = 0  # >0 ise .py görevleri önceden açılmış yorumlayıcılarda çalışır
+    python_preload_modules: str = ""  # Virgülle ayrılmış, worker açılışında import edilir (ör. "pandas,numpy")
+    python_worker_max_runs: int = 100  # Bu kadar çalıştırmadan sonra worker yenilenir
+    python_worker_max_memory_mb: int = 1024  # Bellek bunu aşarsa worker yenilenir (0 = sınırsız)
+    spawn_server_enabled: bool = False  # Linux: görevler küçük yardımcı süreçten posix_spawn ile başlatılır
+    file_trigger_backend: str = "auto"  # auto / inotify / polling - "watch" alanlı görevlerin klasör izleme yöntemi
+    file_trigger_debounce: float = 5.0  # saniye - bu kadar sessizlik olunca biriken dosyalarla görev çalışır
+    file_trigger_max_wait: float = 60.0  # saniye - sürekli dosya gelse de en geç bu sürede çalıştırılır
+    file_trigger_poll_interval: float = 2.0  # saniye - inotify yoksa klasör tarama aralığı
+    start_jitter_seconds: int = 0  # Görevler id'lerine göre 0..N saniye kaydırılarak başlar (Kritik hariç, 0 = kapalı)
+    load_defer_threshold: float = 0.0  # 1 dk loadavg bunu aşınca Kritik olmayan görevler bekletilir (0 = kapalı)
+    load_defer_max_seconds: int = 900  # Yük yüzünden bekletilen görev en geç bu kadar gecikmeyle başlar
     max_task_timeout: int = 3600  # saniye (1 saat)
     retry_max: int = 3
-    retry_delay: int = 60  # saniye
+    retry_delay: int = 60  # saniye - ilk tekrar denemeden önceki bekleme
+    retry_backoff_factor: float = 2.0  # Her denemede bekleme bu katsayıyla artar (1 = sabit)
+    retry_max_delay: int = 3600  # saniye - tekrar deneme beklemesinin üst sınırı
+    retry_jitter: float = 0.2  # Bekleme ±%20 rastgele saçılır (aynı anda düşen görevler ayrışır)
+    circuit_breaker_threshold: int = 0  # Art arda bu kadar döngü başarısız olursa devre açılır (0 = kapalı, önerilen 3)
+    circuit_breaker_cooldown: int = 3600  # saniye - açık devrenin deneme çalıştırmasına kadar bekleme süresi
+    circuit_breaker_max_cooldown: int = 86400  # saniye - başarısız denemelerde ikiye katlanan sürenin üst sınırı
     
     # UI Ayarları
     theme: str = "dark"  # dark / light
@@ -68,10 +89,37 @@ class AppConfig:
     telegram_notify_on_retry: bool = False
     telegram_send_daily_report: bool = False
     telegram_daily_report_time: str = "23:00"
+    telegram_daily_report_regression: float = 1.5  # Ortalama süre bu kat artarsa raporda işaretlenir
+    telegram_api_url: str = "https://api.telegram.org"  # Test için yerel sunucu verilebilir
+    telegram_queue_size: int = 500  # Gönderilmeyi bekleyen en fazla bildirim
+    telegram_min_interval: float = 1.0  # saniye - aynı chat'e iki mesaj arası
+    telegram_max_retries: int = 5  # 429 / 5xx / bağlantı hatasında
+    telegram_digest_enabled: bool = False  # Görev bildirimlerini özet mesajda birleştir
+    telegram_digest_window: int = 60  # saniye - bu süredeki olaylar tek mesaj olur
+    telegram_digest_errors_immediate: bool = True  # Hatalar pencereyi beklemeden gönderilir
+    telegram_outbox_enabled: bool = True  # Bildirimler gönderilene kadar diskte tutulur
+    telegram_outbox_db: str = str(SCRIPT_DIR / "outbox.db")
+    telegram_outbox_max_age: float = 24  # saat - bundan eski gönderilemeyen bildirim atılır
+    telegram_shutdown_flush_timeout: float = 5.0  # saniye - kapanışta bekleme sınırı
     
     # Bildirim Ayarları
     desktop_notifications_enabled: bool = True
+    desktop_notification_events: str = "failed,timeout"  # Virgülle ayrılmış olay türleri, boşsa hepsi
     sound_enabled: bool = True
+    webhook_url: str = ""  # Boş değilse olaylar JSON olarak POST edilir
+    webhook_events: str = "failed,timeout"
+    event_log_enabled: bool = False  # logs/events.jsonl dosyasına olay kaydı
+    event_log_events: str = ""
+    email_enabled: bool = False
+    email_smtp_host: str = "localhost"
+    email_smtp_port: int = 25
+    email_from: str = "mgd-scheduler@localhost"
+    email_to: str = ""  # Virgülle ayrılmış alıcılar
+    email_events: str = "failed,timeout"
+    email_username: str = ""
+    email_password: str = ""
+    email_use_tls: bool = False  # STARTTLS
+    event_shutdown_flush_timeout: float = 3.0  # saniye - kapanışta kanal kuyruklarını bekleme sınırı
     
     # Backup Ayarları
     auto_backup: bool = True
@@ -80,18 +128,30 @@ class AppConfig:
     
     # Gelişmiş Ayarlar
     single_instance: bool = True
+    control_api_enabled: bool = True  # 127.0.0.1:65432 üzerinde JSON kontrol API'si
+    control_api_token: str = ""  # X-MGD-Token başlığı; boşsa ilk açılışta rastgele üretilip kaydedilir
     start_minimized: bool = False
     minimize_to_tray: bool = True
     close_to_tray: bool = True
     log_level: str = "INFO"
     
+    # Cluster Ayarları (birden fazla sunucu aynı görevleri paylaşır)
+    cluster_enabled: bool = False
+    cluster_db: str = str(SCRIPT_DIR / "cluster.db")  # Tüm node'ların eriştiği paylaşılan dosya
+    cluster_node_id: str = ""  # Boşsa hostname-pid
+    cluster_lease_ttl: int = 60  # saniye - bu süre heartbeat gelmezse node ölü sayılır
+    cluster_heartbeat_interval: int = 15  # saniye
+    
     # Şifre Ayarları
     password_enabled: bool = False
     password_hash: str = ""  # SHA256 hash
     
     # Task History Ayarları
     keep_history_days: int = 30
-    max_history_records: int = 1000
+    max_history_records: int = 1000  # Görev başına en fazla kayıt
+    history_output_keep_days: int = 7  # Başarılı kayıtların output'u bu süreden sonra silinir
+    history_compaction_interval: int = 6  # saat
+    input_cache_file: str = str(SCRIPT_DIR / "input_cache.json")  # Görev girdilerinin (inputs) son parmak izleri
     
     def save(self, path: Optional[Path] = None):
         """Yapılandırmayı dosyaya kaydet."""
@@ -158,6 +218,12 @@ class AppConfig:
                     config.save(path)
                     print("🔒 Varsayılan şifre hash'i oluşturuldu (1234)")
                 
+                # 🔒 GÜVENLIK: Kontrol API'si token'sız açık kalmasın (yerel süreçler / tarayıcı sayfaları)
+                if config.control_api_enabled and not config.control_api_token:
+                    config.control_api_token = secrets.token_urlsafe(24)
+                    config.save(path)
+                    print("🔒 Kontrol API token'ı oluşturuldu (config.json → control_api_token)")
+                
                 print(f"✅ Config yüklendi\n")
                 return config
             except Exception as e:
@@ -172,6 +238,7 @@ class AppConfig:
         # 🔒 Varsayılan şifre hash'i ekle (1234)
         import hashlib
         config.password_hash = hashlib.sha256('1234'.encode()).hexdigest()
+        config.control_api_token = secrets.token_urlsafe(24)
         
         config.save(path)
         print("🎉 İlk kurulum - Config oluşturuldu (Varsayılan şifre: 1234)\n")
@@ -0,0 +1,298 @@
+# control_api.py - Yerel Kontrol API'si
+"""
+MGD Task Scheduler Pro v4.0 - Local Control API
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Single instance kilidi olarak bağlanan 127.0.0.1:65432 soketi üzerinden
+çalışan zamanlayıcıya JSON ile erişim (GUI veya --headless fark etmez):
+
+    GET  /api/status                 Servis durumu
+    GET  /api/tasks                  Görev listesi
+    GET  /api/tasks/<id>             Tek görev
+    POST /api/tasks/<id>/run         Şimdi çalıştır
+    POST /api/tasks/<id>/pause       Duraklat
+    POST /api/tasks/<id>/resume      Devam ettir
+    GET  /api/logs?lines=100         Son log satırları
+    GET  /api/stats?days=30          History istatistikleri
+    POST /api/show                   GUI penceresini öne getir
+
+control_api_token ayarlıysa (ilk açılışta üretilir) her istekte "X-MGD-Token"
+başlığı gerekir. Host başlığı 127.0.0.1 / localhost olmayan ve başka bir siteden
+(Origin) gelen istekler reddedilir (DNS rebinding / tarayıcıdan POST).
+
+Komut satırı:
+    python control_api.py status
+    python control_api.py run <görev_id>
+    python control_api.py logs 50
+"""
+
+import sys
+import json
+import hmac
+import threading
+import http.client
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import Optional, Dict, Any
+
+DEFAULT_PORT = 65432
+TOKEN_HEADER = "X-MGD-Token"
+LOCAL_HOSTS = ("127.0.0.1", "localhost")
+
+# /api/tasks yanıtında dönen görev alanları
+TASK_SUMMARY_FIELDS = ('id', 'name', 'path', 'category', 'priority', 'status', 'paused',
+                       'next_run', 'last_run', 'end', 'run_count', 'success_count',
+                       'fail_count', 'last_error', 'depends_on', 'watch',
+                       'circuit_state', 'failed_cycles', 'circuit_open_until')
+
+
+class ControlRequestHandler(BaseHTTPRequestHandler):
+    """API isteklerini SchedulerService'e yönlendirir."""
+
+    server_version = "MGDControl/4.0"
+
+    def log_message(self, format, *args):
+        pass  # Her istek için stderr'e yazma
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        server: ControlServer = self.server
+        if not self._local_request(server.server_address[1]):
+            return self._send(403, {'error': 'Sadece yerel istekler kabul edilir'})
+        if server.token:
+            given = self.headers.get(TOKEN_HEADER, "")
+            if not hmac.compare_digest(given.encode(), server.token.encode()):
+                return self._send(401, {'error': 'Geçersiz token'})
+
+        parsed = urlparse(self.path)
+        parts = [part for part in parsed.path.split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+        try:
+            status, body = server.handle(method, parts, query)
+        except Exception as e:
+            status, body = 500, {'error': str(e)}
+        self._send(status, body)
+
+    def _local_request(self, port: int) -> bool:
+        """Host 127.0.0.1/localhost (kendi portu) mu, Origin varsa yerel mi?"""
+        host = self.headers.get("Host", "")
+        if host not in LOCAL_HOSTS and host not in {f"{name}:{port}" for name in LOCAL_HOSTS}:
+            return False
+        origin = self.headers.get("Origin")
+        if origin is None:
+            return True
+        return urlparse(origin).hostname in LOCAL_HOSTS and urlparse(origin).port in (None, port)
+
+    def _send(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ControlServer(ThreadingHTTPServer):
+    """
+    Single instance soketini dinleyen HTTP sunucusu.
+
+    Soket SingleInstance tarafından zaten bağlanmıştır; burada sadece listen()
+    edilir. Böylece kilit ve API aynı porttur.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, service, lock_socket, token: str = "", on_show=None):
+        super().__init__(lock_socket.getsockname(), ControlRequestHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = lock_socket
+        self.server_address = lock_socket.getsockname()
+        self.server_activate()
+
+        self.service = service
+        self.token = token or ""
+        self.on_show = on_show
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Arka plan thread'inde istekleri dinle."""
+        self._thread = threading.Thread(target=self.serve_forever, name="control-api", daemon=True)
+        self._thread.start()
+        print(f"🔌 Kontrol API: http://{self.server_address[0]}:{self.server_address[1]}/api/status")
+
+    def stop(self):
+        """Dinlemeyi bırak (soket SingleInstance ile birlikte kapanır)."""
+        if self._thread:
+            self.shutdown()
+            self._thread = None
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # ROUTING
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def handle(self, method: str, parts: list, query: Dict[str, str]):
+        """(HTTP durum kodu, JSON gövdesi) döner."""
+        service = self.service
+
+        if parts[:1] != ['api'] or len(parts) < 2:
+            return 404, {'error': 'Bilinmeyen adres'}
+
+        resource = parts[1]
+
+        if method == "GET" and resource == "status" and len(parts) == 2:
+            return 200, service.status()
+
+        if method == "GET" and resource == "logs" and len(parts) == 2:
+            lines = self.int_param(query, 'lines', 100)
+            if lines is None:
+                return 400, {'error': "'lines' pozitif tam sayı olmalı"}
+            return 200, {'lines': list(service.recent_logs)[-lines:]}
+
+        if method == "GET" and resource == "stats" and len(parts) == 2:
+            days = self.int_param(query, 'days', 30)
+            if days is None:
+                return 400, {'error': "'days' pozitif tam sayı olmalı"}
+            return 200, service.history.get_statistics(days)
+
+        if method == "POST" and resource == "show" and len(parts) == 2:
+            if not self.on_show:
+                return 409, {'error': 'Headless modda pencere yok'}
+            self.on_show()
+            return 200, {'ok': True}
+
+        if resource == "tasks":
+            if not service.tasks_loaded:
+                return 503, {'error': 'Görevler henüz yüklenmedi'}
+
+            if method == "GET" and len(parts) == 2:
+                return 200, {'tasks': [self.task_summary(task) for task in service.tasks]}
+
+            task = service.find_task(parts[2]) if len(parts) > 2 else None
+            if task is None:
+                return 404, {'error': 'Görev bulunamadı'}
+
+            if method == "GET" and len(parts) == 3:
+                return 200, self.task_summary(task)
+
+            if method == "POST" and len(parts) == 4:
+                action = parts[3]
+                if action == "run":
+                    if not service.run_now(task):
+                        return 409, {'error': 'Görev zaten çalışıyor'}
+                    return 202, {'ok': True, 'task': self.task_summary(task)}
+                if action in ("pause", "resume"):
+                    service.set_paused(task, action == "pause")
+                    return 200, {'ok': True, 'task': self.task_summary(task)}
+                if action == "reset":
+                    service.reset_circuit(task)
+                    return 200, {'ok': True, 'task': self.task_summary(task)}
+
+        return 404, {'error': 'Bilinmeyen adres'}
+
+    @staticmethod
+    def int_param(query: Dict[str, str], name: str, default: int) -> Optional[int]:
+        """Sorgu parametresini pozitif tam sayıya çevir; geçersizse None."""
+        try:
+            return max(1, int(query.get(name, default)))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def task_summary(task: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: task.get(field) for field in TASK_SUMMARY_FIELDS}
+
+
+def start_control_server(service, instance, on_show=None) -> Optional[ControlServer]:
+    """Config'e göre kontrol API'sini başlat (kapalıysa / hata olursa None)."""
+    if not service.config.control_api_enabled:
+        return None
+    try:
+        server = ControlServer(service, instance.lock_socket, service.config.control_api_token, on_show)
+        server.start()
+        return server
+    except Exception as e:
+        print(f"⚠️ Kontrol API başlatılamadı: {e}")
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# İSTEMCİ
+# ═══════════════════════════════════════════════════════════════════════════
+
+class ControlClient:
+    """Çalışan zamanlayıcıya bağlanan basit istemci."""
+
+    def __init__(self, port: int = DEFAULT_PORT, token: str = "", timeout: float = 3.0):
+        self.port = port
+        self.token = token or ""
+        self.timeout = timeout
+
+    def request(self, method: str, path: str) -> Optional[Dict[str, Any]]:
+        """İstek gönder; bağlantı kurulamazsa None döner."""
+        headers = {TOKEN_HEADER: self.token} if self.token else {}
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=self.timeout)
+        try:
+            conn.request(method, path, headers=headers)
+            response = conn.getresponse()
+            body = json.loads(response.read().decode('utf-8') or "{}")
+            body.setdefault('http_status', response.status)
+            return body
+        except (OSError, ValueError, http.client.HTTPException):
+            return None
+        finally:
+            conn.close()
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        return self.request("GET", path)
+
+    def post(self, path: str) -> Optional[Dict[str, Any]]:
+        return self.request("POST", path)
+
+
+def main(argv=None) -> int:
+    import argparse
+    from config import AppConfig
+
+    config = AppConfig.load()
+
+    parser = argparse.ArgumentParser(description="MGD Scheduler kontrol istemcisi")
+    parser.add_argument("command", choices=["status", "tasks", "task", "run", "pause", "resume", "logs", "stats", "show"])
+    parser.add_argument("value", nargs="?", help="Görev id / satır sayısı / gün sayısı")
+    parser.add_argument("--token", default=config.control_api_token)
+    args = parser.parse_args(argv)
+
+    client = ControlClient(token=args.token)
+    if args.command in ("task", "run", "pause", "resume"):
+        if not args.value:
+            parser.error("Görev id gerekli")
+        path = f"/api/tasks/{args.value}" + ("" if args.command == "task" else f"/{args.command}")
+        result = client.request("GET" if args.command == "task" else "POST", path)
+    elif args.command == "logs":
+        result = client.get(f"/api/logs?lines={args.value or 100}")
+    elif args.command == "stats":
+        result = client.get(f"/api/stats?days={args.value or 30}")
+    elif args.command == "show":
+        result = client.post("/api/show")
+    else:
+        result = client.get(f"/api/{args.command}")
+
+    if result is None:
+        print("❌ Çalışan MGD Scheduler bulunamadı", file=sys.stderr)
+        return 2
+
+    if args.command == "logs" and 'lines' in result:
+        print("\n".join(result['lines']))
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0 if result.get('http_status', 200) < 400 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# event_bus.py - Görev Olayları ve Bildirim Kanalları
+"""
+MGD Task Scheduler Pro v4.0 - Event Bus & Notification Sinks
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Scheduler görev yaşam döngüsü olaylarını (başladı, tamamlandı, hata, timeout,
+tekrar, süre doldu, devre açıldı/kapandı) bir kez yayınlar. Her bildirim kanalı (sink) kendi
+kuyruğu, thread'i ve filtresi ile bu olaylara abone olur; yavaş bir kanal
+görev çalıştırmayı veya diğer kanalları bekletmez.
+
+Kanallar: Telegram, masaüstü, webhook, dosya (JSONL), e-posta (SMTP)
+"""
+
+import json
+import time
+import queue
+import threading
+from pathlib import Path
+from datetime import datetime
+from uuid import uuid4
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, List, Iterable
+
+from utils import NotificationManager, PLYER_AVAILABLE
+
+# Olay türleri
+EVENT_STARTED = "started"
+EVENT_COMPLETED = "completed"
+EVENT_FAILED = "failed"
+EVENT_TIMEOUT = "timeout"
+EVENT_RETRY = "retry"
+EVENT_EXPIRED = "expired"
+EVENT_CIRCUIT_OPEN = "circuit_open"
+EVENT_CIRCUIT_CLOSED = "circuit_closed"
+
+EVENT_KINDS = (EVENT_STARTED, EVENT_COMPLETED, EVENT_FAILED, EVENT_TIMEOUT, EVENT_RETRY, EVENT_EXPIRED,
+               EVENT_CIRCUIT_OPEN, EVENT_CIRCUIT_CLOSED)
+
+
+@dataclass
+class TaskEvent:
+    """Görev yaşam döngüsü olayı."""
+    kind: str
+    task_id: str
+    task_name: str
+    timestamp: str = field(default_factory=lambda: datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    priority: int = 3
+    category: str = "Genel"
+    duration: float = 0.0
+    exit_code: Optional[int] = None
+    error: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid4().hex)  # Olay kimliği (yeniden teslimde aynı kalır)
+
+    @classmethod
+    def for_task(cls, kind: str, task: Dict[str, Any], **kwargs) -> "TaskEvent":
+        """Görev sözlüğünden olay oluştur."""
+        return cls(
+            kind=kind, task_id=task.get('id', ''), task_name=task.get('name', ''),
+            priority=task.get('priority', 3), category=task.get('category', 'Genel'),
+            data={'telegram_notify': task.get('telegram_notify', True), **kwargs.pop('data', {})},
+            **kwargs
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def parse_event_kinds(value: str) -> Optional[set]:
+    """'failed,timeout' -> {'failed', 'timeout'}; boş değer tüm olaylar (None)."""
+    kinds = {kind.strip() for kind in (value or "").split(",") if kind.strip()}
+    return kinds or None
+
+
+class NotificationSink:
+    """
+    Bildirim kanalı temel sınıfı - kendi kuyruğu ve worker thread'i vardır.
+    Alt sınıflar handle() metodunu uygular.
+    """
+
+    name = "sink"
+
+    def __init__(self, kinds: Optional[Iterable[str]] = None, queue_size: int = 1000):
+        self.kinds = set(kinds) if kinds else None
+        self._queue: "queue.Queue[Optional[TaskEvent]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"handled": 0, "errors": 0, "dropped": 0}
+
+    def accepts(self, event: TaskEvent) -> bool:
+        """Filtre - alt sınıflar genişletebilir."""
+        return self.kinds is None or event.kind in self.kinds
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"sink-{self.name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, event: TaskEvent):
+        """Olayı kuyruğa ekle (asla bloklamaz; kuyruk doluysa olay atlanır)."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            try:
+                if event is None:
+                    return
+                self.handle(event)
+                self.stats["handled"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"⚠️ Bildirim kanalı hatası [{self.name}]: {e}")
+            finally:
+                self._queue.task_done()
+
+    def handle(self, event: TaskEvent):
+        raise NotImplementedError
+
+    def close(self, deadline: float):
+        """Kuyruğu deadline'a (monotonic) kadar boşaltmayı dene, thread'i durdur."""
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.02)
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class TelegramSink(NotificationSink):
+    """Olayları TelegramManager bildirimlerine çevirir (config bayrakları anlık okunur)."""
+
+    name = "telegram"
+
+    def __init__(self, manager_getter, config, **kwargs):
+        super().__init__(**kwargs)
+        self.manager_getter = manager_getter  # Ayarlardan manager yenilenebilir
+        self.config = config
+
+    def accepts(self, event: TaskEvent) -> bool:
+        if not event.data.get('telegram_notify', True) or self.manager_getter() is None:
+            return False
+        enabled = {
+            EVENT_STARTED: self.config.telegram_notify_on_start,
+            EVENT_COMPLETED: self.config.telegram_notify_on_complete,
+            EVENT_FAILED: self.config.telegram_notify_on_error,
+            EVENT_TIMEOUT: self.config.telegram_notify_on_error,
+            EVENT_RETRY: self.config.telegram_notify_on_retry,
+            EVENT_CIRCUIT_OPEN: self.config.telegram_notify_on_error,
+            EVENT_CIRCUIT_CLOSED: self.config.telegram_notify_on_error,
+        }
+        return enabled.get(event.kind, False) and super().accepts(event)
+
+    def handle(self, event: TaskEvent):
+        manager = self.manager_getter()
+        if manager is None:
+            return
+        # Aynı olay (ör. yeniden teslim) outbox'a ikinci kez girmez; aynı saniyedeki farklı olaylar ayrı kalır
+        key = f"event:{event.id}"
+        if event.kind == EVENT_STARTED:
+            manager.notify_task_started(event.task_name, event.priority, dedupe_key=key)
+        elif event.kind == EVENT_COMPLETED:
+            manager.notify_task_completed(event.task_name, event.duration, True, dedupe_key=key)
+        elif event.kind in (EVENT_FAILED, EVENT_TIMEOUT):
+            manager.notify_task_error(event.task_name, event.error, dedupe_key=key)
+        elif event.kind == EVENT_RETRY:
+            manager.notify_task_retry(event.task_name, event.data.get('current_retry', 0), event.data.get('max_retries', 0),
+                                      dedupe_key=key)
+        elif event.kind == EVENT_CIRCUIT_OPEN:
+            manager.notify_circuit_open(event.task_name, event.data.get('failed_cycles', 0), event.data.get('open_until', ''),
+                                        dedupe_key=key)
+        elif event.kind == EVENT_CIRCUIT_CLOSED:
+            manager.notify_circuit_closed(event.task_name, dedupe_key=key)
+
+
+class DesktopSink(NotificationSink):
+    """Masaüstü bildirimi (plyer)."""
+
+    name = "desktop"
+
+    TITLES = {
+        EVENT_COMPLETED: "✅ Görev Tamamlandı",
+        EVENT_FAILED: "❌ Görev Hatası",
+        EVENT_TIMEOUT: "⚠️ Görev Zaman Aşımı",
+        EVENT_RETRY: "🔄 Görev Tekrar Deneniyor",
+        EVENT_EXPIRED: "⏹ Görev Süresi Doldu",
+        EVENT_STARTED: "▶️ Görev Başladı",
+        EVENT_CIRCUIT_OPEN: "🔌 Görev Durduruldu (Devre Açık)",
+        EVENT_CIRCUIT_CLOSED: "🔌 Görev Tekrar Çalışıyor",
+    }
+
+    def handle(self, event: TaskEvent):
+        message = event.task_name + (f"\n{event.error[:150]}" if event.error else "")
+        NotificationManager.send_desktop(self.TITLES.get(event.kind, event.kind), message)
+
+
+class WebhookSink(NotificationSink):
+    """Olayı JSON olarak bir HTTP adresine POST eder."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.timeout = timeout
+
+    def handle(self, event: TaskEvent):
+        import urllib.request
+
+        request = urllib.request.Request(
+            self.url, data=json.dumps(event.to_dict(), ensure_ascii=False).encode('utf-8'),
+            headers={"Content-Type": "application/json; charset=utf-8"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class FileSink(NotificationSink):
+    """Olayları JSON Lines dosyasına ekler."""
+
+    name = "file"
+
+    def __init__(self, path: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+
+    def handle(self, event: TaskEvent):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+
+
+class EmailSink(NotificationSink):
+    """SMTP üzerinden e-posta bildirimi."""
+
+    name = "email"
+
+    SUBJECTS = {
+        EVENT_STARTED: "Görev başladı", EVENT_COMPLETED: "Görev tamamlandı",
+        EVENT_FAILED: "Görev hatası", EVENT_TIMEOUT: "Görev zaman aşımı",
+        EVENT_RETRY: "Görev tekrar deneniyor", EVENT_EXPIRED: "Görev süresi doldu",
+    }
+
+    def __init__(self, host: str, port: int, sender: str, recipients: List[str],
+                 username: str = "", password: str = "", use_tls: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    def handle(self, event: TaskEvent):
+        import smtplib
+        from email.message import EmailMessage
+
+        message = EmailMessage()
+        message["Subject"] = f"[MGD Scheduler] {self.SUBJECTS.get(event.kind, event.kind)}: {event.task_name}"
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        lines = [f"Görev: {event.task_name}", f"Olay: {event.kind}", f"Zaman: {event.timestamp}",
+                 f"Kategori: {event.category}"]
+        if event.duration:
+            lines.append(f"Süre: {event.duration:.1f} sn")
+        if event.exit_code is not None:
+            lines.append(f"Çıkış kodu: {event.exit_code}")
+        if event.error:
+            lines.append(f"Hata: {event.error}")
+        message.set_content("\n".join(lines))
+
+        with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+
+class EventBus:
+    """Olayları filtreleri uyan tüm kanallara dağıtır."""
+
+    def __init__(self):
+        self.sinks: List[NotificationSink] = []
+
+    def subscribe(self, sink: NotificationSink):
+        self.sinks.append(sink)
+        sink.start()
+
+    def emit(self, event: TaskEvent):
+        """Olayı yayınla - sadece kuyruklara ekler, beklemez."""
+        for sink in self.sinks:
+            if sink.accepts(event):
+                sink.submit(event)
+
+    def close(self, timeout: float = 3.0):
+        """Tüm kanalların kuyruklarını ortak bir süre sınırı içinde boşalt."""
+        deadline = time.monotonic() + timeout
+        for sink in self.sinks:
+            sink.close(deadline)
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        return {sink.name: dict(sink.stats) for sink in self.sinks}
+
+
+def create_event_bus(config, telegram_getter) -> EventBus:
+    """Config'e göre kanalları oluştur ve abone et."""
+    bus = EventBus()
+    bus.subscribe(TelegramSink(telegram_getter, config))
+
+    if config.desktop_notifications_enabled and PLYER_AVAILABLE:
+        bus.subscribe(DesktopSink(kinds=parse_event_kinds(config.desktop_notification_events)))
+
+    if config.webhook_url:
+        bus.subscribe(WebhookSink(config.webhook_url, kinds=parse_event_kinds(config.webhook_events)))
+
+    if config.event_log_enabled:
+        bus.subscribe(FileSink(Path(config.logs_dir) / "events.jsonl", kinds=parse_event_kinds(config.event_log_events)))
+
+    if config.email_enabled and config.email_to:
+        bus.subscribe(EmailSink(
+            config.email_smtp_host, config.email_smtp_port, config.email_from,
+            [address.strip() for address in config.email_to.split(",") if address.strip()],
+            config.email_username, config.email_password, config.email_use_tls,
+            kinds=parse_event_kinds(config.email_events)
+        ))
+
+    return bus
@@ -0,0 +1,581 @@
+# file_triggers.py - Dosya/Klasör Tetikleyicileri
+"""
+MGD Task Scheduler Pro v4.0 - File Triggers
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Görev kaydındaki "watch" alanı, görevi saat yerine klasöre dosya gelmesiyle çalıştırır:
+
+    "watch": {"path": "C:\\\\HBYS\\\\gelen", "pattern": "*.csv", "events": ["created", "modified"],
+              "recursive": false, "debounce": 5}
+
+- Linux'ta inotify (ctypes), diğer platformlarda periyodik tarama kullanılır
+- Art arda gelen değişiklikler "debounce" saniye sessizlik olana kadar biriktirilir
+  ve tek çalıştırmada işlenir (en fazla file_trigger_max_wait saniye beklenir)
+- Değişen dosyalar görevin ortamına aktarılır:
+      MGD_TRIGGER_FILES  : yollar (os.pathsep ile ayrılmış)
+      MGD_TRIGGER_COUNT  : dosya sayısı
+      MGD_TRIGGER_DIR    : izlenen klasör
+- Görev çalışırken gelen dosyalar bir sonraki çalıştırmaya eklenir
+- Başlangıçta klasörde zaten olan dosyalar tetiklemez; "." ve "~$" ile başlayan
+  geçici dosyalar yok sayılır
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+import select
+import fnmatch
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+INOTIFY_AVAILABLE = False
+if sys.platform.startswith("linux"):
+    try:
+        import ctypes
+        import ctypes.util
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        INOTIFY_AVAILABLE = True
+    except (OSError, AttributeError):
+        pass
+
+# inotify sabitleri (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE | IN_MODIFY | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+VALID_EVENTS = ("created", "modified")
+
+# Ortam değişkeni sınırı (Windows'ta değişken başına 32K karakter)
+TRIGGER_ENV_LIMIT = 30000
+
+
+def trigger_env(context: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Tetikleyen dosyalar için görev ortam değişkenleri (tetiklenmediyse boş)."""
+    files = (context or {}).get('trigger_files')
+    if not files:
+        return {}
+    joined = ""
+    for file_path in files:
+        candidate = f"{joined}{os.pathsep}{file_path}" if joined else file_path
+        if len(candidate) > TRIGGER_ENV_LIMIT:
+            break
+        joined = candidate
+    env = {
+        'MGD_TRIGGER_FILES': joined,
+        'MGD_TRIGGER_COUNT': str(len(files)),
+        'MGD_TRIGGER_DIR': context.get('trigger_dir', ''),
+    }
+    if joined.count(os.pathsep) + 1 < len(files):
+        env['MGD_TRIGGER_TRUNCATED'] = "1"
+    return env
+
+
+class WatchSpec:
+    """Görevin watch alanının çözümlenmiş hali."""
+
+    def __init__(self, task: Dict[str, Any], default_debounce: float):
+        spec = task['watch']
+        if isinstance(spec, str):
+            spec = {'path': spec}
+        root = Path(os.path.expandvars(str(spec['path'])))
+        if not root.is_absolute():
+            root = Path(task['path']).parent / root
+        patterns = spec.get('pattern') or "*"
+        if isinstance(patterns, str):
+            patterns = [pattern.strip() for pattern in patterns.split(",") if pattern.strip()]
+        events = spec.get('events') or VALID_EVENTS
+        if isinstance(events, str):
+            events = [events]
+
+        self.task_id = task['id']
+        self.root = root
+        self.patterns = list(patterns) or ["*"]
+        self.events = {event for event in events if event in VALID_EVENTS} or set(VALID_EVENTS)
+        self.recursive = bool(spec.get('recursive', False))
+        self.debounce = max(0.0, float(spec.get('debounce', default_debounce)))
+
+    def matches(self, path: str, event: str) -> bool:
+        name = os.path.basename(path)
+        if event not in self.events or name.startswith((".", "~$")):
+            return False
+        if not self.recursive and os.path.dirname(path) != str(self.root):
+            return False
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    def covers(self, directory: str) -> bool:
+        """Bu klasördeki değişiklikler izleniyor mu?"""
+        if directory == str(self.root):
+            return True
+        return self.recursive and directory.startswith(str(self.root) + os.sep)
+
+
+class _Batch:
+    """Debounce süresince biriken değişiklikler."""
+
+    def __init__(self):
+        self.files: Set[str] = set()
+        self.first = time.monotonic()
+        self.last = self.first
+
+    def add(self, path: str):
+        self.files.add(path)
+        self.last = time.monotonic()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# İZLEME ALTYAPILARI
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class InotifyBackend:
+    """Klasör başına bir inotify watch'ı; olaylar (klasör, dosya, olay) olarak döner."""
+
+    name = "inotify"
+
+    def __init__(self):
+        self.fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify başlatılamadı")
+        self._dirs: Dict[int, str] = {}      # wd -> klasör
+        self._wds: Dict[str, int] = {}       # klasör -> wd
+        self.overflows = 0
+
+    def sync(self, directories: Set[str]) -> Set[str]:
+        """İzlenen klasörleri güncelle; eklenemeyenleri döndür (sonra tekrar denenir)."""
+        for directory in set(self._wds) - directories:
+            wd = self._wds.pop(directory)
+            self._dirs.pop(wd, None)
+            _libc.inotify_rm_watch(self.fd, wd)
+        failed = set()
+        for directory in directories - set(self._wds):
+            if not self.add(directory):
+                failed.add(directory)
+        return failed
+
+    def add(self, directory: str) -> bool:
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._dirs[wd] = directory
+        self._wds[directory] = wd
+        return True
+
+    def read(self, timeout: float) -> List[Tuple[str, str, str]]:
+        """(olay, yol, tür) listesi - tür: 'file' / 'dir' / 'gone' / 'overflow'."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflows += 1
+                events.append(("", "", "overflow"))
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                self._dirs.pop(wd, None)
+                self._wds.pop(directory, None)
+                events.append(("", directory, "gone"))
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    events.append(("created", path, "dir"))
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                events.append(("created", path, "file"))
+            elif mask & (IN_CLOSE_WRITE | IN_MODIFY):
+                events.append(("modified", path, "file"))
+        return events
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class PollingBackend:
+    """inotify yoksa: izlenen klasörleri periyodik tarayıp (boyut, mtime) karşılaştırır."""
+
+    name = "polling"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._snapshots: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._next_scan = 0.0
+
+    @staticmethod
+    def _scan(directory: str) -> Optional[Dict[str, Tuple[int, int]]]:
+        files = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            files[entry.path] = (-1, 0)
+                        else:
+                            stat = entry.stat()
+                            files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return files
+
+    def sync(self, directories: Set[str]) -> Set[str]:
+        for directory in set(self._snapshots) - directories:
+            del self._snapshots[directory]
+        failed = set()
+        for directory in directories - set(self._snapshots):
+            snapshot = self._scan(directory)
+            if snapshot is None:
+                failed.add(directory)
+            else:
+                self._snapshots[directory] = snapshot
+        return failed
+
+    def add(self, directory: str) -> bool:
+        snapshot = self._scan(directory)
+        if snapshot is None:
+            return False
+        # Yeni klasör: içindeki dosyalar "yeni" sayılsın diye boş başlar
+        self._snapshots[directory] = {}
+        return True
+
+    def read(self, timeout: float) -> List[Tuple[str, str, str]]:
+        wait = self._next_scan - time.monotonic()
+        if wait > 0:
+            time.sleep(min(wait, timeout))
+            if time.monotonic() < self._next_scan:
+                return []
+        self._next_scan = time.monotonic() + self.interval
+
+        events = []
+        for directory, previous in list(self._snapshots.items()):
+            current = self._scan(directory)
+            if current is None:
+                del self._snapshots[directory]
+                events.append(("", directory, "gone"))
+                continue
+            for path, signature in current.items():
+                old = previous.get(path)
+                kind = "dir" if signature[0] == -1 else "file"
+                if old is None:
+                    events.append(("created", path, kind))
+                elif old != signature and kind == "file":
+                    events.append(("modified", path, kind))
+            self._snapshots[directory] = current
+        return events
+
+    def close(self):
+        self._snapshots.clear()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# TETİKLEYİCİ YÖNETİCİSİ
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class FileTriggerManager:
+    """watch alanı olan görevleri izler, biriken değişikliklerle görevi çalıştırır."""
+
+    # İzlenemeyen (henüz olmayan) klasörler bu aralıkla tekrar denenir
+    RETRY_INTERVAL = 10.0
+
+    def __init__(self, service):
+        self.service = service
+        config = service.config
+        self.default_debounce = config.file_trigger_debounce
+        self.max_wait = config.file_trigger_max_wait
+        self.backend = self._create_backend(config)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._specs: Dict[str, WatchSpec] = {}
+        self._batches: Dict[str, _Batch] = {}
+        self._in_flight: Set[str] = set()
+        self._missing: Set[str] = set()
+        self._dirty = False
+        self._next_retry = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"events": 0, "runs": 0, "coalesced": 0}
+
+    @staticmethod
+    def _create_backend(config):
+        backend = config.file_trigger_backend
+        if backend in ("auto", "inotify") and INOTIFY_AVAILABLE:
+            try:
+                return InotifyBackend()
+            except OSError as e:
+                print(f"⚠️ inotify kullanılamıyor, tarama moduna geçiliyor: {e}")
+        elif backend == "inotify":
+            print("⚠️ inotify bu platformda yok - klasörler periyodik taranacak")
+        return PollingBackend(config.file_trigger_poll_interval)
+
+    @staticmethod
+    def is_watched(task: Dict[str, Any]) -> bool:
+        """Saatle değil, dosya değişikliğiyle tetiklenen görev mi?"""
+        return bool(task.get('watch'))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="file-triggers", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.backend.close()
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # İZLEME
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _loop(self):
+        while self.service.running:
+            try:
+                self._refresh()
+                for event, path, kind in self.backend.read(self._read_timeout()):
+                    self._handle(event, path, kind)
+                self._flush()
+            except Exception as e:
+                if self.service.running:
+                    self.service.log(f"!!! DOSYA TETİKLEYİCİ HATASI: {e}")
+                    time.sleep(1)
+
+    def _read_timeout(self) -> float:
+        with self._lock:
+            if not self._batches:
+                return 1.0
+            now = time.monotonic()
+            due = min(self._due_time(task_id, batch) for task_id, batch in self._batches.items())
+        return min(1.0, max(0.05, due - now))
+
+    def _due_time(self, task_id: str, batch: _Batch) -> float:
+        spec = self._specs.get(task_id)
+        debounce = spec.debounce if spec else self.default_debounce
+        return min(batch.last + debounce, batch.first + self.max_wait)
+
+    def _refresh(self):
+        """Görevlerin watch alanları değiştiyse izlenen klasörleri güncelle."""
+        tasks = self.service.tasks
+        signature = tuple(
+            (task['id'], task['path'], json.dumps(task['watch'], sort_keys=True))
+            for task in tasks if self.is_watched(task)
+        )
+        now = time.monotonic()
+        if signature == self._signature and not self._dirty and not (self._missing and now >= self._next_retry):
+            return
+        self._dirty = False
+
+        specs = {}
+        for task in tasks:
+            if not self.is_watched(task):
+                continue
+            try:
+                specs[task['id']] = WatchSpec(task, self.default_debounce)
+            except (KeyError, TypeError, ValueError) as e:
+                if signature != self._signature:
+                    self.service.log(f"⚠️ GEÇERSİZ WATCH: {task.get('name', task['id'])} - {e}")
+
+        directories = set()
+        for spec in specs.values():
+            directories.add(str(spec.root))
+            if spec.recursive and spec.root.is_dir():
+                for current, subdirs, _ in os.walk(spec.root):
+                    subdirs[:] = [name for name in subdirs if not name.startswith(".")]
+                    directories.update(os.path.join(current, name) for name in subdirs)
+
+        missing = self.backend.sync(directories)
+        for directory in sorted(missing - self._missing):
+            self.service.log(f"⚠️ İZLENEMİYOR: {directory} - klasör yok veya erişilemiyor (tekrar denenecek)")
+        for directory in sorted((self._missing - missing) & directories):
+            self.service.log(f"📂 İZLENİYOR: {directory}")
+
+        with self._lock:
+            self._specs = specs
+            for task_id in set(self._batches) - set(specs):
+                del self._batches[task_id]
+        self._missing = missing
+        self._next_retry = now + self.RETRY_INTERVAL
+        self._signature = signature
+
+    def _handle(self, event: str, path: str, kind: str):
+        if kind == "overflow":
+            self.service.log("⚠️ inotify olay kuyruğu taştı - bazı dosya değişiklikleri kaçırılmış olabilir")
+            return
+        if kind == "gone":
+            # Klasör silindi/taşındı - izleme listesi yeniden kurulur
+            self._dirty = True
+            return
+        if kind == "dir":
+            # Yeni alt klasör: recursive izleyen varsa ekle, içine önceden düşen dosyaları da say
+            if any(spec.recursive and spec.covers(os.path.dirname(path)) for spec in self._specs.values()):
+                self.backend.add(path)
+                for current, _, names in os.walk(path):
+                    for name in names:
+                        self._handle("created", os.path.join(current, name), "file")
+            return
+
+        directory = os.path.dirname(path)
+        with self._lock:
+            for task_id, spec in self._specs.items():
+                if not spec.covers(directory):
+                    continue
+                batch = self._batches.get(task_id)
+                if spec.matches(path, event):
+                    self._batches.setdefault(task_id, _Batch()).add(path)
+                    self.stats["events"] += 1
+                elif batch is not None and path in batch.files:
+                    batch.last = time.monotonic()  # Dosya hâlâ yazılıyor - sessizlik süresi yeniden başlar
+
+    def _flush(self):
+        """Sessizlik süresi dolan ve görevi çalışmayan birikimleri başlat."""
+        now = time.monotonic()
+        ready = []
+        with self._lock:
+            for task_id, batch in list(self._batches.items()):
+                if task_id in self._in_flight or now < self._due_time(task_id, batch):
+                    continue
+                ready.append((task_id, self._batches.pop(task_id), self._specs[task_id]))
+        for task_id, batch, spec in ready:
+            self._launch(task_id, batch, spec)
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # ÇALIŞTIRMA
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _launch(self, task_id: str, batch: _Batch, spec: WatchSpec):
+        service = self.service
+        task = service.find_task(task_id)
+        if task is None or not service.running:
+            return
+        files = sorted(batch.files)
+
+        if task.get('paused', False):
+            service.log(f"⏭ ATLANDI: {task['name']} - duraklatılmış ({len(files)} dosya)")
+            return
+        now = service.clock.now()
+        if not service.circuit_allows(task, now):
+            service.log(f"⏭ ATLANDI: {task['name']} - devre açık ({len(files)} dosya)")
+            return
+        try:
+            if now > datetime.strptime(task['end'], "%d.%m.%Y %H:%M"):
+                return
+        except (KeyError, ValueError):
+            pass
+        if task.get('status') == 'running':
+            self._requeue(task_id, batch)
+            return
+
+        slots = []
+        if service.cluster:
+            # Paylaşılan klasörde aynı dosyalar tüm node'larda görülür ama debounce
+            # her node'da farklı gruplar oluşturabilir - lease dosya başına alınır,
+            # her dosya sürümünü tek node işler
+            claimed = []
+            for file_path in files:
+                slot = "watch:" + self._file_slot(spec.root, file_path)
+                if service.cluster.try_claim(task_id, slot, float('inf')) == service.cluster.CLAIMED:
+                    claimed.append(file_path)
+                    slots.append(slot)
+            if not claimed:
+                return
+            files = claimed
+
+        def on_done():
+            for slot in slots:
+                service.cluster.release(task_id, slot)
+            with self._lock:
+                self._in_flight.discard(task_id)
+
+        context = service.dag.root_context(task) or {}
+        context['trigger_files'] = files
+        context['trigger_dir'] = str(spec.root)
+
+        with self._lock:
+            self._in_flight.add(task_id)
+            self.stats["runs"] += 1
+            self.stats["coalesced"] += len(files) - 1
+
+        shown = ", ".join(Path(file_path).name for file_path in files[:3])
+        more = f" +{len(files) - 3}" if len(files) > 3 else ""
+        service.log(f"📂 DOSYA TETİKLEDİ: {task['name']} - {len(files)} dosya ({shown}{more})")
+        task['last_run'] = now.strftime("%d.%m.%Y %H:%M")
+        task['run_count'] = task.get('run_count', 0) + 1
+        service.save_task_fields([(task, ('last_run', 'run_count'))])
+        service.dispatch(task, on_done=on_done, context=context)
+
+    def _requeue(self, task_id: str, batch: _Batch):
+        """Görev çalışıyor - dosyalar bir sonraki çalıştırmaya eklenir."""
+        with self._lock:
+            pending = self._batches.get(task_id)
+            if pending is None:
+                self._batches[task_id] = batch
+            else:
+                pending.files |= batch.files
+                pending.first = min(pending.first, batch.first)
+            self._in_flight.add(task_id)
+        # Çalışan görev (saatle veya elle başlatılmış) bitince serbest bırakılır
+        threading.Thread(target=self._wait_idle, args=(task_id,), daemon=True).start()
+
+    def _wait_idle(self, task_id: str):
+        while self.service.running:
+            task = self.service.find_task(task_id)
+            if task is None or task.get('status') != 'running':
+                break
+            time.sleep(0.5)
+        with self._lock:
+            self._in_flight.discard(task_id)
+
+    @staticmethod
+    def _file_slot(root: Path, file_path: str) -> str:
+        """Dosya sürümünün node'lar arasında aynı olan anahtarı (klasöre göre yol + boyut + mtime)."""
+        try:
+            relative = Path(file_path).relative_to(root).as_posix()
+        except ValueError:
+            relative = Path(file_path).as_posix()
+        try:
+            stat = os.stat(file_path)
+            signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            signature = "-"  # Silinmiş dosya
+        return hashlib.sha1(f"{relative}\0{signature}".encode('utf-8')).hexdigest()[:16]
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': self.backend.name,
+                'watched_tasks': len(self._specs),
+                'pending_batches': len(self._batches),
+                'unavailable_dirs': sorted(self._missing),
+                **self.stats,
+            }
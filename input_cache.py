@@ -0,0 +1,86 @@
+# input_cache.py - Girdi Parmak İzi Önbelleği
+"""
+MGD Task Scheduler Pro v4.0 - Input Fingerprint Cache
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Görev kaydında "inputs" listesi (dosya, klasör veya glob) varsa, çalıştırmadan
+önce bu dosyaların parmak izi alınır. Son başarılı çalıştırmadan beri hiçbir
+girdi (ve görev script'i) değişmediyse çalıştırma atlanır ve history'e
+"cached" olarak yazılır.
+
+Parmak izi: önce boyut + mtime; değişmişse FileManager.get_file_hash ile içerik
+karşılaştırılır (sadece "touch" edilen dosya çalıştırmayı tetiklemez).
+"""
+
+import glob
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+from utils import FileManager
+
+
+class InputFingerprintCache:
+    """Görev başına son başarılı çalıştırmanın girdi parmak izleri (JSON dosyasında)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # task_id -> {'fingerprint': str, 'files': {yol: [boyut, mtime_ns, hash]}}
+        self._data: Dict[str, Dict[str, Any]] = FileManager.safe_read(self.path, 'json', default={}) or {}
+
+    @staticmethod
+    def expand(task: Dict[str, Any]) -> List[str]:
+        """inputs listesini dosya yollarına aç (göreli yollar script klasörüne göre)."""
+        base = Path(task['path']).parent
+        files = {str(Path(task['path']))}
+        for pattern in task.get('inputs') or ():
+            full = Path(pattern) if Path(pattern).is_absolute() else base / pattern
+            if glob.has_magic(str(full)):
+                files.update(match for match in glob.glob(str(full), recursive=True) if Path(match).is_file())
+            elif full.is_dir():
+                files.update(str(child) for child in full.rglob("*") if child.is_file())
+            else:
+                files.add(str(full))  # Yoksa "eksik" olarak parmak izine girer
+        return sorted(files)
+
+    def compute(self, task: Dict[str, Any]) -> Tuple[str, Dict[str, list]]:
+        """(parmak izi, dosya bilgileri) - boyut+mtime değişmeyen dosya tekrar hash'lenmez."""
+        with self._lock:
+            previous = dict(self._data.get(task['id'], {}).get('files', {}))
+
+        files = {}
+        for file_path in self.expand(task):
+            try:
+                stat = Path(file_path).stat()
+            except OSError:
+                files[file_path] = [-1, 0, ""]
+                continue
+            old = previous.get(file_path)
+            if old and old[0] == stat.st_size and old[1] == stat.st_mtime_ns:
+                files[file_path] = old
+            else:
+                files[file_path] = [stat.st_size, stat.st_mtime_ns, FileManager.get_file_hash(Path(file_path))]
+
+        digest = hashlib.sha256()
+        for file_path, (_, _, file_hash) in files.items():
+            digest.update(f"{file_path}\0{file_hash}\n".encode('utf-8'))
+        return digest.hexdigest(), files
+
+    def unchanged(self, task: Dict[str, Any]) -> Tuple[bool, str, Dict[str, list]]:
+        """Son başarılı çalıştırmadan beri girdiler aynı mı?"""
+        fingerprint, files = self.compute(task)
+        with self._lock:
+            stored = self._data.get(task['id'], {}).get('fingerprint')
+        return stored == fingerprint, fingerprint, files
+
+    def record_success(self, task_id: str, fingerprint: str, files: Dict[str, list]):
+        """Başarılı çalıştırmanın girdilerini kaydet."""
+        with self._lock:
+            self._data[task_id] = {'fingerprint': fingerprint, 'files': files}
+            try:
+                FileManager.atomic_write(self.path, self._data, 'json')
+            except Exception as e:
+                print(f"⚠️ Girdi önbelleği kaydedilemedi: {e}")
@@ -0,0 +1,177 @@
+# notification_outbox.py - Kalıcı Bildirim Kuyruğu
+"""
+MGD Task Scheduler Pro v4.0 - Notification Outbox
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Gönderilecek bildirimler önce SQLite dosyasına yazılır, sonra arka planda
+gönderilir. Ağ kesintisinde veya program kapanınca bildirim kaybolmaz;
+bir sonraki açılışta gönderim kaldığı yerden devam eder.
+
+- En az bir kez (at-least-once) teslim: kayıt ancak gönderim başarılıysa kapanır
+- Dedupe anahtarı: aynı anahtarla ikinci kez eklenen bildirim yok sayılır
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+class NotificationOutbox:
+    """SQLite tabanlı bildirim kuyruğu (WAL)."""
+
+    # 'sending' durumunda kalan kayıt (gönderim sırasında çöküş) bu süre sonra tekrar denenir
+    SENDING_TIMEOUT = 120  # saniye
+    # Gönderilen kayıtlar dedupe için bu süre tutulur
+    SENT_RETENTION = 7 * 24 * 3600
+
+    def __init__(self, path: Path, max_age_hours: float = 24):
+        self.path = Path(path)
+        self.max_age = max_age_hours * 3600
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, dedupe_key TEXT UNIQUE NOT NULL, "
+                "method TEXT NOT NULL, payload TEXT NOT NULL, state TEXT NOT NULL DEFAULT 'pending', "
+                "attempts INTEGER NOT NULL DEFAULT 0, created REAL NOT NULL, next_attempt REAL NOT NULL, "
+                "updated REAL, last_error TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(state, next_attempt)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(method: str, payload: Dict[str, Any]) -> str:
+        """İçerikten dedupe anahtarı (aynı mesaj iki kez kuyruğa girmez)."""
+        raw = method + json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def put(self, method: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None) -> bool:
+        """Bildirimi kalıcı olarak ekle. Aynı anahtar zaten varsa False."""
+        now = time.time()
+        key = dedupe_key or self.make_key(method, payload)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO outbox (dedupe_key, method, payload, created, next_attempt, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, method, json.dumps(payload, ensure_ascii=False), now, now, now)
+                )
+        return cursor.rowcount == 1
+
+    def claim_due(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Zamanı gelen kayıtları 'sending' olarak işaretleyip döndür."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                # Gönderilirken yarım kalanlar ve çok eskiyenler
+                conn.execute(
+                    "UPDATE outbox SET state = 'pending' WHERE state = 'sending' AND updated < ?",
+                    (now - self.SENDING_TIMEOUT,)
+                )
+                conn.execute(
+                    "UPDATE outbox SET state = 'expired', updated = ? WHERE state = 'pending' AND created < ?",
+                    (now, now - self.max_age)
+                )
+                rows = conn.execute(
+                    "SELECT id, method, payload, attempts FROM outbox "
+                    "WHERE state = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+                    (now, limit)
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE outbox SET state = 'sending', updated = ? WHERE id = ?",
+                    [(now, row[0]) for row in rows]
+                )
+        return [
+            {'id': row[0], 'method': row[1], 'payload': json.loads(row[2]), 'attempts': row[3]}
+            for row in rows
+        ]
+
+    def mark_sent(self, entry_id: int):
+        self._finish(entry_id, 'sent', None)
+
+    def mark_failed(self, entry_id: int, error: str):
+        """Kalıcı hata - tekrar denenmez."""
+        self._finish(entry_id, 'failed', error)
+
+    def _finish(self, entry_id: int, state: str, error: Optional[str]):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET state = ?, updated = ?, last_error = ? WHERE id = ?",
+                    (state, now, error, entry_id)
+                )
+                conn.execute(
+                    "DELETE FROM outbox WHERE state != 'pending' AND state != 'sending' AND updated < ?",
+                    (now - self.SENT_RETENTION,)
+                )
+
+    def retry_later(self, entry_id: int, delay: float, error: str):
+        """Geçici hata - delay saniye sonra tekrar denenecek."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET state = 'pending', attempts = attempts + 1, "
+                    "next_attempt = ?, updated = ?, last_error = ? WHERE id = ?",
+                    (now + delay, now, error, entry_id)
+                )
+
+    def next_due_in(self) -> Optional[float]:
+        """Bir sonraki bekleyen kayda kalan süre (yoksa None)."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT MIN(next_attempt) FROM outbox WHERE state = 'pending'"
+            ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def pending_count(self) -> int:
+        """Henüz teslim edilmemiş kayıt sayısı."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT COUNT(*) FROM outbox WHERE state IN ('pending', 'sending')"
+            ).fetchone()
+        return row[0]
+
+    def trim(self, limit: int) -> int:
+        """Bekleyen kayıtları en fazla limit'e indir (fazlası, en yeniler atılır). Atılan sayısı döner."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE outbox SET state = 'dropped', updated = ? WHERE id IN ("
+                    "SELECT id FROM outbox WHERE state = 'pending' ORDER BY id LIMIT -1 OFFSET ?)",
+                    (now, limit)
+                )
+        return cursor.rowcount
+
+    def release_sending(self):
+        """Kapanışta gönderilmekte olan kayıtları bir sonraki açılış için bırak."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("UPDATE outbox SET state = 'pending' WHERE state = 'sending'")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
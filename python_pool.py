@@ -0,0 +1,381 @@
+# python_pool.py - Sıcak Python Worker Havuzu
+"""
+MGD Task Scheduler Pro v4.0 - Warm Python Worker Pool
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+.py görevleri her çalıştırmada yeni yorumlayıcı açmak yerine önceden başlatılmış
+(ve python_preload_modules modüllerini yüklemiş) worker süreçlerinde runpy ile
+çalıştırılır. Yorumlayıcı açılışı ve ağır import'lar (pandas vb.) tek seferlik olur.
+
+- Her çalıştırma yeni bir __main__ namespace'i alır; sys.argv, sys.path, çalışma
+  dizini ve ortam değişkenleri çalıştırma sonrası geri yüklenir
+- Worker N çalıştırmadan sonra veya bellek sınırını aşınca yenilenir
+- Tüm worker'lar meşgulse görev her zamanki gibi yeni süreçte çalışır
+
+Worker protokolü (stdin/stdout, satır bazlı):
+    ebeveyn → worker : {"path": "...", "env": {...}}  (JSON satırı)
+    worker → ebeveyn : görev çıktısı satırları, sonra "\\x1eMGD-EXIT <kod> <rss_mb>"
+"""
+
+import os
+import sys
+import json
+import threading
+import subprocess
+from pathlib import Path
+from typing import Optional, List
+
+MARKER = "\x1eMGD-"
+READY_LINE = MARKER + "READY"
+EXIT_PREFIX = MARKER + "EXIT "
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# WORKER SÜRECİ
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _working_set_mb() -> float:
+    """Windows: sürecin working set'i (GetProcessMemoryInfo, ctypes ile)."""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.K32GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+    if not kernel32.K32GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return 0.0
+    return counters.WorkingSetSize / (1024 * 1024)
+
+
+def _rss_mb() -> float:
+    """Sürecin bellek kullanımı (MB) - ölçülemezse 0."""
+    if sys.platform == "win32":
+        try:
+            return _working_set_mb()
+        except (OSError, AttributeError):
+            return 0.0
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return 0.0
+
+
+def _run_script(path: str, env: Optional[dict] = None) -> int:
+    """Script'i yeni __main__ namespace'inde çalıştır, çıkış kodunu döndür."""
+    import runpy
+    import traceback
+
+    saved_argv, saved_path = sys.argv[:], sys.path[:]
+    saved_streams = sys.stdout, sys.stderr
+    saved_cwd, saved_env = os.getcwd(), dict(os.environ)
+    saved_modules = set(sys.modules)
+    script_dir = str(Path(path).resolve().parent)
+
+    sys.argv = [path]
+    sys.path.insert(0, script_dir)
+    os.environ.update(env or {})
+    stdin, sys.stdin = sys.stdin, open(os.devnull)
+    code = 0
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # Yorumlayıcı gibi sadece script'in frame'lerini göster
+        tb = e.__traceback__
+        while tb and tb.tb_frame.f_code.co_filename != path:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        code = 1
+    finally:
+        sys.stdin.close()
+        sys.stdin = stdin
+        sys.stdout, sys.stderr = saved_streams
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        # Script'in yanındaki modüller bir sonraki çalıştırmada diskten tekrar okunsun
+        for name in set(sys.modules) - saved_modules:
+            module_file = getattr(sys.modules[name], "__file__", None) or ""
+            if module_file.startswith(script_dir):
+                del sys.modules[name]
+    return code
+
+
+def worker_main(preload: List[str]) -> int:
+    """Worker giriş noktası: modülleri yükle, komut bekle."""
+    import importlib
+
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"⚠️ Ön yükleme başarısız [{name}]: {e}", file=sys.stderr)
+
+    control = sys.stdin
+    out = sys.stdout
+    out.write(READY_LINE + "\n")
+    out.flush()
+
+    for line in control:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        code = _run_script(request["path"], request.get("env"))
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Çıktı yeni satırla bitmemiş olabilir - işaret her zaman satır başında
+        out.write(f"\n{EXIT_PREFIX}{code} {_rss_mb():.1f}\n")
+        out.flush()
+    return 0
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# EBEVEYN TARAFI
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class _WarmWorker:
+    """Tek worker süreci."""
+
+    def __init__(self, preload: List[str], env: dict):
+        creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", str(Path(__file__).resolve()), "--worker", ",".join(preload)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1, encoding="utf-8", errors="replace",
+            env={**env, "PYTHONIOENCODING": "utf-8"},
+            creationflags=creationflags
+        )
+        self.runs = 0
+        self.ready = False
+        self.startup_output: List[str] = []
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    def wait_ready(self) -> bool:
+        """READY satırına kadar oku (ön yükleme uyarıları saklanır)."""
+        for line in iter(self.proc.stdout.readline, ''):
+            if line.rstrip("\n") == READY_LINE:
+                self.ready = True
+                return True
+            if line.strip():
+                self.startup_output.append(line.strip())
+        return False
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def stop(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+
+
+class _RunStdout:
+    """Worker çıktısını bitiş işaretine kadar görev çıktısı olarak verir."""
+
+    def __init__(self, run: "WarmRun"):
+        self._run = run
+
+    def readline(self) -> str:
+        run = self._run
+        if run.finished:
+            return ''
+        line = run.worker.proc.stdout.readline()
+        if line == '':
+            run._finish(None, 0.0)  # Worker öldü
+            return ''
+        if line.startswith(EXIT_PREFIX):
+            code, rss = line[len(EXIT_PREFIX):].split()
+            run._finish(int(code), float(rss))
+            return ''
+        return line
+
+    def close(self):
+        pass  # Pipe worker'a aittir
+
+
+class WarmRun:
+    """
+    Sıcak worker'daki çalıştırma - execute_task için Popen ile aynı arayüz
+    (pid, stdout.readline, stdout.close, wait, kill).
+    """
+
+    def __init__(self, pool: "PythonWorkerPool", worker: _WarmWorker):
+        self.pool = pool
+        self.worker = worker
+        self.pid = worker.pid
+        self.stdout = _RunStdout(self)
+        self.finished = False
+        self.returncode: Optional[int] = None
+
+    def _finish(self, code: Optional[int], rss_mb: float):
+        self.finished = True
+        if code is None:
+            self.returncode = self.worker.proc.wait()
+            self.pool._discard(self.worker)
+        else:
+            self.returncode = code
+            self.pool._release(self.worker, rss_mb)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        while not self.finished:
+            self.stdout.readline()
+        return self.returncode
+
+    def kill(self):
+        """Çalıştırmayı durdur - worker süreci de sonlanır ve yenilenir."""
+        if not self.finished:
+            self.worker.proc.kill()
+            self.worker.proc.wait()
+            self._finish(None, 0.0)
+
+
+class PythonWorkerPool:
+    """Sıcak worker havuzu."""
+
+    def __init__(self, size: int, preload: List[str], max_runs: int, max_memory_mb: float, env: dict):
+        self.size = size
+        self.preload = preload
+        self.max_runs = max_runs
+        self.max_memory_mb = max_memory_mb
+        self.env = env
+        self._lock = threading.Lock()
+        self._idle: List[_WarmWorker] = []
+        self._starting = 0
+        self._busy = 0
+        self._closed = False
+        self._startup_reported = False
+        self.stats = {"warm_runs": 0, "cold_fallbacks": 0, "recycled": 0, "crashed": 0}
+
+    def start(self):
+        """Havuzu arka planda doldur."""
+        for _ in range(self.size):
+            self._spawn_async()
+        print(f"♨️ Python worker havuzu: {self.size} süreç (ön yükleme: {', '.join(self.preload) or '-'})")
+
+    def _spawn_async(self):
+        with self._lock:
+            if self._closed or len(self._idle) + self._starting + self._busy >= self.size:
+                return
+            self._starting += 1
+        threading.Thread(target=self._spawn, name="python-pool-spawn", daemon=True).start()
+
+    def _spawn(self):
+        worker = None
+        try:
+            worker = _WarmWorker(self.preload, self.env)
+            ready = worker.wait_ready()
+            if not self._startup_reported:
+                self._startup_reported = True
+                for line in worker.startup_output:
+                    print(line)
+        except OSError as e:
+            print(f"⚠️ Python worker başlatılamadı: {e}")
+            ready = False
+        with self._lock:
+            self._starting -= 1
+            if ready and not self._closed:
+                self._idle.append(worker)
+                return
+        if worker:
+            worker.stop()
+
+    def run(self, path: Path, env: Optional[dict] = None) -> Optional[WarmRun]:
+        """
+        Script'i boştaki worker'da başlat; boş worker yoksa None (soğuk başlatma).
+        env: Bu çalıştırmaya özel ek ortam değişkenleri (çalıştırma sonrası geri alınır).
+        """
+        with self._lock:
+            worker = None
+            while self._idle and worker is None:
+                candidate = self._idle.pop()
+                worker = candidate if candidate.alive() else None
+            if worker is None:
+                self.stats["cold_fallbacks"] += 1
+            else:
+                self._busy += 1
+                self.stats["warm_runs"] += 1
+        if worker is None:
+            self._spawn_async()
+            return None
+
+        try:
+            worker.proc.stdin.write(json.dumps({"path": str(path), "env": env or {}}) + "\n")
+            worker.proc.stdin.flush()
+        except OSError:
+            self._discard(worker)
+            return None
+        return WarmRun(self, worker)
+
+    def _release(self, worker: _WarmWorker, rss_mb: float):
+        worker.runs += 1
+        recycle = worker.runs >= self.max_runs or (self.max_memory_mb and rss_mb > self.max_memory_mb)
+        with self._lock:
+            self._busy -= 1
+            if not recycle and not self._closed:
+                self._idle.append(worker)
+                return
+            if recycle:
+                self.stats["recycled"] += 1
+        worker.stop()
+        self._spawn_async()
+
+    def _discard(self, worker: _WarmWorker):
+        with self._lock:
+            self._busy -= 1
+            self.stats["crashed"] += 1
+        self._spawn_async()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {'size': self.size, 'idle': len(self._idle), 'busy': self._busy, **self.stats}
+
+
+def create_python_pool(config, env: dict) -> Optional[PythonWorkerPool]:
+    """Config'e göre havuz oluştur (kapalıysa veya exe içinde None)."""
+    if config.python_warm_workers <= 0:
+        return None
+    if getattr(sys, 'frozen', False):
+        print("⚠️ Python worker havuzu exe sürümünde desteklenmiyor")
+        return None
+    preload = [name.strip() for name in config.python_preload_modules.split(",") if name.strip()]
+    return PythonWorkerPool(config.python_warm_workers, preload, config.python_worker_max_runs,
+                            config.python_worker_max_memory_mb, env)
+
+
+if __name__ == "__main__" and len(sys.argv) >= 2 and sys.argv[1] == "--worker":
+    sys.exit(worker_main([name for name in (sys.argv[2] if len(sys.argv) > 2 else "").split(",") if name]))
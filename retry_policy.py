@@ -0,0 +1,126 @@
+# retry_policy.py - Tekrar Deneme ve Devre Kesici
+"""
+MGD Task Scheduler Pro v4.0 - Retry Backoff & Circuit Breaker
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Tekrar denemeler üstel artan ve rastgele saçılan aralıklarla yapılır:
+
+    bekleme = retry_delay × retry_backoff_factor^(deneme-1)   (en fazla retry_max_delay, ±retry_jitter)
+
+Bir "döngü" zamanlanmış çalıştırma ve onun tekrar denemeleridir. Görev art arda
+circuit_breaker_threshold döngü boyunca başarısız olursa devre açılır:
+
+    kapalı ──K başarısız döngü──► açık ──bekleme süresi──► yarı açık (tek deneme)
+       ▲                                                       │
+       └──────────────── başarılı ◄────────────────────────────┤
+                                    başarısız: süre 2 katına çıkar, tekrar açık
+
+Devre durumu görev alanlarında tutulur (kaydedilir, yeniden başlatmada korunur).
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+TIME_FORMAT = "%d.%m.%Y %H:%M"
+
+# execute_task / handle_task_retry'ın değiştirdiği devre alanları
+CIRCUIT_FIELDS = ('failed_cycles', 'circuit_state', 'circuit_open_until', 'circuit_cooldown')
+
+
+class RetryPolicy:
+    """Tekrar deneme bekleme süresi ve görev başına devre kesici durumu."""
+
+    def __init__(self, config, rng=None):
+        self.config = config
+        self.random = rng or random  # Simülasyonda tohumlu random.Random (tekrarlanabilir)
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # BACKOFF
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def retry_delay(self, task: Dict[str, Any], attempt: int) -> int:
+        """attempt. tekrar denemeden önce beklenecek süre (saniye)."""
+        base = task.get('retry_delay', self.config.retry_delay)
+        factor = max(1.0, self.config.retry_backoff_factor)
+        cap = max(base, self.config.retry_max_delay)
+        delay = min(base * factor ** max(0, attempt - 1), cap)
+        jitter = max(0.0, min(1.0, self.config.retry_jitter))
+        if jitter:
+            delay = min(delay * self.random.uniform(1 - jitter, 1 + jitter), cap)
+        return max(1, int(round(delay)))
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # DEVRE KESİCİ
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.circuit_breaker_threshold > 0
+
+    @staticmethod
+    def state(task: Dict[str, Any]) -> str:
+        return task.get('circuit_state') or CIRCUIT_CLOSED
+
+    @staticmethod
+    def is_probe(task: Dict[str, Any]) -> bool:
+        """Yarı açık devrede deneme çalıştırması mı? (tekrar denenmez)"""
+        return task.get('circuit_state') == CIRCUIT_HALF_OPEN
+
+    def open_until(self, task: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return datetime.strptime(task.get('circuit_open_until') or "", TIME_FORMAT)
+        except ValueError:
+            return None
+
+    def allows(self, task: Dict[str, Any], now: datetime) -> bool:
+        """
+        Görev çalıştırılabilir mi? Açık devrenin süresi dolduysa yarı açık
+        duruma geçer (tek deneme çalıştırmasına izin verilir).
+        """
+        if self.state(task) != CIRCUIT_OPEN:
+            return True
+        until = self.open_until(task)
+        if until is not None and now < until:
+            return False
+        task['circuit_state'] = CIRCUIT_HALF_OPEN
+        return True
+
+    def on_success(self, task: Dict[str, Any]) -> bool:
+        """Başarılı çalıştırma - devre kapanır. Devre açık/yarı açıktıysa True."""
+        was_tripped = self.state(task) != CIRCUIT_CLOSED
+        self.reset(task)
+        return was_tripped
+
+    def on_cycle_failed(self, task: Dict[str, Any], now: datetime) -> bool:
+        """Döngü (tüm tekrar denemeler) başarısız bitti. Devre açıldıysa True."""
+        task['failed_cycles'] = task.get('failed_cycles', 0) + 1
+        if not self.enabled:
+            return False
+
+        if self.is_probe(task):
+            # Deneme de başarısız - bekleme süresi ikiye katlanır
+            cooldown = min(max(task.get('circuit_cooldown', 0), self.config.circuit_breaker_cooldown) * 2,
+                           self.config.circuit_breaker_max_cooldown)
+        elif task['failed_cycles'] >= self.config.circuit_breaker_threshold:
+            cooldown = self.config.circuit_breaker_cooldown
+        else:
+            return False
+
+        task['circuit_state'] = CIRCUIT_OPEN
+        task['circuit_cooldown'] = cooldown
+        task['circuit_open_until'] = (now + timedelta(seconds=cooldown)).strftime(TIME_FORMAT)
+        return True
+
+    @staticmethod
+    def reset(task: Dict[str, Any]):
+        """Devreyi elle kapat (görev devam ettirildiğinde)."""
+        task['failed_cycles'] = 0
+        task['circuit_state'] = CIRCUIT_CLOSED
+        task['circuit_open_until'] = ""
+        task['circuit_cooldown'] = 0
@@ -0,0 +1,897 @@
+# scheduler_service.py - GUI'den Bağımsız Zamanlayıcı Servisi
+"""
+MGD Task Scheduler Pro v4.0 - Scheduler Service
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Zamanlayıcı döngüsü, görev çalıştırma ve kayıt işlemleri Tk'dan bağımsızdır.
+GUI bu servisi kullanır; ekransız sunucularda ise tek başına çalışır:
+
+    python main.py --headless
+"""
+
+import os
+import sys
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from functools import partial
+from itertools import count
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from config import AppConfig, SCRIPT_DIR
+from clock import SystemClock
+from task_repository import TaskRepository
+from telegram_manager import create_telegram_manager
+from event_bus import TaskEvent, create_event_bus
+from task_dag import TaskGraph, pipeline_fields
+from python_pool import create_python_pool
+from spawn_server import create_spawn_server
+from input_cache import InputFingerprintCache
+from file_triggers import FileTriggerManager, trigger_env
+from start_spread import StartSpreader
+from retry_policy import RetryPolicy, CIRCUIT_FIELDS, CIRCUIT_OPEN, CIRCUIT_CLOSED
+from script_registry import ScriptRegistry
+from task_history import TaskHistoryManager, TaskHistoryRecord
+from utils import FileManager, DateTimeHelper, StartupProfiler, SingleInstance
+from control_api import ControlClient, start_control_server
+
+# Görev olarak eklenirse kendini tekrar başlatmasın diye
+MAIN_SCRIPT = (SCRIPT_DIR / "main.py").resolve()
+
+
+class SchedulerService:
+    """
+    Görevleri zamanlayan ve çalıştıran servis.
+
+    log_callback     : Log satırlarını alan fonksiyon (yoksa konsola + log dosyasına yazılır)
+    on_tasks_changed : Görev durumu değiştiğinde çağrılır (GUI listeyi yeniler)
+    clock            : Zaman kaynağı (varsayılan gerçek saat; simülasyonda SimulatedClock)
+    """
+
+    # execute_task'ın değiştirdiği alanlar (satır bazında kaydedilir)
+    RUN_RESULT_FIELDS = ('success_count', 'fail_count', 'current_retry', 'last_error', 'next_run') + CIRCUIT_FIELDS
+
+    # Kontrol API'si için bellekte tutulan son log satırı sayısı
+    LOG_BUFFER_SIZE = 1000
+
+    def __init__(self, config: AppConfig, log_callback=None, on_tasks_changed=None,
+                 startup: StartupProfiler = None, clock=None):
+        self._init_executor_state(config, log_callback, on_tasks_changed, clock)
+        self.startup = startup or StartupProfiler()
+
+        # Dizinleri oluştur
+        for dir_name in [config.logs_dir, config.backups_dir,
+                         config.templates_dir, config.history_dir]:
+            Path(dir_name).mkdir(exist_ok=True)
+
+        self.backup_dir = Path(config.backups_dir)
+
+        # Managers
+        self.repo = TaskRepository(config)
+        self.telegram = create_telegram_manager(config)
+        self.history = TaskHistoryManager(config.history_dir)
+        # 📣 Görev olayları - Telegram, masaüstü, webhook, dosya, e-posta kanalları
+        self.events = create_event_bus(config, lambda: self.telegram)
+
+        # Durum - görevler start() ile yüklenir
+        self.tasks_loaded = False
+        self.start_time = datetime.now()
+        self.monitor_thread = None
+
+        # 🌐 Cluster modu - çalıştırmalar paylaşılan lease deposundan sahiplenilir
+        if config.cluster_enabled:
+            from cluster import ClusterNode
+            self.cluster = ClusterNode(config)
+
+        # ⛓ Görev bağımlılıkları (depends_on)
+        self.dag = TaskGraph(self)
+
+        # ⏳ Aynı saatteki görevleri dağıtma (jitter) ve yüke göre erteleme
+        self.spreader = StartSpreader(config, log=self.log)
+
+        # 📂 Dosya/klasör tetikleyicileri (watch) - start() içinde başlatılır
+        self.file_triggers = FileTriggerManager(self)
+
+        # 💾 Girdileri değişmeyen görevler atlanır (inputs)
+        self.input_cache = InputFingerprintCache(Path(config.input_cache_file))
+        self._input_pending = {}  # task_id -> (parmak izi, dosyalar) - başarılı olursa kaydedilir
+        self._stop_event = threading.Event()
+
+    def _init_executor_state(self, config: AppConfig, log_callback=None, on_tasks_changed=None, clock=None):
+        """
+        Görev çalıştırmak için gereken ortak durum.
+        ShardExecutor (alt süreç) depo/history açmadan sadece bunu kurar.
+        """
+        self.config = config
+        self.log_callback = log_callback
+        self.on_tasks_changed = on_tasks_changed
+        self.clock = clock or SystemClock()
+        self.tasks = []
+        self.running = True
+        self.cluster = None
+        # 🧩 Çok süreçli çalıştırma - start() içinde başlatılır
+        self.shards = None
+        # 🔌 Üstel tekrar deneme ve devre kesici
+        self.retry_policy = RetryPolicy(config)
+        self._probes = set()  # Yarı açık devrede çalışmakta olan deneme çalıştırmaları (task_id)
+        self._retry_contexts = {}  # task_id -> son tetiklenme bilgisi (bağımlı / dosya tetiklemeli görevlerin retry'ı için)
+        self._log_lock = threading.Lock()
+        self.recent_logs = deque(maxlen=self.LOG_BUFFER_SIZE)
+        # ♨️ Sıcak Python worker'ları ve spawn server (worker süreçleri varsa her süreç kendininkini açar)
+        self._init_launchers()
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # YAŞAM DÖNGÜSÜ
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def start(self, on_loaded=None):
+        """Görevleri yükle, scheduler'ı başlat, bakım işlerini yap (bloklar)."""
+        # 1. Görevleri yükle
+        with self.startup.phase("tasks"):
+            loaded = self.load_tasks()
+
+        # Yükleme sırasında eklenen görevler korunur
+        self.tasks[:0] = loaded
+        self.tasks_loaded = True
+
+        # 2. Scheduler'ı görevler yüklenir yüklenmez başlat
+        with self.startup.phase("scheduler"):
+            if self.cluster:
+                self.cluster.start(on_orphan=self.on_orphan_lease)
+            if self.config.worker_processes > 1:
+                from sharding import ShardPool
+                self.shards = ShardPool(self, self.config.worker_processes)
+                self.shards.start()
+            else:
+                self.start_launchers()
+            self.monitor_thread = threading.Thread(target=self.scheduler_loop, name="scheduler", daemon=True)
+            self.monitor_thread.start()
+            self.file_triggers.start()
+
+        if on_loaded:
+            on_loaded()
+
+        # 3. Bakım işleri - scheduler'ı bekletmeden
+        with self.startup.phase("maintenance"):
+            # 🧹 OTOMATIK TEMİZLİK - Her açılışta eski dosyaları temizle
+            self.cleanup_old_files()
+
+            # 🗂️ History saklama politikası - arka planda, periyodik
+            self.history.start_background_compaction(
+                self.config.keep_history_days,
+                self.config.max_history_records,
+                self.config.history_output_keep_days,
+                self.config.history_compaction_interval
+            )
+
+        self.log(f"⏱ Açılış süreleri: {self.startup.summary()}")
+
+    def start_in_background(self, on_loaded=None) -> threading.Thread:
+        """start()'ı arka plan thread'inde çalıştır (GUI açılışı bekletilmez)."""
+        thread = threading.Thread(target=self.start, args=(on_loaded,), name="startup", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Scheduler döngüsünü ve arka plan işlerini durdur."""
+        self.running = False
+        self._stop_event.set()
+        self.history.stop_background_compaction()
+        if self.shards:
+            self.shards.stop()
+        self.stop_launchers()
+        self.file_triggers.close()
+        if self.cluster:
+            self.cluster.stop()
+
+    def shutdown(self):
+        """Durdur, yedekle, kaydet ve kapanış bildirimini gönder."""
+        self.stop()
+
+        if self.config.backup_on_exit:
+            self.create_backup()
+
+        self.save_tasks()
+        self.history.flush_daily_stats()
+
+        # Olay kanalları önce boşaltılır (Telegram kanalı mesajları manager kuyruğuna aktarır)
+        self.events.close(timeout=self.config.event_shutdown_flush_timeout)
+
+        # Telegram bildirimi - kuyruk en fazla telegram_shutdown_flush_timeout saniye boşaltılır,
+        # gönderilemeyenler outbox'ta kalır
+        if self.telegram:
+            stats = self.history.get_statistics(1)
+            self.telegram.send_shutdown_message(stats)
+            self.telegram.close(timeout=self.config.telegram_shutdown_flush_timeout)
+
+        self.repo.storage.close()
+
+    def send_welcome(self) -> bool:
+        """Telegram ayarlıysa hoş geldin mesajı gönder."""
+        if self.telegram and self.config.validate_telegram():
+            self.telegram.send_welcome_message()
+            print("📱 Telegram hoş geldin mesajı gönderildi")
+            return True
+        return False
+
+    def emit(self, event: TaskEvent):
+        """Görev olayını bildirim kanallarına yayınla (bloklamaz)."""
+        self.events.emit(event)
+
+    def tasks_changed(self):
+        """Görev durumu değişti - dinleyiciyi bilgilendir."""
+        if self.on_tasks_changed:
+            self.on_tasks_changed()
+
+    def log(self, message):
+        """Log yaz - GUI varsa rapor paneline, yoksa konsola ve günlük log dosyasına."""
+        now = datetime.now()
+        line = f"[{now.strftime('%H:%M:%S')}] {message}"
+        self.recent_logs.append(line)
+
+        if self.log_callback:
+            self.log_callback(message)
+            return
+
+        with self._log_lock:
+            print(line, flush=True)
+            try:
+                log_file = Path(self.config.logs_dir) / f"mgd_{now.strftime('%Y%m%d')}.log"
+                with open(log_file, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+            except OSError:
+                pass
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # GÖREV KONTROLÜ (GUI ve kontrol API'si)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def find_task(self, task_id: str):
+        """Id ile görev bul."""
+        return next((task for task in self.tasks if task.get('id') == task_id), None)
+
+    def run_now(self, task) -> bool:
+        """Görevi zamanını beklemeden çalıştır (zaten çalışıyorsa False)."""
+        if not self.running or task.get('status') == 'running':
+            return False
+
+        task['last_run'] = self.clock.now().strftime("%d.%m.%Y %H:%M")
+        task['run_count'] = task.get('run_count', 0) + 1
+        self.save_task_fields([(task, ('last_run', 'run_count'))])
+
+        self.log(f"⚡ ŞİMDİ ÇALIŞTIR: {task['name']}")
+        self.dispatch(task)
+        return True
+
+    def set_paused(self, task, paused: bool):
+        """Görevi duraklat / devam ettir (devam ettirmek açık devreyi de sıfırlar)."""
+        task['paused'] = paused
+        self.save_task_fields([(task, ('paused',))])
+        self.log(f"⏸ {task['name']} - {'Duraklatıldı' if paused else 'Devam ettirildi'}")
+        if not paused and self.retry_policy.state(task) != CIRCUIT_CLOSED:
+            self.reset_circuit(task)
+        self.tasks_changed()
+
+    def reset_circuit(self, task):
+        """Açık devreyi elle kapat - görev normal zamanlamasına döner."""
+        self.retry_policy.reset(task)
+        self.save_task_fields([(task, CIRCUIT_FIELDS)])
+        self.log(f"🔌 DEVRE SIFIRLANDI: {task['name']}")
+        self.tasks_changed()
+
+    def circuit_allows(self, task, now: datetime) -> bool:
+        """
+        Devre kesici görevin çalışmasına izin veriyor mu? Süresi dolan devre yarı açılır;
+        yarı açık devrede deneme çalıştırması bitmeden ikincisi başlatılmaz.
+        """
+        if self.retry_policy.is_probe(task) and (task['id'] in self._probes or task.get('status') == 'running'):
+            return False
+        was_open = self.retry_policy.state(task) == CIRCUIT_OPEN
+        if not self.retry_policy.allows(task, now):
+            return False
+        if was_open:
+            self.log(f"🔌 DEVRE YARI AÇIK: {task['name']} - deneme çalıştırması yapılıyor")
+            self.save_task_fields([(task, ('circuit_state',))])
+        return True
+
+    def status(self) -> dict:
+        """Servisin anlık durumu."""
+        return {
+            'app': self.config.app_name,
+            'version': self.config.version,
+            'pid': os.getpid(),
+            'started': self.start_time.strftime("%d.%m.%Y %H:%M:%S"),
+            'uptime_seconds': int((datetime.now() - self.start_time).total_seconds()),
+            'tasks_loaded': self.tasks_loaded,
+            'task_count': len(self.tasks),
+            'running_tasks': sum(1 for task in self.tasks if task.get('status') == 'running'),
+            'paused_tasks': sum(1 for task in self.tasks if task.get('paused', False)),
+            'storage': self.repo.storage.name,
+            'cluster': self.cluster.status() if self.cluster else None,
+            'workers': self.shards.status() if self.shards else None,
+            'python_pool': self.python_pool.status() if self.python_pool else None,
+            'spawn_server': dict(self.spawner.stats) if self.spawner else None,
+            'script_registry': self.scripts.status(),
+            'dependencies': self.dag.status(),
+            'file_triggers': self.file_triggers.status(),
+            'start_spreading': self.spreader.status(),
+            'telegram': dict(self.telegram.stats) if self.telegram else None,
+            'notification_sinks': self.events.status(),
+        }
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # VERİ YÖNETİMİ
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def load_tasks(self):
+        """Depodan görevleri yükle."""
+        data = self.repo.load_tasks()
+        print(f"📋 {len(data)} görev yüklendi")
+        return data
+
+    def save_tasks(self):
+        """Güvenli kayıt."""
+        if not self.tasks_loaded:
+            return  # Yükleme bitmeden kayıt diskteki listeyi ezer
+        success, error_msg = self.repo.save_tasks(self.tasks)
+        if not success:
+            self.log(f"!!! KAYIT HATASI: {error_msg}")
+
+    def save_task_fields(self, updates):
+        """Sadece değişen görev alanlarını kaydet - [(task, alanlar), ...]."""
+        success, error_msg = self.repo.update_task_fields(self.tasks, updates)
+        if not success:
+            self.log(f"!!! KAYIT HATASI: {error_msg}")
+
+    def create_backup(self):
+        """Backup oluştur."""
+        success, error_msg = self.repo.create_backup()
+        if not success:
+            print(f"Backup error occurred: {error_msg}")
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # OTOMATIK TEMİZLİK
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def cleanup_old_files(self):
+        """Eski log ve backup dosyalarını temizle."""
+        try:
+            # Log dosyalarını temizle (son 30 günü tut)
+            log_dir = Path(self.config.logs_dir)
+            if log_dir.exists():
+                cutoff_date = datetime.now() - timedelta(days=30)
+                for log_file in log_dir.glob("*.log"):
+                    try:
+                        file_time = datetime.fromtimestamp(log_file.stat().st_mtime)
+                        if file_time < cutoff_date:
+                            log_file.unlink()
+                            print(f"🧹 Eski log silindi: {log_file.name}")
+                    except:
+                        pass
+            
+            # Backup dosyalarını temizle (config'deki sayıyı tut)
+            FileManager.cleanup_old_files(
+                self.backup_dir, 
+                self.repo.backup_pattern, 
+                self.config.backup_keep_count
+            )
+            
+            print("✅ Otomatik temizlik tamamlandı")
+        except Exception as e:
+            print(f"⚠️ Temizlik hatası: {e}")
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # ZAMANLAYICI
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def scheduler_loop(self):
+        """Ana zamanlayıcı döngüsü."""
+        print("🔄 Scheduler loop başlatıldı")
+        
+        while self.running:
+            try:
+                self.scheduler_tick(self.clock.now())
+            except Exception as e:
+                print(f"Scheduler loop error: {e}")
+            
+            self.clock.wait(self._stop_event, self.config.scheduler_interval)
+        
+        print("⏹ Scheduler loop sonlandırıldı")
+
+    def due_tasks(self, now: datetime):
+        """Bu turda bakılacak görevler (simülasyon kendi kuyruğunu kullanır)."""
+        return self.repo.get_due_tasks(self.tasks, now)
+
+    def scheduler_tick(self, now: datetime):
+        """Zamanlayıcının tek turu: zamanı gelenleri başlat, süresi dolanları işaretle."""
+        updated = False
+        changed = []
+        
+        for task in self.due_tasks(now):
+            try:
+                if task.get('paused', False):
+                    continue
+                
+                next_run = DateTimeHelper.parse_schedule_time(task['next_run'])
+                end_time = DateTimeHelper.parse_schedule_time(task['end'])
+                
+                if now > end_time:
+                    if task.get('status') != 'expired':
+                        task['status'] = 'expired'
+                        self.log(f"⏹ {task['name']} - Süre doldu")
+                        self.emit(TaskEvent.for_task("expired", task))
+                        changed.append((task, ('status',)))  # İndeksli depoda zamanı gelenlerden çıkar
+                        updated = True
+                    continue
+                
+                retrying = task.get('current_retry', 0) > 0
+                if (self.dag.is_dependent(task) or self.file_triggers.is_watched(task)) and not retrying:
+                    continue  # Öncülleri bitince TaskGraph, dosya gelince FileTriggerManager tetikler (retry'lar burada)
+                
+                if now >= next_run:
+                    if not self.circuit_allows(task, now):
+                        # Devre açık veya deneme sürüyor - kaçırılan zamanlar sonradan tekrar çalıştırılmaz
+                        new_time = DateTimeHelper.next_run_after(next_run, task['freq_type'], task['freq_val'], now)
+                        task['next_run'] = DateTimeHelper.format_schedule_time(new_time)
+                        changed.append((task, ('next_run',)))
+                        updated = True
+                        continue
+                    
+                    due = self.spreader.start_time(task, next_run, now)
+                    if due is None:
+                        continue  # Jitter süresi dolmadı veya sistem yükü yüksek
+                    
+                    if self.cluster:
+                        # Retry'lar sadece bu node'da planlanır, tercih beklenmez
+                        overdue = float('inf') if task.get('current_retry', 0) else (now - due).total_seconds()
+                        claim = self.cluster.try_claim(task['id'], task['next_run'], overdue)
+                        if claim == self.cluster.WAIT:
+                            continue
+                        if claim == self.cluster.TAKEN:
+                            # Başka node çalıştırdı - sadece bir sonraki zamana geç
+                            new_time = DateTimeHelper.calculate_next_run(next_run, task['freq_type'], task['freq_val'])
+                            task['next_run'] = DateTimeHelper.format_schedule_time(new_time)
+                            changed.append((task, ('next_run',)))
+                            updated = True
+                            continue
+                        self.dispatch(task, on_done=partial(self.cluster.release, task['id'], task['next_run']),
+                                      context=self.retry_context(task) if retrying else None)
+                    else:
+                        self.dispatch(task, context=self.retry_context(task) if retrying else None)
+                    
+                    new_time = DateTimeHelper.calculate_next_run(next_run, task['freq_type'], task['freq_val'])
+                    
+                    task['last_run'] = DateTimeHelper.format_schedule_time(now)
+                    task['next_run'] = DateTimeHelper.format_schedule_time(new_time)
+                    task['run_count'] = task.get('run_count', 0) + 1
+                    changed.append((task, ('last_run', 'next_run', 'run_count')))
+                    updated = True
+            
+            except Exception as e:
+                self.log(f"!!! SCHEDULER HATA [{task.get('name', 'Bilinmeyen')}]: {e}")
+        
+        if updated and self.running:
+            self.save_task_fields(changed)
+            self.tasks_changed()
+        
+        self.check_daily_report(now)
+
+    def check_daily_report(self, now: datetime):
+        """Ayarlanan saatte günlük raporu bir kez gönder (dahili zamanlanmış iş)."""
+        if not (self.telegram and self.config.telegram_send_daily_report):
+            return
+        
+        try:
+            report_time = datetime.strptime(self.config.telegram_daily_report_time, "%H:%M").time()
+        except ValueError:
+            return
+        
+        day = now.strftime('%Y-%m-%d')
+        if now.time() < report_time or not self.history.daily_stats_ready:
+            return  # Özetler arka planda hazırlanıyor
+        if self.history.report_sent_for(day):
+            return
+        
+        # Cluster modunda raporu tek bir node gönderir
+        if self.cluster:
+            claim = self.cluster.try_claim("__daily_report__", day, float('inf'))
+            if claim == self.cluster.TAKEN:
+                self.history.mark_report_sent(day)
+            if claim != self.cluster.CLAIMED:
+                return
+        
+        report = self.history.build_daily_report(
+            day, self.tasks, regression_factor=self.config.telegram_daily_report_regression
+        )
+        self.telegram.send_daily_report(report)
+        self.history.mark_report_sent(day)
+        if self.cluster:
+            self.cluster.release("__daily_report__", day)
+        self.log(f"📊 Günlük rapor gönderildi ({report['total_runs']} çalıştırma)")
+    
+    def dispatch(self, task, on_done=None, context=None):
+        """
+        Görevi çalıştır - worker süreçleri varsa ilgili sürece, yoksa thread'e.
+        context: pipeline bilgisi (bağımlı görevlerde TaskGraph verir, köklerde burada oluşur)
+        """
+        if context is None:
+            context = self.dag.root_context(task)
+        self.remember_context(task, context)
+        if self.retry_policy.is_probe(task):
+            self._probes.add(task['id'])
+
+        if task.get('inputs'):
+            # Parmak izi (gerekirse hash) scheduler döngüsünü bekletmesin
+            threading.Thread(target=self._dispatch_if_changed, args=(task, on_done, context), daemon=True).start()
+            return
+        self._dispatch(task, on_done, context)
+
+    def remember_context(self, task, context):
+        """Öncül veya dosyalarla tetiklenen çalıştırmanın bilgisi - retry aynı bilgiyle çalışır."""
+        if context and (context.get('upstream') or context.get('trigger_files')):
+            self._retry_contexts[task['id']] = context
+
+    def retry_context(self, task):
+        """Retry için son tetiklenme bilgisi (saatle başlayan görevlerde None - yeni pipeline)."""
+        return self._retry_contexts.get(task['id'])
+
+    def _dispatch_if_changed(self, task, on_done, context):
+        """
+        Girdiler son başarılı çalıştırmadan beri değişmediyse çalıştırmayı atla.
+        Yarı açık devredeki deneme çalıştırması atlanmaz - devreyi ancak gerçek sonuç kapatır.
+        """
+        try:
+            unchanged, fingerprint, files = self.input_cache.unchanged(task)
+        except Exception as e:
+            self.log(f"⚠️ Girdi parmak izi alınamadı [{task['name']}]: {e}")
+            unchanged, fingerprint, files = False, None, None
+
+        if not unchanged or task['id'] in self._probes:
+            if fingerprint:
+                self._input_pending[task['id']] = (fingerprint, files)
+            self._dispatch(task, on_done, context)
+            return
+
+        self.log(f"💾 ÖNBELLEK: {task['name']} - girdiler değişmedi, atlandı")
+        now = self.clock.now().strftime('%Y-%m-%d %H:%M:%S')
+        result = {'success': True, **pipeline_fields(context, task['name'], time.time())}
+        self.history.add_record(TaskHistoryRecord(
+            id=str(uuid4()), task_id=task['id'], task_name=task['name'], start_time=now, end_time=now,
+            duration=0.0, success=True, exit_code=0, cached=True,
+            **{key: value for key, value in result.items() if key in TaskHistoryRecord.PIPELINE_FIELDS}
+        ))
+        try:
+            self.task_finished(task, result)
+        finally:
+            if on_done:
+                on_done()
+
+    def _dispatch(self, task, on_done, context):
+        if self.shards:
+            self.shards.submit(task, on_done, context)
+            return
+
+        def run():
+            result = None
+            try:
+                result = self.execute_task(task, context)
+            finally:
+                self.task_finished(task, result)
+                if on_done:
+                    on_done()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def task_finished(self, task, result):
+        """Çalıştırma bitti - bağımlı görevleri tetikle."""
+        pending_inputs = self._input_pending.pop(task['id'], None)
+        self._probes.discard(task['id'])
+        if not self.running:
+            return
+        if pending_inputs and result and result.get('success'):
+            self.input_cache.record_success(task['id'], *pending_inputs)
+        try:
+            self.dag.on_finished(task, result)
+        except Exception as e:
+            self.log(f"!!! BAĞIMLILIK HATASI [{task.get('name', 'Bilinmeyen')}]: {e}")
+
+    def on_orphan_lease(self, task_id, slot):
+        """Ölen node'un yarım kalan çalıştırmasını devral."""
+        task = self.find_task(task_id)
+        if task is None or not self.running:
+            self.cluster.release(task_id, slot)
+            return
+        self.log(f"♻️ DEVRALINDI: {task['name']} ({slot}) - sahibi yanıt vermiyor")
+        self.dispatch(task, on_done=partial(self.cluster.release, task_id, slot))
+
+    def execute_task(self, task, context=None):
+        """Görevi çalıştır. Sonuç ({'success', pipeline alanları}) döner, çalışmadıysa None."""
+        if not self.running:
+            return
+        
+        task_name = task['name']
+        script = self.scripts.get(task['path'])
+        
+        if script.is_main:
+            self.log(f"!!! ENGEL: Ana program kendisini çalıştıramaz [{task_name}]")
+            return
+        if script.changed:
+            self.log(f"📝 SCRIPT DEĞİŞTİ: {task_name} - yeni sürüm çalıştırılıyor")
+        
+        task['status'] = "running"
+        self.tasks_changed()
+        
+        start_time = time.time()
+        success = False
+        exit_code = -1
+        error_msg = ""
+        output_lines = []
+        result = {'success': False}
+        
+        try:
+            env_id, worker_env = self.task_env(task)
+            cmd, use_shell = script.command, script.use_shell
+            run_env = trigger_env(context)
+            if run_env:
+                # Tek seferlik ortam (tetikleyen dosyalar) - spawn server önbelleğine alınmaz
+                worker_env = {**worker_env, **run_env}
+                env_id = None
+            
+            self.log(f"▶️ BAŞLATILDI: {task_name}")
+            
+            self.emit(TaskEvent.for_task("started", task))
+            
+            # ♨️ Boşta sıcak worker varsa yorumlayıcı açılmaz
+            proc = None
+            if self.python_pool and script.kind == 'python':
+                extra_env = {str(key): str(value) for key, value in (task.get('env') or {}).items()}
+                proc = self.python_pool.run(Path(script.path), {**extra_env, **run_env})
+            if proc is not None:
+                self.log(f"  └─ PID: {proc.pid} (♨️ sıcak worker)")
+            else:
+                proc = self.launch(cmd, use_shell, env_id, worker_env)
+                self.log(f"  └─ PID: {proc.pid}")
+            
+            try:
+                for line in iter(proc.stdout.readline, ''):
+                    if not self.running:
+                        proc.kill()
+                        break
+                    if line.strip():
+                        output_lines.append(line.strip())
+                        self.log(f"  [{task_name}] {line.strip()}")
+                
+                proc.stdout.close()
+                
+                try:
+                    exit_code = proc.wait(timeout=self.config.max_task_timeout)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    error_msg = f"Timeout ({self.config.max_task_timeout}s)"
+                    self.log(f"⚠️ TIMEOUT: {task_name} zorla sonlandırıldı")
+                    task['fail_count'] = task.get('fail_count', 0) + 1
+                    
+                    self.emit(TaskEvent.for_task("timeout", task, duration=time.time() - start_time, error=error_msg))
+                    self.end_failed_cycle(task)  # Timeout tekrar denenmez, döngü başarısız sayılır
+                    return result
+                
+                duration = time.time() - start_time
+                
+                if exit_code == 0:
+                    success = True
+                    result['success'] = True
+                    self.log(f"✅ BAŞARILI: {task_name} ({duration:.1f}s)")
+                    task['success_count'] = task.get('success_count', 0) + 1
+                    task['current_retry'] = 0
+                    
+                    self.emit(TaskEvent.for_task("completed", task, duration=duration, exit_code=exit_code))
+                    if self.retry_policy.on_success(task):
+                        self.log(f"🔌 DEVRE KAPANDI: {task_name} - deneme başarılı, normal zamanlamaya dönüldü")
+                        self.emit(TaskEvent.for_task("circuit_closed", task))
+                else:
+                    error_msg = f"Exit code: {exit_code}"
+                    self.log(f"❌ HATA: {task_name} - {error_msg}")
+                    task['fail_count'] = task.get('fail_count', 0) + 1
+                    task['last_error'] = error_msg
+                    
+                    self.emit(TaskEvent.for_task("failed", task, duration=duration, exit_code=exit_code, error=error_msg))
+                    
+                    self.handle_task_retry(task)
+                
+                # History kaydet (bağımlı görevlerde kritik yol ile)
+                result.update(pipeline_fields(context, task_name, start_time))
+                record = TaskHistoryRecord(
+                    id=str(uuid4()), task_id=task['id'], task_name=task_name,
+                    start_time=datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S'),
+                    end_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    duration=duration, success=success, exit_code=exit_code,
+                    error_message=error_msg, output="\n".join(output_lines[:50]),
+                    **{key: value for key, value in result.items() if key in TaskHistoryRecord.PIPELINE_FIELDS}
+                )
+                self.history.add_record(record)
+            
+            except Exception as e:
+                error_msg = str(e)
+                self.log(f"!!! ÇALIŞTIRMA HATASI [{task_name}]: {error_msg}")
+                task['fail_count'] = task.get('fail_count', 0) + 1
+                task['last_error'] = error_msg
+                self.emit(TaskEvent.for_task("failed", task, duration=time.time() - start_time, error=error_msg))
+                self.handle_task_retry(task)
+        
+        except Exception as e:
+            error_msg = str(e)
+            self.log(f"!!! BAŞLATMA HATASI [{task_name}]: {error_msg}")
+            task['fail_count'] = task.get('fail_count', 0) + 1
+            task['last_error'] = error_msg
+            self.emit(TaskEvent.for_task("failed", task, error=error_msg))
+        
+        finally:
+            task['status'] = "idle"
+            if self.running:
+                self.save_task_fields([(task, self.RUN_RESULT_FIELDS)])
+                self.tasks_changed()
+        
+        return result
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # SÜREÇ BAŞLATMA
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _init_launchers(self):
+        """Görev başlatma yardımcıları - start_launchers() ile açılır."""
+        self.python_pool = None
+        self.spawner = None
+        self._spawner_lock = threading.Lock()
+        self._env_cache = {}  # task_id -> (imza, env_id, env)
+        self._env_versions = count(1)
+        # 📇 Çözümlenmiş yol, tür, komut ve hash - dosya değişmedikçe tekrar hesaplanmaz
+        self.scripts = ScriptRegistry(MAIN_SCRIPT)
+
+    def start_launchers(self):
+        self.python_pool = create_python_pool(self.config, self.worker_env())
+        if self.python_pool:
+            self.python_pool.start()
+        self.spawner = create_spawn_server(self.config)
+
+    def stop_launchers(self):
+        if self.python_pool:
+            self.python_pool.close()
+        if self.spawner:
+            self.spawner.close()
+
+    def task_env(self, task):
+        """
+        Görevin ortam değişkenleri - görev başına bir kez hazırlanır.
+        task['env'] sözlüğü varsa ek değişkenler olarak eklenir. (env_id, env) döner.
+        """
+        extra = task.get('env') or {}
+        signature = tuple(sorted((str(key), str(value)) for key, value in extra.items()))
+        cached = self._env_cache.get(task['id'])
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+
+        env = self.worker_env()
+        env.update(signature)
+        env_id = f"{task['id']}#{next(self._env_versions)}"
+        self._env_cache[task['id']] = (signature, env_id, env)
+        return env_id, env
+
+    def launch(self, cmd, use_shell: bool, env_id, env: dict):
+        """Görev sürecini başlat - spawn server açıksa onun üzerinden, değilse subprocess ile (env_id None: tek seferlik ortam)."""
+        if self.spawner:
+            with self._spawner_lock:
+                if not self.spawner.alive() and self.running:
+                    self.log("⚠️ Spawn server kapanmış - yeniden başlatılıyor")
+                    self.spawner = create_spawn_server(self.config) or self.spawner
+            argv = ["/bin/sh", "-c", cmd] if use_shell else cmd
+            try:
+                return self.spawner.spawn(argv, env_id, env)
+            except OSError as e:
+                self.log(f"⚠️ Spawn server başlatamadı, subprocess kullanılıyor: {e}")
+
+        return subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, shell=use_shell,
+            bufsize=1, encoding="utf-8", errors="replace", env=env,
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        )
+
+    @staticmethod
+    def worker_env():
+        """Görev süreçlerinin ortam değişkenleri."""
+        worker_env = os.environ.copy()
+        worker_env["MGD_WORKER_MODE"] = "true"
+        if "PYTHONPATH" in worker_env:
+            del worker_env["PYTHONPATH"]
+        return worker_env
+
+    def handle_task_retry(self, task):
+        """Retry mekanizması - bekleme her denemede üstel artar (devre yarı açıksa tekrar denenmez)."""
+        max_retries = task.get('max_retries', self.config.retry_max)
+        current_retry = task.get('current_retry', 0)
+        
+        if self.retry_policy.state(task) == CIRCUIT_OPEN:
+            # Devre bu çalıştırma sürerken açıldı - tekrar denenmez, döngü zaten sayıldı
+            task['current_retry'] = 0
+            return
+        
+        if current_retry < max_retries and not self.retry_policy.is_probe(task):
+            task['current_retry'] = current_retry + 1
+            retry_delay = self.retry_policy.retry_delay(task, task['current_retry'])
+            
+            self.log(f"🔄 TEKRAR: {task['name']} - {task['current_retry']}/{max_retries} ({retry_delay}s sonra)")
+            
+            next_retry = self.clock.now() + timedelta(seconds=retry_delay)
+            task['next_run'] = next_retry.strftime("%d.%m.%Y %H:%M")
+            
+            self.emit(TaskEvent.for_task("retry", task, data={
+                'current_retry': task['current_retry'], 'max_retries': max_retries, 'delay': retry_delay
+            }))
+        else:
+            if not self.retry_policy.is_probe(task):
+                self.log(f"⛔ MAX RETRY: {task['name']} - Maksimum deneme sayısına ulaşıldı")
+            self.end_failed_cycle(task)
+
+    def end_failed_cycle(self, task):
+        """Çalıştırma döngüsü başarısız bitti - art arda K döngüde devre açılır."""
+        task['current_retry'] = 0
+        probe = self.retry_policy.is_probe(task)
+        if not self.retry_policy.on_cycle_failed(task, self.clock.now()):
+            return
+        if probe:
+            self.log(f"🔌 DENEME BAŞARISIZ: {task['name']} - devre tekrar açıldı, "
+                     f"{task['circuit_open_until']} saatine kadar çalıştırılmayacak")
+        else:
+            self.log(f"🔌 DEVRE AÇILDI: {task['name']} - art arda {task['failed_cycles']} döngü başarısız, "
+                     f"{task['circuit_open_until']} saatine kadar çalıştırılmayacak")
+        self.emit(TaskEvent.for_task("circuit_open", task, data={
+            'failed_cycles': task['failed_cycles'], 'open_until': task['circuit_open_until']
+        }))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# HEADLESS MOD
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def run_headless() -> int:
+    """GUI olmadan çalış - SIGINT/SIGTERM ile düzgün kapanır (systemd uyumlu)."""
+    config = AppConfig.load()
+
+    instance = None
+    if config.single_instance:
+        instance = SingleInstance()
+        if instance.is_running():
+            print("⚠️ Program zaten çalışıyor!", file=sys.stderr)
+            running = ControlClient(token=config.control_api_token).get("/api/status")
+            if running and 'pid' in running:
+                print(f"   PID {running['pid']} - {running['task_count']} görev, "
+                      f"{running['running_tasks']} çalışıyor", file=sys.stderr)
+            return 1
+
+    stop_requested = threading.Event()
+
+    def request_stop(signum, frame):
+        print(f"🛑 Sinyal alındı ({signum}) - kapatılıyor...", flush=True)
+        stop_requested.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    service = SchedulerService(config)
+    service.log(f"🖥️ {config.app_name} v{config.version} headless modda başlatıldı (PID {os.getpid()})")
+    control_server = start_control_server(service, instance) if instance else None
+    service.send_welcome()
+    service.start_in_background()
+
+    # Sinyal işleyicileri ana thread'de çalışır; wait() periyodik uyanır
+    while not stop_requested.wait(1):
+        pass
+
+    if control_server:
+        control_server.stop()
+    service.shutdown()
+    service.log("✅ Servis durduruldu")
+    return 0
@@ -0,0 +1,146 @@
+# script_registry.py - Görev Script Kayıt Önbelleği
+"""
+MGD Task Scheduler Pro v4.0 - Script Registry
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Görev dosyası hakkında her çalıştırmada tekrar hesaplanan bilgileri tutar:
+çözümlenmiş yol, ana program olup olmadığı, dosya türü, başlatma komutu
+(yorumlayıcı / shell) ve içerik hash'i.
+
+- Her sorguda tek bir stat() yapılır; boyut, mtime, inode veya izinler
+  değişmediyse kayıt aynen kullanılır (ağ paylaşımlarında resolve/exists yok)
+- Değişen dosya yeniden incelenir; hash farklıysa "changed" işaretlenir
+- Bulunamayan dosyalar önbelleğe alınmaz (sonradan oluşturulabilir)
+"""
+
+import os
+import sys
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from utils import FileManager
+
+
+@dataclass
+class ScriptInfo:
+    """Görev dosyasının önbelleklenmiş bilgileri."""
+    path: str                                # Görevde yazılı yol
+    resolved: str                            # Çözümlenmiş mutlak yol
+    exists: bool
+    kind: str = "missing"                    # python / executable / shell / missing
+    command: Union[list, str] = field(default_factory=list)
+    use_shell: bool = True
+    is_main: bool = False                    # Ana programın kendisi mi?
+    hash: str = ""
+    changed: bool = False                    # İçerik son sorgudan beri değişti mi?
+    signature: Tuple = ()                    # (boyut, mtime_ns, inode, cihaz, mod)
+
+    @property
+    def suffix(self) -> str:
+        return Path(self.resolved).suffix.lower()
+
+
+class ScriptRegistry:
+    """Yol -> ScriptInfo önbelleği (stat ile geçersiz kılınır, thread-safe)."""
+
+    def __init__(self, main_script: Optional[Path] = None):
+        self.main_script = str(main_script) if main_script else ""
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ScriptInfo] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, path: Union[str, Path], with_hash: bool = True) -> ScriptInfo:
+        """Dosya bilgisi - stat değişmediyse önbellekten. with_hash=False ise içerik okunmaz."""
+        key = str(path)
+        try:
+            st = os.stat(key)
+            signature = (st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev, st.st_mode)
+        except OSError:
+            signature = None
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if signature is not None and cached is not None and cached.signature == signature:
+                self.stats["hits"] += 1
+                if cached.hash or not with_hash:
+                    return cached
+                previous = None  # Sadece hash eksik - değişiklik sayılmaz
+            else:
+                self.stats["misses"] += 1
+                previous = cached
+
+        if signature is None:
+            with self._lock:
+                self._entries.pop(key, None)
+            return self._inspect(key, None, None, False)
+
+        info = self._inspect(key, signature, previous, with_hash)
+        with self._lock:
+            self._entries[key] = replace(info, changed=False)
+        return info
+
+    def resolve(self, path: Union[str, Path]) -> str:
+        """Çözümlenmiş yol (duplicate kontrolü vb. için)."""
+        return self.get(path, with_hash=False).resolved
+
+    def invalidate(self, path: Union[str, Path, None] = None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(path), None)
+
+    def _inspect(self, key: str, signature: Optional[Tuple], previous: Optional[ScriptInfo],
+                 with_hash: bool) -> ScriptInfo:
+        resolved = Path(key).resolve()
+        info = ScriptInfo(
+            path=key, resolved=str(resolved), exists=signature is not None,
+            is_main=bool(self.main_script) and str(resolved) == self.main_script,
+            signature=signature or (),
+        )
+        # Komut görevde yazılı yolla kurulur (sembolik bağlantılarda script klasörü korunur)
+        info.kind, info.command, info.use_shell = self.command_for(Path(key), info.exists)
+        if info.exists and with_hash:
+            try:
+                info.hash = FileManager.get_file_hash(resolved)
+            except OSError:
+                info.hash = ""
+            info.changed = bool(previous and previous.hash and previous.hash != info.hash)
+        return info
+
+    @staticmethod
+    def command_for(path: Path, exists: bool = True):
+        """(tür, komut, shell) - doğrudan çalıştırılabilen dosyalar shell olmadan başlatılır."""
+        suffix = path.suffix.lower()
+        if suffix == '.py':
+            return "python", [sys.executable, str(path)], False
+        if sys.platform == 'win32':
+            if suffix in ('.exe', '.com'):
+                return "executable", [str(path)], False
+        elif exists and path.is_file() and os.access(path, os.X_OK) and ScriptRegistry._directly_executable(path):
+            return "executable", [str(path)], False
+        return ("shell" if exists else "missing"), str(path), True
+
+    # Çekirdeğin doğrudan çalıştırabildiği dosya başlıkları: #!, ELF, Mach-O
+    EXEC_MAGICS = (b"#!", b"\x7fELF", b"\xfe\xed\xfa\xce", b"\xfe\xed\xfa\xcf",
+                   b"\xce\xfa\xed\xfe", b"\xcf\xfa\xed\xfe", b"\xca\xfe\xba\xbe")
+
+    @staticmethod
+    def _directly_executable(path: Path) -> bool:
+        """
+        +x olup #! satırı olmayan shell script'leri exec edilemez (ENOEXEC) -
+        bunlar eskisi gibi shell üzerinden çalıştırılır.
+        """
+        try:
+            with open(path, 'rb') as f:
+                head = f.read(4)
+        except OSError:
+            return False
+        return head.startswith(ScriptRegistry.EXEC_MAGICS)
+
+    def status(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), **self.stats}
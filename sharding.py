@@ -0,0 +1,248 @@
+# sharding.py - Çok Süreçli Görev Çalıştırma
+"""
+MGD Task Scheduler Pro v4.0 - Process Sharding
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+worker_processes > 1 olduğunda görevler id hash'ine göre N alt sürece dağıtılır.
+Her alt süreç kendi GIL'i ile görev çıktısını okur, süreyi ölçer, retry hesaplar.
+Ana süreç (koordinatör) zamanlama, kayıt, history ve bildirim kanallarının tek
+sahibidir: alt süreçler bu işlemleri olay kuyruğu üzerinden koordinatöre iletir.
+"""
+
+import queue
+import hashlib
+import threading
+import multiprocessing
+from itertools import count
+from typing import Dict, Any, Optional, Callable
+
+from scheduler_service import SchedulerService
+from event_bus import TaskEvent
+
+
+def shard_for(task_id: str, shard_count: int) -> int:
+    """Görevin alt süreci - süreç yeniden başlasa da aynı kalır."""
+    return int(hashlib.md5(task_id.encode()).hexdigest(), 16) % shard_count
+
+
+class _EventProxy:
+    """Alt süreçte history yerine geçer: metod çağrılarını koordinatöre gönderir."""
+
+    def __init__(self, events, target: str):
+        self._events = events
+        self._target = target
+
+    def __getattr__(self, method):
+        def call(*args):
+            self._events.put(('call', self._target, method, args))
+        return call
+
+
+class ShardExecutor(SchedulerService):
+    """
+    Alt süreçte çalışan executor - SchedulerService.execute_task'ı aynen kullanır.
+    Repo/history/bildirim kanalları yerine olay kuyruğu vardır.
+    """
+
+    def __init__(self, config, shard_index: int, events):
+        # SchedulerService.__init__ bilerek çağrılmaz (depo ve dosya açılmaz)
+        self._init_executor_state(config, log_callback=lambda message: events.put(('log', message)))
+        self.shard_index = shard_index
+        self.event_queue = events
+        self.history = _EventProxy(events, 'history')
+        self.telegram = None
+        self.start_launchers()
+
+    def log(self, message):
+        self.log_callback(message)
+
+    def emit(self, event: TaskEvent):
+        self.event_queue.put(('event', event))
+
+    def save_task_fields(self, updates):
+        pass  # Sonuç alanları 'done' olayı ile koordinatöre gider
+
+    def tasks_changed(self):
+        pass
+
+    def run(self, run_id: int, task: Dict[str, Any], context: Optional[Dict[str, Any]] = None):
+        # Kopya, koordinatör next_run'ı ilerletmeden önce alındı: sadece
+        # bu çalıştırmanın değiştirdiği alanlar geri gönderilir
+        before = {field: task.get(field) for field in self.RUN_RESULT_FIELDS}
+        result = None
+        try:
+            result = self.execute_task(task, context)
+        except Exception as e:
+            task['last_error'] = str(e)
+        finally:
+            fields = {field: task.get(field) for field in self.RUN_RESULT_FIELDS
+                      if task.get(field) != before[field]}
+            self.event_queue.put(('done', run_id, task['id'], fields, result))
+
+
+def shard_worker_main(config, shard_index: int, inbox, events):
+    """Alt süreç giriş noktası."""
+    executor = ShardExecutor(config, shard_index, events)
+    workers = []
+
+    while True:
+        message = inbox.get()
+        if message[0] == 'stop':
+            break
+        _, run_id, task, context = message
+        worker = threading.Thread(target=executor.run, args=(run_id, task, context), daemon=True)
+        worker.start()
+        workers = [w for w in workers if w.is_alive()] + [worker]
+
+    # Çalışan görevler çıktı okurken running=False görüp süreci sonlandırır
+    executor.running = False
+    for worker in workers:
+        worker.join(timeout=5)
+    executor.stop_launchers()
+
+
+class ShardPool:
+    """
+    Koordinatör tarafı: alt süreçleri başlatır, görevleri dağıtır,
+    olayları (log, history, görev olayları, sonuç) ana süreçte uygular.
+    """
+
+    def __init__(self, service: SchedulerService, shard_count: int):
+        self.service = service
+        self.shard_count = shard_count
+        # spawn: Windows ile aynı davranış, alt süreç tk/thread durumu devralmaz
+        self._context = multiprocessing.get_context("spawn")
+        self._events = self._context.Queue()
+        self._inboxes = []
+        self._processes = []
+        self._in_flight: Dict[int, tuple] = {}  # run_id -> (task, shard, on_done)
+        self._run_ids = count(1)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+        self.dispatched = [0] * shard_count
+
+    def start(self):
+        for index in range(self.shard_count):
+            self._inboxes.append(self._context.Queue())
+            self._processes.append(None)
+            self._spawn(index)
+
+        self._listener = threading.Thread(target=self._event_loop, name="shard-events", daemon=True)
+        self._listener.start()
+        print(f"🧩 {self.shard_count} worker süreci başlatıldı")
+
+    def _spawn(self, index: int):
+        process = self._context.Process(
+            target=shard_worker_main,
+            args=(self.service.config, index, self._inboxes[index], self._events),
+            name=f"mgd-shard-{index}", daemon=True
+        )
+        process.start()
+        self._processes[index] = process
+
+    def submit(self, task: Dict[str, Any], on_done: Optional[Callable] = None,
+               context: Optional[Dict[str, Any]] = None):
+        """Görevi kendi alt sürecine gönder."""
+        shard = shard_for(task['id'], self.shard_count)
+        run_id = next(self._run_ids)
+        with self._lock:
+            self._in_flight[run_id] = (task, shard, on_done)
+            self.dispatched[shard] += 1
+        task['status'] = "running"
+        self.service.tasks_changed()
+        self._inboxes[shard].put(('run', run_id, dict(task), context))
+
+    def stop(self, timeout: float = 10.0):
+        self._stop_event.set()
+        for inbox in self._inboxes:
+            inbox.put(('stop',))
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._listener:
+            self._listener.join(timeout=2)
+
+    def status(self) -> dict:
+        with self._lock:
+            running = [0] * self.shard_count
+            for _, shard, _ in self._in_flight.values():
+                running[shard] += 1
+        return {
+            'processes': self.shard_count,
+            'alive': [bool(p and p.is_alive()) for p in self._processes],
+            'dispatched': list(self.dispatched),
+            'running': running,
+        }
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # OLAYLAR (ana süreç)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _event_loop(self):
+        while True:
+            try:
+                event = self._events.get(timeout=1)
+            except queue.Empty:
+                if not self._stop_event.is_set():
+                    self._check_processes()
+                elif not any(process.is_alive() for process in self._processes):
+                    break  # Alt süreçler kapandı ve kuyruk boşaldı
+                continue
+
+            try:
+                self._apply(event)
+            except Exception as e:
+                print(f"⚠️ Shard olayı işlenemedi: {e}")
+
+    def _apply(self, event):
+        service = self.service
+        kind = event[0]
+
+        if kind == 'log':
+            service.log(event[1])
+
+        elif kind == 'call':
+            _, target, method, args = event
+            getattr(service.history, method)(*args)
+
+        elif kind == 'event':
+            service.emit(event[1])
+
+        elif kind == 'done':
+            _, run_id, task_id, fields, result = event
+            self._finish(run_id, fields, result)
+
+    def _finish(self, run_id: int, fields: Dict[str, Any], result: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            entry = self._in_flight.pop(run_id, None)
+        if entry is None:
+            return
+
+        task, _, on_done = entry
+        task.update(fields)
+        task['status'] = "idle"
+        if self.service.running:
+            self.service.save_task_fields([(task, self.service.RUN_RESULT_FIELDS)])
+            self.service.tasks_changed()
+        self.service.task_finished(task, result)
+        if on_done:
+            on_done()
+
+    def _check_processes(self):
+        """Çöken alt süreci yeniden başlat, üzerindeki çalıştırmaları hatalı kapat."""
+        for index, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+
+            self.service.log(f"!!! WORKER SÜRECİ ÇÖKTÜ: shard {index} (exit {process.exitcode}) - yeniden başlatılıyor")
+            with self._lock:
+                lost = [(run_id, task) for run_id, (task, shard, _) in self._in_flight.items() if shard == index]
+            for run_id, task in lost:
+                self._finish(run_id, {
+                    'fail_count': task.get('fail_count', 0) + 1,
+                    'last_error': f"Worker süreci çöktü (exit {process.exitcode})"
+                })
+            self._spawn(index)
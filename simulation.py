@@ -0,0 +1,491 @@
+# simulation.py - Zamanlama Simülasyonu
+"""
+MGD Task Scheduler Pro v4.0 - Schedule Simulation
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Zamanlayıcı çekirdeğini (SchedulerService.scheduler_tick) sanal saatle çalıştırır.
+Süreç açılmaz, diske yazılmaz; saat bir sonraki olaya (zamanı gelen görev veya
+biten çalıştırma) atlar; bekleme süresi yoktur, maliyet çalıştırma sayısıyla orantılıdır
+(~35 µs/çalıştırma: yüzlerce görevin bir yılı saniyeler, 2000 görevin bir yılı ~1 dakika):
+
+- Kapasite planlama: en yoğun saatler, en fazla eşzamanlı çalıştırma
+- calculate_next_run davranışı: zamanlamanın kayması (drift), bitiş (end) ile sona erme
+- Tekrar denemeler ve devre kesici (tohumlu rastgele hata oranıyla, tekrarlanabilir)
+
+Kullanım:
+    python simulation.py                              # tasks.json, şimdiden itibaren 365 gün
+    python simulation.py --days 30 --fail-rate 0.05   # %5 hata ile 30 gün
+    python simulation.py --synthetic 2000 --timeline timeline.jsonl --json ozet.json
+    python simulation.py --start "01.01.2027 00:00" --history-durations
+
+Bilinen sınırlar: jitter dahil edilir, yüke göre erteleme (loadavg) ve dosya
+tetikleyicileri simüle edilmez; bağımlı görevler öncülün bittiği anda başlar.
+"""
+
+import sys
+import json
+import heapq
+import random
+import argparse
+import tempfile
+import time
+from collections import Counter
+from dataclasses import replace
+from datetime import datetime, timedelta
+from itertools import count
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import AppConfig, TASK_CATEGORIES
+from clock import SimulatedClock
+from event_bus import TaskEvent
+from retry_policy import RetryPolicy, CIRCUIT_OPEN
+from scheduler_service import SchedulerService
+from utils import DateTimeHelper
+
+TIME_FORMAT = "%d.%m.%Y %H:%M"
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# SAHTE ÇALIŞTIRICI
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class SimulatedExecutor:
+    """
+    Süreç açmadan çalıştırma sonucu üretir: (başarılı mı, süre saniye).
+
+    Görev kaydındaki "sim_fail_rate" / "sim_duration" alanları varsayılanları ezer;
+    durations ile görev başına ortalama süre (ör. history'den) verilebilir.
+    """
+
+    def __init__(self, fail_rate: float = 0.0, duration: float = 60.0, seed: int = 0,
+                 durations: Optional[Dict[str, float]] = None):
+        self.fail_rate = fail_rate
+        self.duration = duration
+        self.durations = durations or {}
+        self.random = random.Random(seed)
+
+    def run(self, task: Dict[str, Any], now: datetime) -> Tuple[bool, float]:
+        rate = task.get('sim_fail_rate', self.fail_rate)
+        success = rate <= 0 or self.random.random() >= rate
+        duration = task.get('sim_duration', self.durations.get(task['id'], self.duration))
+        return success, max(0.0, float(duration))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ZAMAN ÇİZELGESİ
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class Timeline:
+    """Çalıştırmaları ve olayları toplar; istenirse JSON Lines olarak yazar."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.file = open(path, 'w', encoding='utf-8') if path else None
+        self.runs = 0
+        self.failed = 0
+        self.events = Counter()
+        self.starts_per_minute = Counter()  # dakika (datetime) -> başlatma
+        self.busy_seconds = Counter()  # task_id -> toplam çalışma süresi
+        self.delays: List[float] = []  # planlanan → başlama (saniye)
+        self.overlaps = 0  # Önceki çalıştırma bitmeden başlatılanlar
+        self.peak = (0, None)  # (eşzamanlı çalıştırma, zaman)
+        self._running: List[datetime] = []  # Bitiş zamanları (heap)
+        self._first: Dict[str, Tuple[datetime, int]] = {}  # task_id -> (ilk planlanan, normal çalıştırma sayısı)
+        self._last: Dict[str, datetime] = {}
+
+    def _write(self, row: Dict[str, Any]):
+        if self.file:
+            self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def run(self, task: Dict[str, Any], scheduled: datetime, now: datetime, success: bool, duration: float):
+        attempt = task.get('current_retry', 0)
+        self.runs += 1
+        self.failed += not success
+        self.starts_per_minute[now.replace(second=0, microsecond=0)] += 1
+        self.busy_seconds[task['id']] += duration
+        self.delays.append((now - scheduled).total_seconds())
+        if task.get('status') == 'running':
+            self.overlaps += 1
+
+        # Eşzamanlılık: bu andan önce bitenler çıkarılır
+        while self._running and self._running[0] <= now:
+            heapq.heappop(self._running)
+        heapq.heappush(self._running, now + timedelta(seconds=duration))
+        if len(self._running) > self.peak[0]:
+            self.peak = (len(self._running), now)
+
+        # Kayma: sadece normal (retry olmayan) çalıştırmaların planlanan zamanları
+        if not attempt:
+            first, runs = self._first.get(task['id'], (scheduled, 0))
+            self._first[task['id']] = (first, runs + 1)
+            self._last[task['id']] = scheduled
+
+        if self.file:
+            self._write({
+                "time": now.strftime("%Y-%m-%d %H:%M:%S"), "event": "run", "task_id": task['id'],
+                "task": task['name'], "scheduled": scheduled.strftime(TIME_FORMAT), "attempt": attempt,
+                "success": success, "duration": round(duration, 3),
+            })
+
+    def event(self, kind: str, task: Dict[str, Any], now: datetime, data: Optional[Dict[str, Any]] = None):
+        self.events[kind] += 1
+        self._write({"time": now.strftime("%Y-%m-%d %H:%M:%S"), "event": kind, "task_id": task['id'],
+                     "task": task['name'], **(data or {})})
+
+    def busiest(self, limit: int = 5) -> Dict[str, Any]:
+        """En yoğun dakika ve saatler (başlatma sayısı)."""
+        per_hour = Counter()
+        for minute, starts in self.starts_per_minute.items():
+            per_hour[minute.replace(minute=0)] += starts
+        minute, starts = max(self.starts_per_minute.items(), key=lambda item: item[1], default=(None, 0))
+        return {
+            "busiest_minute": {"time": minute.strftime("%Y-%m-%d %H:%M") if minute else None, "starts": starts},
+            "busiest_hours": [{"hour": hour.strftime("%Y-%m-%d %H:00"), "starts": count}
+                              for hour, count in per_hour.most_common(limit)],
+        }
+
+    def drift(self, tasks: List[Dict[str, Any]], limit: int = 10) -> Dict[str, Any]:
+        """
+        Planlanan zamanların nominal aralıktan sapması: son planlanan zaman ile
+        ilk zaman + (n-1) × aralık arasındaki fark (ör. "Günde 7 Kez" dakikaya yuvarlanır,
+        retry sonrası zamanlama retry saatinden devam eder).
+        """
+        drifted = []
+        for task in tasks:
+            if task['id'] not in self._first:
+                continue
+            first, runs = self._first[task['id']]
+            try:
+                interval = DateTimeHelper.calculate_next_run(first, task['freq_type'], task['freq_val']) - first
+            except (KeyError, TypeError):
+                continue
+            seconds = round((self._last[task['id']] - (first + interval * (runs - 1))).total_seconds(), 1)
+            if seconds:
+                drifted.append({"task_id": task['id'], "task": task['name'], "freq_type": task['freq_type'],
+                                "freq_val": task['freq_val'], "runs": runs, "drift_s": seconds})
+        drifted.sort(key=lambda item: -abs(item["drift_s"]))
+        return {"tasks": len(drifted), "worst": drifted[:limit]}
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# SİMÜLASYON SERVİSİ
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class SimulationService(SchedulerService):
+    """
+    Sanal saatle çalışan servis. Zamanlama kararları (scheduler_tick, retry,
+    devre kesici, jitter, bağımlılıklar) gerçek servisle aynı kodu kullanır;
+    sadece çalıştırma, kayıt ve bildirim katmanı değiştirilmiştir.
+    """
+
+    def __init__(self, config: AppConfig, clock: SimulatedClock, executor: SimulatedExecutor,
+                 timeline: Timeline, seed: int = 0, verbose: bool = False):
+        self.executor = executor
+        self.timeline = timeline
+        self.verbose = verbose
+        self._queue: List[Tuple[datetime, int, Dict[str, Any]]] = []  # (uyanma zamanı, sıra, görev)
+        self._wake: Dict[str, datetime] = {}  # task_id -> kuyruktaki geçerli zaman
+        self._done: List[Tuple] = []  # (bitiş, sıra, görev, başarılı, on_done)
+        self._seq = count()
+        self._order: Dict[str, int] = {}
+        self.ticks = 0
+        super().__init__(config, clock=clock)
+        self.retry_policy = RetryPolicy(config, rng=random.Random(seed))
+
+    # ─── Disk / bildirim yok ────────────────────────────────────────────────────
+
+    def log(self, message):
+        if self.verbose:
+            print(f"[{self.clock.now().strftime('%d.%m.%Y %H:%M:%S')}] {message}")
+
+    def emit(self, event):
+        task = self.find_task(event.task_id) or {'id': event.task_id, 'name': event.task_name}
+        self.timeline.event(event.kind, task, self.clock.now(), event.data)
+
+    def save_tasks(self):
+        pass
+
+    def save_task_fields(self, updates):
+        pass
+
+    def find_task(self, task_id: str):
+        index = self._order.get(task_id)
+        return self.tasks[index] if index is not None else None
+
+    # ─── Görevler ve kuyruk ─────────────────────────────────────────────────────
+
+    def load(self, tasks: List[Dict[str, Any]]):
+        """Görevleri deponun normal yükleme yolundan geçir (varsayılan alanlar) ve kuyruğa al."""
+        self.repo.save_tasks(tasks)
+        self.tasks = self.repo.load_tasks()
+        self.tasks_loaded = True
+        self._order = {task['id']: index for index, task in enumerate(self.tasks)}
+        self.dag.freeze()
+        for task in self.tasks:
+            self._schedule(task)
+
+    def wake_time(self, task: Dict[str, Any]) -> Optional[datetime]:
+        """Görevin zamanlayıcıda tekrar ele alınacağı an (yoksa None)."""
+        if task.get('status') == 'expired' or task.get('paused', False):
+            return None
+        try:
+            next_run = DateTimeHelper.parse_schedule_time(task['next_run'])
+            expiry = DateTimeHelper.parse_schedule_time(task['end']) + timedelta(seconds=1)
+        except (KeyError, ValueError):
+            return None
+        if self.dag.is_dependent(task) and not task.get('current_retry', 0):
+            return expiry  # Öncülleri tetikler; zamanlayıcı sadece retry'ları ve süre dolumunu işler
+        wake = self.spreader.due_time(task, next_run)
+        if self.retry_policy.state(task) == CIRCUIT_OPEN:
+            wake = max(wake, self.retry_policy.open_until(task) or wake)
+        return min(wake, expiry)
+
+    def _schedule(self, task: Dict[str, Any]):
+        wake = self.wake_time(task)
+        if wake is None:
+            self._wake.pop(task['id'], None)
+        elif self._wake.get(task['id']) != wake:
+            self._wake[task['id']] = wake
+            heapq.heappush(self._queue, (wake, next(self._seq), task))
+
+    def next_wake(self) -> Optional[datetime]:
+        while self._queue:
+            wake, _, task = self._queue[0]
+            if self._wake.get(task['id']) == wake:
+                return wake
+            heapq.heappop(self._queue)  # Eski kayıt
+        return None
+
+    def due_tasks(self, now: datetime):
+        due = {}
+        while self._queue and self._queue[0][0] <= now:
+            wake, _, task = heapq.heappop(self._queue)
+            if self._wake.get(task['id']) == wake:
+                del self._wake[task['id']]
+                due[task['id']] = task
+        self._ticked = list(due.values())
+        return sorted(self._ticked, key=lambda task: self._order[task['id']])
+
+    def scheduler_tick(self, now: datetime):
+        self.ticks += 1
+        self._ticked = []
+        super().scheduler_tick(now)
+        for task in self._ticked:
+            self._schedule(task)
+
+    # ─── Çalıştırma ─────────────────────────────────────────────────────────────
+
+    def dispatch(self, task, on_done=None, context=None):
+        """Çalıştırmayı başlat - sonucu bitiş anında (complete) işlenir."""
+        now = self.clock.now()
+        self.remember_context(task, context)
+        success, duration = self.executor.run(task, now)
+        try:
+            scheduled = DateTimeHelper.parse_schedule_time(task['next_run'])
+        except (KeyError, ValueError):
+            scheduled = now
+        if context and context.get('upstream') and not task.get('current_retry', 0):
+            scheduled = now  # Bağımlı görev: öncül bitince başlar
+        self.timeline.run(task, min(scheduled, now), now, success, duration)
+        task['status'] = "running"
+        heapq.heappush(self._done, (now + timedelta(seconds=duration), next(self._seq), task, success, on_done))
+
+    def next_completion(self) -> Optional[datetime]:
+        return self._done[0][0] if self._done else None
+
+    def complete_next(self):
+        """En erken biten çalıştırmayı execute_task'ın sonuç adımlarıyla işle."""
+        finished, _, task, success, on_done = heapq.heappop(self._done)
+        self.clock.set(finished)
+        if success:
+            task['success_count'] = task.get('success_count', 0) + 1
+            task['current_retry'] = 0
+            if self.retry_policy.on_success(task):
+                self.emit(TaskEvent.for_task("circuit_closed", task))
+        else:
+            task['fail_count'] = task.get('fail_count', 0) + 1
+            task['last_error'] = "Simülasyon: başarısız"
+            self.handle_task_retry(task)
+        if task.get('status') == 'running':
+            task['status'] = "idle"
+        self.task_finished(task, {'success': success})
+        if on_done:
+            on_done()
+        self._schedule(task)
+
+    # ─── Ana döngü ──────────────────────────────────────────────────────────────
+
+    def run_until(self, end: datetime):
+        """
+        Saati olaydan olaya atlatarak end'e kadar oynat. Turlar gerçek döngüdeki gibi
+        başlangıçtan itibaren scheduler_interval aralıklarına denk gelir.
+        """
+        start = self.clock.now()
+        interval = timedelta(seconds=max(1, self.config.scheduler_interval))
+        last_tick = None
+        while True:
+            wake = self.next_wake()
+            tick = None
+            if wake is not None:
+                steps = max(0, -(-(wake - start) // interval))  # Yukarı yuvarla
+                tick = start + interval * steps
+                if last_tick is not None and tick <= last_tick:
+                    tick = last_tick + interval
+            finished = self.next_completion()
+
+            if finished is not None and finished <= end and (tick is None or finished <= tick):
+                self.complete_next()
+            elif tick is not None and tick <= end:
+                self.clock.set(tick)
+                self.scheduler_tick(tick)
+                last_tick = tick
+            else:
+                break
+        self.clock.set(max(end, self.clock.now()))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ÇALIŞTIRMA
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def synthetic_tasks(count: int, start: datetime, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Gerçekçi dağılımlı sentetik görevler: çoğunluk günlük, kalanı saatlik,
+    günde X kez ve haftalık; başlangıçlar mesai saatlerinin başında yoğunlaşır.
+    """
+    rng = random.Random(seed)
+    kinds = [("Günlük", (1,)), ("Günlük", (1,)), ("Saatlik", (1, 2, 3, 6)),
+             ("Günde X Kez", (2, 3, 4, 6, 7)), ("Haftalık", (1,))]
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    tasks = []
+    for i in range(count):
+        freq_type, values = kinds[i % len(kinds)]
+        first = day + timedelta(hours=rng.choice((0, 6, 7, 8, 8, 8, 9, 12, 17, 22)),
+                                minutes=rng.choice((0, 0, 0, 15, 30, 45)))
+        while first < start:
+            first += timedelta(days=1)
+        tasks.append({
+            "id": f"sim-{i:06d}", "name": f"Görev {i:06d}", "path": f"job_{i:06d}.py",
+            "start": first.strftime(TIME_FORMAT),
+            "end": (first + timedelta(days=rng.choice((30, 180, 400, 400, 400)))).strftime(TIME_FORMAT),
+            "freq_type": freq_type, "freq_val": rng.choice(values), "next_run": first.strftime(TIME_FORMAT),
+            "category": TASK_CATEGORIES[i % len(TASK_CATEGORIES)], "priority": 1 + i % 4,
+            "max_retries": 2, "retry_delay": 60,
+        })
+    return tasks
+
+
+def history_durations(config: AppConfig, days: int = 30) -> Dict[str, float]:
+    """Görev başına ortalama süre (history'den)."""
+    from task_history import TaskHistoryManager
+    stats = TaskHistoryManager(config.history_dir).get_statistics(days)['task_stats']
+    return {task_id: item['total_duration'] / item['total'] for task_id, item in stats.items() if item['total']}
+
+
+def simulate(config: AppConfig, tasks: List[Dict[str, Any]], start: datetime, days: float,
+             executor: Optional[SimulatedExecutor] = None, timeline_path: Optional[Path] = None,
+             seed: int = 0, verbose: bool = False) -> Dict[str, Any]:
+    """tasks'ı start'tan itibaren days gün boyunca oynat; özet sözlüğü döner."""
+    executor = executor or SimulatedExecutor(seed=seed)
+    end = start + timedelta(days=days)
+    timeline = Timeline(timeline_path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        sim_config = replace(
+            config, tasks_db=str(tmp_path / "tasks.json"), tasks_storage="json", auto_backup=False,
+            backup_on_exit=False, logs_dir=str(tmp_path / "logs"), backups_dir=str(tmp_path / "backups"),
+            templates_dir=str(tmp_path / "templates"), history_dir=str(tmp_path / "history"),
+            input_cache_file=str(tmp_path / "input_cache.json"), telegram_enabled=False,
+            desktop_notifications_enabled=False, webhook_url="", event_log_enabled=False, email_enabled=False,
+            cluster_enabled=False, worker_processes=0, python_warm_workers=0, spawn_server_enabled=False,
+            load_defer_threshold=0.0,
+        )
+        service = SimulationService(sim_config, SimulatedClock(start), executor, timeline, seed, verbose)
+        started = time.perf_counter()
+        try:
+            service.load(tasks)
+            service.run_until(end)
+        finally:
+            timeline.close()
+            service.repo.storage.close()
+        elapsed = time.perf_counter() - started
+
+    delays = sorted(timeline.delays)
+    return {
+        "start": start.strftime(TIME_FORMAT), "end": end.strftime(TIME_FORMAT), "days": days,
+        "tasks": len(tasks), "ticks": service.ticks, "runs": timeline.runs, "failed_runs": timeline.failed,
+        "events": dict(timeline.events),
+        "expired_tasks": sum(1 for task in service.tasks if task.get('status') == 'expired'),
+        "open_circuits": sum(1 for task in service.tasks if service.retry_policy.state(task) != "closed"),
+        "overlapping_runs": timeline.overlaps,
+        "peak_concurrency": timeline.peak[0],
+        "peak_at": timeline.peak[1].strftime("%Y-%m-%d %H:%M:%S") if timeline.peak[1] else None,
+        **timeline.busiest(),
+        "busiest_tasks": [{"task_id": task_id, "busy_hours": round(seconds / 3600, 2)}
+                          for task_id, seconds in timeline.busy_seconds.most_common(5)],
+        "start_delay_s": {
+            "p50": delays[len(delays) // 2] if delays else None,
+            "p95": delays[min(len(delays) - 1, int(len(delays) * 0.95))] if delays else None,
+            "max": delays[-1] if delays else None,
+        },
+        "drift": timeline.drift(service.tasks),
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MGD Task Scheduler - zamanlama simülasyonu")
+    parser.add_argument("--days", type=float, default=365)
+    parser.add_argument("--start", help=f"Başlangıç ({TIME_FORMAT.replace('%', '')}), varsayılan şimdi")
+    parser.add_argument("--synthetic", type=int, default=0, help="tasks.json yerine N sentetik görev")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Çalıştırma başına hata olasılığı (0-1)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Varsayılan çalıştırma süresi (saniye)")
+    parser.add_argument("--history-durations", action="store_true", help="Süreleri son 30 günün history'sinden al")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeline", help="Çalıştırma zaman çizelgesini bu JSON Lines dosyasına yaz")
+    parser.add_argument("--json", dest="json_path", help="Özeti bu JSON dosyasına yaz")
+    parser.add_argument("--verbose", action="store_true", help="Zamanlayıcı loglarını sanal saatle yazdır")
+    args = parser.parse_args(argv)
+
+    config = AppConfig.load()
+    start = datetime.strptime(args.start, TIME_FORMAT) if args.start else datetime.now().replace(second=0, microsecond=0)
+    if args.synthetic:
+        tasks = synthetic_tasks(args.synthetic, start, args.seed)
+    else:
+        from task_repository import TaskRepository
+        tasks = TaskRepository(config).load_tasks()
+    durations = history_durations(config) if args.history_durations else None
+
+    print("=" * 70)
+    print("MGD TASK SCHEDULER PRO v4.0 - SİMÜLASYON")
+    print("=" * 70)
+    executor = SimulatedExecutor(args.fail_rate, args.duration, args.seed, durations)
+    summary = simulate(config, tasks, start, args.days, executor,
+                       Path(args.timeline) if args.timeline else None, args.seed, args.verbose)
+
+    print(f"{summary['tasks']} görev | {summary['start']} → {summary['end']} | {summary['elapsed_s']} s")
+    print(f"  Çalıştırma: {summary['runs']} ({summary['failed_runs']} başarısız) | tur: {summary['ticks']}")
+    print(f"  Olaylar: {summary['events']}")
+    print(f"  Süresi dolan: {summary['expired_tasks']} | açık devre: {summary['open_circuits']} | "
+          f"üst üste binen: {summary['overlapping_runs']}")
+    print(f"  En fazla eşzamanlı: {summary['peak_concurrency']} ({summary['peak_at']}) | "
+          f"en yoğun dakika: {summary['busiest_minute']['time']} ({summary['busiest_minute']['starts']} başlatma)")
+    print(f"  Başlama gecikmesi (s): {summary['start_delay_s']}")
+    print(f"  Kayan görev: {summary['drift']['tasks']}")
+    for item in summary['drift']['worst'][:5]:
+        print(f"    - {item['task']} ({item['freq_type']} {item['freq_val']}): {item['drift_s']:+.0f} s / {item['runs']} çalıştırma")
+
+    if args.timeline:
+        print(f"📄 Zaman çizelgesi: {args.timeline}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"📄 Özet yazıldı: {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
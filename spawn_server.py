@@ -0,0 +1,255 @@
+# spawn_server.py - Hızlı Süreç Başlatıcı (Fork-Server)
+"""
+MGD Task Scheduler Pro v4.0 - Spawn Server
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Görev süreçlerini büyük ana süreç (GUI, thread'ler, açık dosyalar) yerine küçük
+bir yardımcı süreç başlatır. Yardımcı, Unix soketi üzerinden gelen istekleri
+os.posix_spawn ile çalıştırır; görev çıktısının yazılacağı pipe ucu istekle
+birlikte soket üzerinden (socket.send_fds) gönderilir.
+
+- Ortam değişkenleri görev başına bir kez gönderilir, yardımcıda önbelleklenir
+- Çıkış kodları yardımcı tarafından toplanıp ana sürece bildirilir
+- Sadece Linux; diğer platformlarda subprocess.Popen kullanılır
+
+Ölçüm: python benchmark.py --spawn
+"""
+
+import os
+import sys
+import json
+import signal
+import socket
+import threading
+import subprocess
+from itertools import count
+from typing import Dict, List, Optional
+
+SPAWN_SERVER_AVAILABLE = (
+    sys.platform.startswith("linux") and hasattr(os, "posix_spawnp")
+    and hasattr(socket, "send_fds") and hasattr(socket, "SOCK_SEQPACKET")
+)
+
+MAX_MESSAGE = 1 << 20
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# YARDIMCI SÜREÇ
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def serve(fd: int) -> int:
+    """Yardımcı süreç döngüsü - ana süreç soketi kapatınca biter."""
+    os.set_inheritable(fd, False)
+    sock = socket.socket(fileno=fd)
+    envs: Dict[str, Dict[str, str]] = {}
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            try:
+                sock.send(json.dumps(message).encode())
+            except OSError:
+                pass
+
+    def reap(request_id, pid):
+        _, status = os.waitpid(pid, 0)
+        send({'id': request_id, 'exit': os.waitstatus_to_exitcode(status)})
+
+    while True:
+        try:
+            data, fds, _, _ = socket.recv_fds(sock, MAX_MESSAGE, 1)
+        except OSError:
+            break
+        if not data:
+            break
+
+        request = json.loads(data)
+        if 'env' in request and request['env_id'] is not None:
+            envs[request['env_id']] = request['env']
+        out = fds[0] if fds else None
+        try:
+            if out is None:
+                raise OSError("Çıktı pipe'ı alınamadı")
+            os.set_inheritable(out, False)  # Görevde sadece 1 ve 2 olarak açık kalır
+            env = request['env'] if request['env_id'] is None else envs[request['env_id']]
+            pid = os.posix_spawnp(
+                request['argv'][0], request['argv'], env,
+                file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                    (os.POSIX_SPAWN_DUP2, out, 1),
+                    (os.POSIX_SPAWN_DUP2, out, 2),
+                ],
+                # Python'un yok saydığı sinyaller görevde varsayılana döner (Popen ile aynı)
+                setsigdef=(signal.SIGPIPE, signal.SIGXFSZ),
+            )
+        except (OSError, KeyError) as e:
+            send({'id': request['id'], 'error': str(e)})
+            continue
+        finally:
+            if out is not None:
+                os.close(out)
+
+        send({'id': request['id'], 'pid': pid})
+        threading.Thread(target=reap, args=(request['id'], pid), daemon=True).start()
+
+    return 0
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ANA SÜREÇ TARAFI
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class SpawnedProcess:
+    """Yardımcının başlattığı süreç - execute_task için Popen ile aynı arayüz."""
+
+    def __init__(self, argv: List[str], read_fd: int):
+        self.args = argv
+        self.pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+        self.error: Optional[str] = None
+        self.stdout = os.fdopen(read_fd, 'r', encoding='utf-8', errors='replace')
+        self._started = threading.Event()
+        self._exited = threading.Event()
+
+    def _set_started(self, pid: Optional[int], error: Optional[str] = None):
+        self.pid = pid
+        self.error = error
+        self._started.set()
+
+    def _set_exit(self, code: int):
+        self.returncode = code
+        self._exited.set()
+
+    def poll(self) -> Optional[int]:
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def kill(self):
+        if self.pid and self.returncode is None:
+            try:
+                os.kill(self.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+class SpawnServer:
+    """Yardımcı süreci yönetir ve başlatma isteklerini gönderir."""
+
+    START_TIMEOUT = 10  # saniye
+
+    def __init__(self):
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", str(child_sock.fileno())],
+            pass_fds=[child_sock.fileno()], stdin=subprocess.DEVNULL, close_fds=True
+        )
+        child_sock.close()
+        self._sock = parent_sock
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._pending: Dict[int, SpawnedProcess] = {}
+        self._known_envs: set = set()
+        self._ids = count(1)
+        self.closed = False
+        self.stats = {"spawned": 0, "errors": 0}
+        self._reader = threading.Thread(target=self._read_loop, name="spawn-server", daemon=True)
+        self._reader.start()
+
+    def alive(self) -> bool:
+        return not self.closed and self.proc.poll() is None
+
+    def spawn(self, argv: List[str], env_id: Optional[str], env: Dict[str, str]) -> SpawnedProcess:
+        """argv'yi başlat; ortam env_id ile önbelleklenir (None: tek seferlik). Başlatılamazsa OSError."""
+        request_id = next(self._ids)
+        read_fd, write_fd = os.pipe()
+        proc = SpawnedProcess(argv, read_fd)
+        message = {'id': request_id, 'argv': argv, 'env_id': env_id}
+
+        with self._lock:
+            self._pending[request_id] = proc
+            if env_id is None:
+                message['env'] = env
+            elif env_id not in self._known_envs:
+                message['env'] = env
+                self._known_envs.add(env_id)
+        try:
+            with self._send_lock:
+                socket.send_fds(self._sock, [json.dumps(message).encode()], [write_fd])
+        except OSError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+                self._known_envs.discard(env_id)
+            proc.stdout.close()
+            raise
+        finally:
+            os.close(write_fd)
+
+        if not proc._started.wait(self.START_TIMEOUT) or proc.pid is None:
+            self.stats["errors"] += 1
+            proc.stdout.close()
+            raise OSError(proc.error or "Spawn server yanıt vermedi")
+        self.stats["spawned"] += 1
+        return proc
+
+    def _read_loop(self):
+        while True:
+            try:
+                data = self._sock.recv(MAX_MESSAGE)
+            except OSError:
+                data = b""
+            if not data:
+                break
+            message = json.loads(data)
+            with self._lock:
+                proc = self._pending.get(message['id'])
+                if 'exit' in message or 'error' in message:
+                    self._pending.pop(message['id'], None)
+            if proc is None:
+                continue
+            if 'pid' in message:
+                proc._set_started(message['pid'])
+            elif 'error' in message:
+                proc._set_started(None, message['error'])
+            else:
+                proc._set_exit(message['exit'])
+
+        # Yardımcı kapandı - bekleyenler serbest bırakılır
+        self.closed = True
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for proc in pending:
+            proc._set_started(proc.pid, proc.error or "Spawn server kapandı")
+            proc._set_exit(-1)
+
+    def close(self):
+        self.closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+def create_spawn_server(config) -> Optional[SpawnServer]:
+    """Config'e göre yardımcıyı başlat (kapalıysa / desteklenmiyorsa None)."""
+    if not config.spawn_server_enabled:
+        return None
+    if not SPAWN_SERVER_AVAILABLE or getattr(sys, 'frozen', False):
+        print("⚠️ Spawn server bu platformda desteklenmiyor - subprocess kullanılacak")
+        return None
+    try:
+        return SpawnServer()
+    except OSError as e:
+        print(f"⚠️ Spawn server başlatılamadı: {e}")
+        return None
+
+
+if __name__ == "__main__" and len(sys.argv) == 3 and sys.argv[1] == "--serve":
+    sys.exit(serve(int(sys.argv[2])))
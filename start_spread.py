@@ -0,0 +1,146 @@
+# start_spread.py - Başlangıç Zamanı Dağıtma
+"""
+MGD Task Scheduler Pro v4.0 - Start Spreading
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Aynı saate (ör. 08:00) planlanmış görevlerin aynı turda başlayıp disk ve
+CPU'yu boğmasını önler:
+
+- Jitter: Görev, id'sinden türetilen sabit bir gecikmeyle (0..pencere saniye)
+  başlar. Aynı görev her gün aynı kaymayı alır; next_run hesabı etkilenmez.
+  Pencere görev kaydındaki "jitter" alanı veya start_jitter_seconds ile verilir.
+- Yük erteleme: 1 dakikalık loadavg eşiği aşarsa Kritik olmayan görevler
+  yük düşene kadar (en fazla load_defer_max_seconds) bekletilir.
+
+Kritik (öncelik 1) görevler hiçbir zaman ertelenmez; global jitter de uygulanmaz.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+LOADAVG_AVAILABLE = hasattr(os, "getloadavg")
+
+CRITICAL_PRIORITY = 1
+
+
+class StartSpreader:
+    """scheduler_loop için: zamanı gelen görev bu turda başlatılsın mı?"""
+
+    # loadavg en fazla bu sıklıkla okunur (saniye)
+    LOAD_SAMPLE_INTERVAL = 1.0
+
+    def __init__(self, config, log=print):
+        self.config = config
+        self.log = log
+        self._lock = threading.Lock()
+        self._load: Tuple[float, float] = (0.0, 0.0)  # (okuma zamanı, değer)
+        self._deferred: Dict[str, str] = {}  # task_id -> ertelenen next_run (log tekrarını önler)
+        self._hashes: Dict[str, int] = {}  # task_id -> sha1 önekinden sayı (her turda yeniden hesaplanmaz)
+        self.stats = {"jittered": 0, "deferred": 0, "forced": 0}
+        if config.load_defer_threshold > 0 and not LOADAVG_AVAILABLE:
+            print("⚠️ Yük ölçümü (loadavg) bu platformda yok - yüke göre erteleme kapalı")
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # JİTTER
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def jitter_window(self, task: Dict[str, Any]) -> int:
+        if 'jitter' in task:
+            return max(0, int(task.get('jitter') or 0))
+        if task.get('priority', 3) <= CRITICAL_PRIORITY:
+            return 0
+        return max(0, int(self.config.start_jitter_seconds))
+
+    def offset(self, task: Dict[str, Any]) -> int:
+        """Görev id'sinden türetilen sabit gecikme (saniye)."""
+        window = self.jitter_window(task)
+        if window <= 0:
+            return 0
+        value = self._hashes.get(task['id'])
+        if value is None:
+            digest = hashlib.sha1(str(task['id']).encode('utf-8')).digest()
+            value = self._hashes[task['id']] = int.from_bytes(digest[:4], 'big')
+        return value % (window + 1)
+
+    def due_time(self, task: Dict[str, Any], next_run: datetime) -> datetime:
+        """Jitter uygulanmış başlangıç zamanı (retry'lar kaydırılmaz)."""
+        if task.get('current_retry', 0):
+            return next_run
+        return next_run + timedelta(seconds=self.offset(task))
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # YÜK
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def current_load(self) -> Optional[float]:
+        """1 dakikalık loadavg (ölçülemiyorsa None)."""
+        if not LOADAVG_AVAILABLE:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            sampled_at, value = self._load
+            if now - sampled_at < self.LOAD_SAMPLE_INTERVAL:
+                return value
+        try:
+            value = os.getloadavg()[0]
+        except OSError:
+            return None
+        with self._lock:
+            self._load = (now, value)
+        return value
+
+    def _defer_for_load(self, task: Dict[str, Any], due: datetime, now: datetime) -> bool:
+        threshold = self.config.load_defer_threshold
+        if threshold <= 0 or task.get('priority', 3) <= CRITICAL_PRIORITY:
+            return False
+        load = self.current_load()
+        if load is None or load <= threshold:
+            return False
+
+        waited = (now - due).total_seconds()
+        key = task['next_run']
+        if waited >= self.config.load_defer_max_seconds:
+            if self._deferred.pop(task['id'], None) is not None:
+                self.stats["forced"] += 1
+                self.log(f"⚠️ YÜK YÜKSEK: {task['name']} - en fazla bekleme "
+                         f"({self.config.load_defer_max_seconds}s) doldu, çalıştırılıyor")
+            return False
+
+        if self._deferred.get(task['id']) != key:
+            self._deferred[task['id']] = key
+            self.stats["deferred"] += 1
+            self.log(f"⏳ ERTELENDİ: {task['name']} - sistem yükü {load:.1f} > {threshold:g}")
+        return True
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # KARAR
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def start_time(self, task: Dict[str, Any], next_run: datetime, now: datetime) -> Optional[datetime]:
+        """
+        Zamanı gelen (now >= next_run) görev için: bu turda bekletilecekse None,
+        başlatılacaksa jitter'lı başlangıç zamanı (cluster'da gecikme hesabı için).
+        """
+        due = self.due_time(task, next_run)
+        if now < due:
+            return None
+        if self._defer_for_load(task, due, now):
+            return None
+        if due != next_run:
+            self.stats["jittered"] += 1
+        self._deferred.pop(task['id'], None)
+        return due
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'jitter_window': self.config.start_jitter_seconds,
+            'load_threshold': self.config.load_defer_threshold,
+            'load': self.current_load(),
+            'waiting_for_load': len(self._deferred),
+            **self.stats,
+        }
@@ -0,0 +1,254 @@
+# task_dag.py - Görev Bağımlılıkları (DAG)
+"""
+MGD Task Scheduler Pro v4.0 - Task Dependencies
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+Görevler "depends_on" alanında önceki görevleri (id veya isim) listeleyebilir:
+
+    export  ─┬─► transform ─► report
+    backup  ─┘
+
+- Bağımlı görevler saatle değil, tüm öncülleri başarıyla bittiğinde hemen çalışır
+- Birbirinden bağımsız dallar paralel çalışır
+- Bir öncül başarısız olursa sonraki görevler atlanır (retry başarılı olursa devam eder)
+- Her çalıştırma kritik yolu (pipeline'ın süresini belirleyen zincir) history'e yazar
+"""
+
+import time
+import threading
+from uuid import uuid4
+from datetime import datetime
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+
+def pipeline_fields(context: Optional[Dict[str, Any]], task_name: str, start_time: float) -> Dict[str, Any]:
+    """
+    execute_task için çalıştırma sonucu şablonu ve history alanları.
+    context: dispatch sırasında TaskGraph'tan gelen pipeline bilgisi (yoksa None veya pipeline_id'siz).
+    """
+    if not context or 'pipeline_id' not in context:
+        return {}
+    pipeline_start = context.get('pipeline_start') or start_time
+    path = list(context.get('path', [])) + [task_name]
+    return {
+        'pipeline_id': context['pipeline_id'],
+        'upstream_task_id': context.get('upstream', ''),
+        'critical_path': " → ".join(path),
+        'critical_path_seconds': round(time.time() - pipeline_start, 3),
+        # Sonraki görevlere aktarılır (history'e yazılmaz)
+        '_pipeline_start': pipeline_start,
+        '_path': path,
+    }
+
+
+class TaskGraph:
+    """
+    depends_on alanlarından oluşan bağımlılık grafiği ve tetikleme durumu.
+
+    Hazır olma kuralı: bağımlı görev, her öncülünün kendi son tetiklenmesinden
+    sonra başarıyla bitmiş bir çalıştırması olduğunda çalışır. Böylece ortak
+    öncüllü (elmas) yapılarda görev her pipeline'da tek kez çalışır.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self._lock = threading.RLock()
+        self._signature: Optional[Tuple] = None
+        self._upstream: Dict[str, List[str]] = {}
+        self._downstream: Dict[str, List[str]] = {}
+        self._cyclic: set = set()
+        # task_id -> {'success', 'finished', 'pipeline_id', 'pipeline_start', 'path'}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._consumed: Dict[str, float] = {}  # bağımlı görev -> son tetiklenme zamanı
+        self._pending: set = set()  # Tetiklendiğinde çalışmakta olan görevler
+        self._frozen = False  # True ise görev listesi değişmez kabul edilir (simülasyon)
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # GRAF
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _refresh(self):
+        """Görev listesi/bağımlılıklar değiştiyse grafiği yeniden kur."""
+        if self._frozen:
+            return
+        tasks = self.service.tasks
+        signature = tuple((task['id'], tuple(task.get('depends_on') or ())) for task in tasks)
+        if signature == self._signature:
+            return
+        self._signature = signature
+
+        by_id = {task['id']: task for task in tasks}
+        by_name = {task['name']: task for task in tasks}
+        upstream: Dict[str, List[str]] = {}
+        downstream: Dict[str, List[str]] = {}
+
+        for task in tasks:
+            for ref in task.get('depends_on') or ():
+                parent = by_id.get(ref) or by_name.get(ref)
+                if parent is None:
+                    self.service.log(f"⚠️ BAĞIMLILIK BULUNAMADI: {task['name']} → '{ref}'")
+                    continue
+                if parent['id'] == task['id'] or parent['id'] in upstream.get(task['id'], ()):
+                    continue
+                upstream.setdefault(task['id'], []).append(parent['id'])
+                downstream.setdefault(parent['id'], []).append(task['id'])
+
+        # Kahn algoritması - sıralanamayan düğümler döngü içindedir
+        indegree = {task_id: len(parents) for task_id, parents in upstream.items()}
+        ready = deque(task_id for task_id in by_id if not indegree.get(task_id))
+        visited = set()
+        while ready:
+            task_id = ready.popleft()
+            visited.add(task_id)
+            for child in downstream.get(task_id, ()):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+
+        self._cyclic = set(by_id) - visited
+        if self._cyclic:
+            names = ", ".join(sorted(by_id[task_id]['name'] for task_id in self._cyclic))
+            self.service.log(f"!!! BAĞIMLILIK DÖNGÜSÜ: {names} - bu görevler tetiklenmez")
+
+        self._upstream = upstream
+        self._downstream = downstream
+
+    def freeze(self):
+        """Grafiği bir kez kur; görev listesi artık değişmeyecek (her bitişte tekrar taranmaz)."""
+        with self._lock:
+            self._frozen = False
+            self._refresh()
+            self._frozen = True
+
+    @staticmethod
+    def is_dependent(task: Dict[str, Any]) -> bool:
+        """Saatle değil, öncülleri ile tetiklenen görev mi?"""
+        return bool(task.get('depends_on'))
+
+    def root_context(self, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Saatle başlayan görev bir pipeline kökü ise yeni pipeline bilgisi."""
+        with self._lock:
+            self._refresh()
+            if not self._downstream.get(task['id']):
+                return None
+        return {'pipeline_id': uuid4().hex[:12], 'pipeline_start': None, 'upstream': '', 'path': []}
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # TETİKLEME
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def on_finished(self, task: Dict[str, Any], result: Optional[Dict[str, Any]]):
+        """Görev bitti - hazır olan sonraki görevleri çalıştır, başarısızsa atla."""
+        with self._lock:
+            self._refresh()
+            task_id = task['id']
+            children = list(self._downstream.get(task_id, ()))
+            retrigger = task_id in self._pending
+            self._pending.discard(task_id)
+            if not children and not retrigger and task_id not in self._upstream:
+                return
+
+            success = bool(result and result.get('success'))
+            self._results[task_id] = {
+                'success': success,
+                'finished': time.time(),
+                'pipeline_id': (result or {}).get('pipeline_id', ''),
+                'pipeline_start': (result or {}).get('_pipeline_start'),
+                'path': (result or {}).get('_path', [task['name']]),
+            }
+
+            if task_id in self._upstream and not children and success and result.get('pipeline_id'):
+                self.service.log(
+                    f"⛓ PIPELINE TAMAMLANDI: {result['critical_path']} ({result['critical_path_seconds']:.1f}s)"
+                )
+
+            if not success:
+                self._skip_downstream(task)
+                return
+
+            ready = [child for child in children + ([task_id] if retrigger else []) if self._is_ready(child)]
+            launches = [(child, self._claim(child)) for child in ready]
+
+        for child_id, context in launches:
+            self._launch(child_id, context)
+
+    def _is_ready(self, task_id: str) -> bool:
+        if task_id in self._cyclic:
+            return False
+        consumed = self._consumed.get(task_id, 0.0)
+        for parent in self._upstream.get(task_id, ()):
+            result = self._results.get(parent)
+            if not result or not result['success'] or result['finished'] <= consumed:
+                return False
+        return True
+
+    def _claim(self, task_id: str) -> Dict[str, Any]:
+        """Tetiklemeyi tüket; kritik öncül (en son biten) pipeline bilgisini verir."""
+        self._consumed[task_id] = time.time()
+        critical = max(self._upstream[task_id], key=lambda parent: self._results[parent]['finished'])
+        result = self._results[critical]
+        return {
+            'pipeline_id': result['pipeline_id'] or uuid4().hex[:12],
+            'pipeline_start': result['pipeline_start'],
+            'upstream': critical,
+            'path': result['path'],
+        }
+
+    def _launch(self, task_id: str, context: Dict[str, Any]):
+        service = self.service
+        task = service.find_task(task_id)
+        if task is None or not service.running:
+            return
+
+        now = service.clock.now()
+        if task.get('paused', False):
+            self.service.log(f"⏭ ATLANDI: {task['name']} - duraklatılmış")
+            return
+        if not service.circuit_allows(task, now):
+            self.service.log(f"⏭ ATLANDI: {task['name']} - devre açık")
+            return
+        try:
+            if now > datetime.strptime(task['end'], "%d.%m.%Y %H:%M"):
+                return
+        except (KeyError, ValueError):
+            pass
+        if task.get('status') == 'running':
+            # Bitince tekrar kontrol edilir
+            with self._lock:
+                self._pending.add(task_id)
+                self._consumed[task_id] = 0.0
+            return
+
+        parent = service.find_task(context['upstream'])
+        service.log(f"⛓ TETİKLENDİ: {task['name']} ← {parent['name'] if parent else context['upstream']}")
+        task['last_run'] = now.strftime("%d.%m.%Y %H:%M")
+        task['run_count'] = task.get('run_count', 0) + 1
+        service.save_task_fields([(task, ('last_run', 'run_count'))])
+        service.dispatch(task, context=context)
+
+    def _skip_downstream(self, task: Dict[str, Any]):
+        """Başarısız görevin tüm alt zincirini atla (sadece log - öncül tekrar başarılı olursa devam eder)."""
+        skipped = []
+        queue = deque(self._downstream.get(task['id'], ()))
+        seen = set()
+        while queue:
+            task_id = queue.popleft()
+            if task_id in seen:
+                continue
+            seen.add(task_id)
+            child = self.service.find_task(task_id)
+            if child:
+                skipped.append(child['name'])
+            queue.extend(self._downstream.get(task_id, ()))
+        if skipped:
+            self.service.log(f"⏭ ATLANDI: {', '.join(skipped)} - öncül başarısız ({task['name']})")
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return {
+                'dependent_tasks': len(self._upstream),
+                'cyclic_tasks': sorted(self._cyclic),
+            }
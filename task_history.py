@@ -5,12 +5,20 @@ Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
 Support: Ahmet KAHREMAN (CMX)
 """
 
+import re
 import json
+import mmap
+import heapq
+import time
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Tuple
 from dataclasses import dataclass, asdict
 
+from utils import FileManager
+
 
 @dataclass
 class TaskHistoryRecord:
@@ -25,77 +33,325 @@ class TaskHistoryRecord:
     exit_code: int
     error_message: str = ""
     output: str = ""
+    # Bağımlı görev zincirleri (depends_on) - pipeline dışındaki kayıtlarda boş
+    pipeline_id: str = ""
+    upstream_task_id: str = ""
+    critical_path: str = ""  # "export → transform → report"
+    critical_path_seconds: float = 0.0  # Pipeline başlangıcından bu görevin bitişine
+    cached: bool = False  # Girdiler değişmediği için çalıştırılmadı (inputs)
+    
+    PIPELINE_FIELDS = ('pipeline_id', 'upstream_task_id', 'critical_path', 'critical_path_seconds')
     
     def to_dict(self):
         return asdict(self)
 
 
 class TaskHistoryManager:
-    """Görev geçmişi yönetim sınıfı."""
+    """
+    Görev geçmişi yönetim sınıfı.
+
+    Kayıtlar aylık JSON Lines dosyalarında tutulur (history_YYYYMM.jsonl, her satır
+    bir kayıt). Yeni kayıt dosya sonuna eklenir; okuma mmap üzerinden satır satır
+    yapılır, böylece büyük arşivler belleğe tamamen yüklenmez.
+
+    Günlük özetler (daily_stats.json) her kayıtta artımlı güncellenir; günlük
+    rapor history dosyalarını yeniden taramadan bu özetlerden üretilir.
+    """
+    
+    DAILY_STATS_KEEP_DAYS = 90
+    DAILY_STATS_SAVE_INTERVAL = 30  # saniye - en fazla bu sıklıkta diske yazılır
+    
+    TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+    _START_TIME_RE = re.compile(rb'"start_time"\s*:\s*"([^"]*)"')
+    _TASK_ID_RE = re.compile(rb'"task_id"\s*:\s*"([^"]*)"')
     
     def __init__(self, history_dir: str = "history"):
         self.history_dir = Path(history_dir)
         self.history_dir.mkdir(exist_ok=True)
-        self.current_file = self.history_dir / f"history_{datetime.now().strftime('%Y%m')}.json"
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._compaction_thread: Optional[threading.Thread] = None
+        # Dosyayı okuyan (mmap açık) akış sayısı - Windows'ta açık dosya
+        # değiştirilemez/silinemez, compaction okuyucuların bitmesini bekler
+        self._readers: Dict[Path, int] = {}
+        self._readers_done = threading.Condition(self._lock)
+        
+        # Yarıda kalmış compaction/dönüştürme dosyaları
+        for stale in self.history_dir.glob("history_*.jsonl.tmp"):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+        
+        # Günlük özetler - arka plan thread'inde kilit dışında oluşturulur
+        # (load_daily_stats); hazır olana kadar yeni kayıtlar bekletilir
+        self.daily_stats_file = self.history_dir / "daily_stats.json"
+        self._daily: Optional[Dict] = None
+        self._daily_pending: Dict[str, Dict] = {}  # kayıt id -> kayıt
+        self._daily_build_lock = threading.Lock()
+        self._daily_saved_at = 0.0
+    
+    @property
+    def current_file(self) -> Path:
+        """Bu ayın kayıt dosyası (ay değişiminde otomatik yeni dosya)."""
+        return self._month_file(datetime.now().strftime('%Y%m'))
+    
+    def _month_file(self, month: str) -> Path:
+        return self.history_dir / f"history_{month}.jsonl"
     
     def add_record(self, record: TaskHistoryRecord):
-        """Yeni kayıt ekle."""
-        records = self.load_current_month()
-        records.append(record.to_dict())
+        """Yeni kayıt ekle (dosya sonuna tek satır)."""
+        data = record.to_dict()
+        line = json.dumps(data, ensure_ascii=False) + "\n"
         
         try:
-            with open(self.current_file, 'w', encoding='utf-8') as f:
-                json.dump(records, f, indent=4, ensure_ascii=False)
+            with self._lock:
+                if self._daily is None:
+                    # Özet henüz hazır değil - dosyaya yazılmadan önce bekletilir ki
+                    # oluşturucu bu kaydı dosyada görürse atlasın (çift sayım olmaz)
+                    self._daily_pending[data['id']] = data
+                with open(self.current_file, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                if self._daily is not None:
+                    self._aggregate(self._daily, data)
+                    if time.monotonic() - self._daily_saved_at >= self.DAILY_STATS_SAVE_INTERVAL:
+                        self._save_daily_stats()
         except Exception as e:
             print(f"History add error: {e}")
     
     def load_current_month(self) -> List[Dict]:
         """Bu ayın kayıtlarını yükle."""
-        if self.current_file.exists():
+        month = datetime.now().strftime('%Y%m')
+        start = datetime.strptime(month, '%Y%m')
+        return list(self.iter_records(start=start, newest_first=False))
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # AKIŞ (STREAMING) OKUYUCU
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def _month_files(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Path]:
+        """Zaman aralığıyla kesişen aylık dosyalar (eski .json dosyaları dönüştürülür)."""
+        for legacy in sorted(self.history_dir.glob("history_*.json")):
+            self._convert_legacy_file(legacy)
+        
+        start_month = start.strftime('%Y%m') if start else None
+        end_month = end.strftime('%Y%m') if end else None
+        
+        files = []
+        for file in sorted(self.history_dir.glob("history_*.jsonl")):
+            month = file.stem.split('_')[1]
+            if start_month and month < start_month:
+                continue
+            if end_month and month > end_month:
+                continue
+            files.append(file)
+        return files
+    
+    def _convert_legacy_file(self, legacy: Path):
+        """Eski JSON dizisi formatındaki dosyayı akış halinde JSONL'e çevir."""
+        import shutil
+        
+        target = legacy.with_suffix('.jsonl')
+        temp = legacy.with_suffix('.jsonl.tmp')
+        
+        try:
+            with self._lock:
+                error = None
+                with open(temp, 'w', encoding='utf-8') as out:
+                    try:
+                        for record in self._iter_json_array(legacy):
+                            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    except ValueError as e:
+                        error = e  # Okunabilen kayıtlar aktarılır, orijinal silinmez
+                    
+                    # Aynı aya ait yeni formatta kayıtlar varsa korunur
+                    if target.exists():
+                        with open(target, 'r', encoding='utf-8') as existing:
+                            shutil.copyfileobj(existing, out)
+                
+                temp.replace(target)
+                if error is None:
+                    legacy.unlink()
+                else:
+                    # .json.bak tekrar dönüştürülmez; kalan kayıtlar elle kurtarılabilir
+                    kept = legacy.with_suffix('.json.bak')
+                    legacy.replace(kept)
+            if error is None:
+                print(f"🔄 History dosyası dönüştürüldü: {legacy.name} -> {target.name}")
+            else:
+                print(f"⚠️ History dosyası kısmen dönüştürüldü: {legacy.name} -> {target.name} ({error}); "
+                      f"orijinal {kept.name} olarak saklandı")
+        except Exception as e:
+            print(f"History convert error ({legacy.name}): {e}")
+            if temp.exists():
+                temp.unlink()
+    
+    @staticmethod
+    def _iter_json_array(path: Path, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+        """
+        JSON dizisini tamamını belleğe almadan eleman eleman oku.
+        Bozuk/yarım kayıtta ValueError fırlatır (o ana kadarki kayıtlar üretilmiştir).
+        """
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = 0
+        eof = False
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            while True:
+                # Ayırıcıları atla: [ , ] ve boşluklar
+                while pos < len(buffer) and buffer[pos] in " \t\r\n[,]":
+                    pos += 1
+                
+                if pos >= len(buffer):
+                    if eof:
+                        return
+                    buffer = f.read(chunk_size)
+                    pos = 0
+                    eof = not buffer
+                    continue
+                
+                try:
+                    obj, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise ValueError("Bozuk/yarım kayıt")
+                    chunk = f.read(chunk_size)
+                    eof = not chunk
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                
+                yield obj
+                pos = end
+    
+    def _index_file(self, path: Path, start: Optional[str], end: Optional[str],
+                    task_id: Optional[str]) -> List[Tuple[str, int]]:
+        """Dosyadaki kayıtların (start_time, offset) indeksi - sadece aralıktakiler."""
+        index = []
+        
+        with open(path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return index  # Boş dosya
+            
+            with mm:
+                offset = 0
+                for line in iter(mm.readline, b""):
+                    line_offset = offset
+                    offset += len(line)
+                    
+                    match = self._START_TIME_RE.search(line)
+                    if not match:
+                        continue
+                    start_time = match.group(1).decode('utf-8')
+                    
+                    if start and start_time < start:
+                        continue
+                    if end and start_time > end:
+                        continue
+                    if task_id is not None:
+                        id_match = self._TASK_ID_RE.search(line)
+                        if not id_match or id_match.group(1).decode('utf-8') != task_id:
+                            continue
+                    
+                    index.append((start_time, line_offset))
+        
+        return index
+    
+    def _iter_file(self, path: Path, start: Optional[str], end: Optional[str],
+                   task_id: Optional[str], newest_first: bool) -> Iterator[Dict]:
+        """Tek dosyanın kayıtlarını start_time sırasıyla tembel (lazy) üret."""
+        with self._reading(path):
+            index = self._index_file(path, start, end, task_id)
+            index.sort(reverse=newest_first)
+            if not index:
+                return
+            
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for _, offset in index:
+                        mm.seek(offset)
+                        try:
+                            yield json.loads(mm.readline())
+                        except ValueError:
+                            continue
+    
+    @contextmanager
+    def _reading(self, path: Path):
+        with self._lock:
+            self._readers[path] = self._readers.get(path, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._readers[path] -= 1
+                if not self._readers[path]:
+                    del self._readers[path]
+                    self._readers_done.notify_all()
+    
+    def _wait_for_readers(self, path: Path, timeout: float = 30.0) -> bool:
+        """Dosyayı okuyan akışlar bitene kadar bekle (_lock altında çağrılır)."""
+        return self._readers_done.wait_for(lambda: path not in self._readers, timeout)
+    
+    @staticmethod
+    def _retry_on_permission(action, attempts: int = 5, delay: float = 0.2):
+        """Windows: dosyayı kısa süre tutan başka süreçler (antivirüs, yedekleme) için tekrar dene."""
+        for attempt in range(attempts):
             try:
-                with open(self.current_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+                return action()
+            except PermissionError:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(delay * (attempt + 1))
+    
+    def iter_records(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     task_id: Optional[str] = None, newest_first: bool = True) -> Iterator[Dict]:
+        """
+        Zaman aralığındaki kayıtları start_time sırasıyla tembel olarak döndür.
+        Aylık dosyalar heap tabanlı k-way merge ile birleştirilir; bellekte sadece
+        her dosyanın (start_time, offset) indeksi tutulur.
+        """
+        start_str = start.strftime(self.TIME_FORMAT) if start else None
+        end_str = end.strftime(self.TIME_FORMAT) if end else None
+        
+        streams = [
+            self._iter_file(file, start_str, end_str, task_id, newest_first)
+            for file in self._month_files(start, end)
+        ]
+        return heapq.merge(*streams, key=lambda r: r.get('start_time', ''), reverse=newest_first)
     
     def get_task_history(self, task_id: str, days: int = 30) -> List[Dict]:
         """Belirli bir görevin geçmişi."""
-        all_records = self.load_all_recent(days)
-        return [r for r in all_records if r.get('task_id') == task_id]
+        cutoff_date = datetime.now() - timedelta(days=days)
+        return list(self.iter_records(start=cutoff_date, task_id=task_id))
     
     def load_all_recent(self, days: int = 30) -> List[Dict]:
         """Son X günün kayıtlarını yükle."""
         cutoff_date = datetime.now() - timedelta(days=days)
-        all_records = []
-        
-        for file in sorted(self.history_dir.glob("history_*.json"), reverse=True):
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    records = json.load(f)
-                    for record in records:
-                        start_time = datetime.strptime(record['start_time'], '%Y-%m-%d %H:%M:%S')
-                        if start_time >= cutoff_date:
-                            all_records.append(record)
-            except:
-                continue
-        
-        return sorted(all_records, key=lambda x: x['start_time'], reverse=True)
+        return list(self.iter_records(start=cutoff_date))
     
     def get_statistics(self, days: int = 30) -> Dict:
         """İstatistikler."""
-        records = self.load_all_recent(days)
-        
-        total = len(records)
-        success = sum(1 for r in records if r.get('success', False))
-        failed = total - success
+        cutoff_date = datetime.now() - timedelta(days=days)
         
-        total_duration = sum(r.get('duration', 0) for r in records)
-        avg_duration = total_duration / total if total > 0 else 0
+        total = 0
+        success = 0
+        cached = 0
+        total_duration = 0
         
         # Görev başına istatistikler
         task_stats = {}
-        for record in records:
+        for record in self.iter_records(start=cutoff_date):
+            if record.get('cached'):
+                cached += 1
+                continue
+            total += 1
+            if record.get('success', False):
+                success += 1
+            total_duration += record.get('duration', 0)
+            
             task_id = record.get('task_id')
             if task_id not in task_stats:
                 task_stats[task_id] = {
@@ -113,6 +369,9 @@ class TaskHistoryManager:
                 task_stats[task_id]['failed'] += 1
             task_stats[task_id]['total_duration'] += record.get('duration', 0)
         
+        failed = total - success
+        avg_duration = total_duration / total if total > 0 else 0
+        
         return {
             'total_runs': total,
             'success': success,
@@ -120,42 +379,360 @@ class TaskHistoryManager:
             'success_rate': (success / total * 100) if total > 0 else 0,
             'total_duration': total_duration,
             'avg_duration': avg_duration,
+            'cached_runs': cached,
             'task_stats': task_stats
         }
     
+    # ═══════════════════════════════════════════════════════════════════════
+    # GÜNLÜK ÖZETLER
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    @property
+    def daily_stats_ready(self) -> bool:
+        return self._daily is not None
+    
+    def load_daily_stats(self):
+        """
+        Günlük özetleri oluştur (hazırsa bir şey yapmaz).
+
+        History dosyaları _lock dışında taranır, kayıt ekleme beklemez. Tarama
+        sırasında eklenen kayıtlar _daily_pending'de tutulur ve sonda eklenir;
+        dosyada da görülen bekleyen kayıtlar taramada atlanır.
+        """
+        with self._daily_build_lock:
+            if self._daily is not None:
+                return
+            
+            data = FileManager.safe_read(self.daily_stats_file, 'json', None)
+            if not isinstance(data, dict) or 'days' not in data:
+                data = {'days': {}, 'report_sent': ''}
+                rebuild_from = datetime.now() - timedelta(days=self.DAILY_STATS_KEEP_DAYS)
+            else:
+                # Kapanmadan önce diske yazılmamış olabilecek bugünkü kayıtlar yeniden sayılır
+                rebuild_from = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            
+            for day in [d for d in data['days'] if d >= rebuild_from.strftime('%Y-%m-%d')]:
+                del data['days'][day]
+            for record in self.iter_records(start=rebuild_from, newest_first=False):
+                if record.get('id') not in self._daily_pending:
+                    self._aggregate(data, record)
+            
+            with self._lock:
+                for record in self._daily_pending.values():
+                    self._aggregate(data, record)
+                self._daily_pending = {}
+                self._daily = data
+    
+    def _daily_stats(self) -> Dict:
+        """Günlük özetler - hazır değilse çağıran thread'de oluşturulur (_lock dışında çağrılır)."""
+        self.load_daily_stats()
+        return self._daily
+    
+    @staticmethod
+    def _aggregate(data: Dict, record: Dict):
+        """Tek kaydı günün özetine ekle."""
+        day = str(record.get('start_time', ''))[:10]
+        if not day:
+            return
+        
+        success = bool(record.get('success', False))
+        duration = float(record.get('duration', 0) or 0)
+        
+        summary = data['days'].setdefault(day, {'runs': 0, 'success': 0, 'failed': 0, 'duration': 0.0, 'tasks': {}})
+        if record.get('cached'):
+            # Atlanan çalıştırma - süre ortalamalarına girmez
+            summary['cached'] = summary.get('cached', 0) + 1
+            return
+        summary['runs'] += 1
+        summary['success' if success else 'failed'] += 1
+        summary['duration'] += duration
+        
+        task = summary['tasks'].setdefault(record.get('task_id', ''), {
+            'name': record.get('task_name', 'Unknown'), 'runs': 0, 'success': 0,
+            'failed': 0, 'duration': 0.0, 'max_duration': 0.0
+        })
+        task['name'] = record.get('task_name', task['name'])
+        task['runs'] += 1
+        task['success' if success else 'failed'] += 1
+        task['duration'] += duration
+        task['max_duration'] = max(task['max_duration'], duration)
+    
+    def _save_daily_stats(self):
+        """Özetleri diske yaz (_lock altında), saklama süresinden eski günleri at."""
+        if self._daily is None:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.DAILY_STATS_KEEP_DAYS)).strftime('%Y-%m-%d')
+        for day in [d for d in self._daily['days'] if d < cutoff]:
+            del self._daily['days'][day]
+        FileManager.atomic_write(self.daily_stats_file, self._daily, 'json')
+        self._daily_saved_at = time.monotonic()
+    
+    def flush_daily_stats(self):
+        """Bekleyen özet değişikliklerini diske yaz (kapanışta)."""
+        with self._lock:
+            self._save_daily_stats()
+    
+    def get_daily_stats(self, day: str) -> Dict:
+        """Bir günün özeti ('YYYY-MM-DD')."""
+        daily = self._daily_stats()
+        with self._lock:
+            summary = daily['days'].get(day)
+            return json.loads(json.dumps(summary)) if summary else {'runs': 0, 'success': 0, 'failed': 0, 'duration': 0.0, 'tasks': {}}
+    
+    def report_sent_for(self, day: str) -> bool:
+        daily = self._daily_stats()
+        with self._lock:
+            return daily.get('report_sent') == day
+    
+    def mark_report_sent(self, day: str):
+        daily = self._daily_stats()
+        with self._lock:
+            daily['report_sent'] = day
+            self._save_daily_stats()
+    
+    def build_daily_report(self, day: str, tasks: Optional[List[Dict]] = None,
+                           regression_factor: float = 1.5, baseline_days: int = 7,
+                           top: int = 5) -> Dict:
+        """
+        Günlük rapor verisi - sadece günlük özetlerden hesaplanır.
+
+        Süre regresyonu: görevin o günkü ortalama süresi, önceki baseline_days
+        günün ortalamasının regression_factor katını (ve en az 5 sn fazlasını) aşarsa.
+        """
+        tasks = tasks or []
+        summary = self.get_daily_stats(day)
+        day_date = datetime.strptime(day, '%Y-%m-%d')
+        
+        # Önceki günlerin görev başına ortalamaları
+        baseline: Dict[str, List[float]] = {}
+        for offset in range(1, baseline_days + 1):
+            previous = self.get_daily_stats((day_date - timedelta(days=offset)).strftime('%Y-%m-%d'))
+            for task_id, data in previous['tasks'].items():
+                totals = baseline.setdefault(task_id, [0.0, 0])
+                totals[0] += data['duration']
+                totals[1] += data['runs']
+        
+        categories_by_id = {task.get('id'): task.get('category', 'Genel') for task in tasks}
+        categories: Dict[str, Dict[str, int]] = {}
+        slowest = []
+        regressions = []
+        
+        for task_id, data in summary['tasks'].items():
+            category = categories.setdefault(categories_by_id.get(task_id, 'Genel'), {'runs': 0, 'success': 0, 'failed': 0})
+            category['runs'] += data['runs']
+            category['success'] += data['success']
+            category['failed'] += data['failed']
+            
+            avg = data['duration'] / data['runs'] if data['runs'] else 0
+            slowest.append({'task_id': task_id, 'name': data['name'], 'avg_duration': avg,
+                            'max_duration': data['max_duration'], 'runs': data['runs']})
+            
+            total_duration, runs = baseline.get(task_id, (0.0, 0))
+            if runs:
+                base_avg = total_duration / runs
+                if avg > base_avg * regression_factor and avg - base_avg >= 5:
+                    regressions.append({'task_id': task_id, 'name': data['name'], 'avg_duration': avg,
+                                        'baseline': base_avg, 'factor': avg / base_avg if base_avg else 0})
+        
+        runs = summary['runs']
+        return {
+            'date': day,
+            'total_runs': runs,
+            'success': summary['success'],
+            'failed': summary['failed'],
+            'cached': summary.get('cached', 0),
+            'success_rate': (summary['success'] / runs * 100) if runs else 0,
+            'paused': sum(1 for task in tasks if task.get('paused', False)),
+            'expired': sum(1 for task in tasks if task.get('status') == 'expired'),
+            'total_duration': round(summary['duration'] / 3600, 2),  # saat
+            'avg_duration': summary['duration'] / runs if runs else 0,
+            'categories': categories,
+            'slowest': sorted(slowest, key=lambda x: x['avg_duration'], reverse=True)[:top],
+            'regressions': sorted(regressions, key=lambda x: x['factor'], reverse=True)
+        }
+    
     def cleanup_old_records(self, keep_days: int = 30):
         """Eski kayıtları temizle."""
-        cutoff_date = datetime.now() - timedelta(days=keep_days)
-        cutoff_month = cutoff_date.strftime('%Y%m')
+        self.compact(keep_days=keep_days)
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # SAKLAMA POLİTİKASI (COMPACTION)
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def compact(self, keep_days: int = 30, max_records_per_task: int = 0,
+                output_keep_days: Optional[int] = None, pause: float = 0.0) -> Dict[str, int]:
+        """
+        Geçmiş dosyalarını saklama politikasına göre küçült.
         
-        for file in self.history_dir.glob("history_*.json"):
-            file_month = file.stem.split('_')[1]
-            if file_month < cutoff_month:
-                try:
-                    file.unlink()
-                    print(f"Deleted old history file: {file.name}")
-                except Exception as e:
-                    print(f"Failed to delete {file.name}: {e}")
+        - keep_days: Bundan eski kayıtlar silinir (gün hassasiyetinde)
+        - max_records_per_task: Görev başına en yeni N kayıt tutulur (0 = sınırsız)
+        - output_keep_days: Bundan eski BAŞARILI kayıtların output alanı boşaltılır
+        - pause: Dosyalar arasında beklenecek süre (arka planda diski yormamak için)
+        
+        Dosyalar yeniden eskiye tek tek işlenir; bellekte sadece o dosyanın indeksi tutulur.
+        """
+        now = datetime.now()
+        cutoff = (now - timedelta(days=keep_days)).strftime(self.TIME_FORMAT)
+        cutoff_month = cutoff[:7].replace('-', '')
+        output_cutoff = None
+        if output_keep_days is not None:
+            output_cutoff = (now - timedelta(days=output_keep_days)).strftime(self.TIME_FORMAT)
+        
+        result = {'files_deleted': 0, 'records_dropped': 0, 'outputs_dropped': 0}
+        task_counts: Dict[str, int] = {}
+        
+        for file in sorted(self._month_files(), reverse=True):
+            if self._stop_event.is_set():
+                break
+            
+            try:
+                if file.stem.split('_')[1] < cutoff_month:
+                    # Tamamen eski ay - dosyayı komple sil
+                    with self._lock:
+                        if not self._wait_for_readers(file):
+                            print(f"History compaction: {file.name} okunuyor, sonraki turda silinecek")
+                            continue
+                        self._retry_on_permission(file.unlink)
+                    result['files_deleted'] += 1
+                    print(f"🧹 Eski history dosyası silindi: {file.name}")
+                else:
+                    dropped, outputs = self._compact_file(
+                        file, cutoff, max_records_per_task, output_cutoff, task_counts
+                    )
+                    result['records_dropped'] += dropped
+                    result['outputs_dropped'] += outputs
+            except Exception as e:
+                print(f"History compaction error ({file.name}): {e}")
+            
+            if pause:
+                self._stop_event.wait(pause)
+        
+        if any(result.values()):
+            print(f"🧹 History compaction: {result}")
+        return result
+    
+    def _compact_file(self, path: Path, cutoff: str, max_records_per_task: int,
+                      output_cutoff: Optional[str], task_counts: Dict[str, int]) -> Tuple[int, int]:
+        """Tek bir aylık dosyayı küçült; değişiklik yoksa dosyaya dokunmaz."""
+        with self._lock:
+            # 1. geçiş: (start_time, offset, task_id) indeksi
+            entries = []
+            with open(path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    match = self._START_TIME_RE.search(line)
+                    id_match = self._TASK_ID_RE.search(line)
+                    start_time = match.group(1).decode('utf-8') if match else ""
+                    task_id = id_match.group(1).decode('utf-8') if id_match else ""
+                    entries.append((start_time, offset, task_id))
+                    offset += len(line)
+            
+            # Yeniden eskiye: süre ve görev başı kota kontrolü
+            drop = set()
+            for start_time, offset, task_id in sorted(entries, reverse=True):
+                if start_time < cutoff:
+                    drop.add(offset)
+                    continue
+                task_counts[task_id] = task_counts.get(task_id, 0) + 1
+                if max_records_per_task and task_counts[task_id] > max_records_per_task:
+                    drop.add(offset)
+            
+            strip = set()
+            if output_cutoff:
+                strip = {offset for start_time, offset, _ in entries
+                         if offset not in drop and start_time < output_cutoff}
+            
+            if not drop and not strip:
+                return 0, 0
+            
+            # 2. geçiş: kalan satırları dosya sırasıyla yeniden yaz
+            outputs_dropped = 0
+            temp = path.with_suffix('.jsonl.tmp')
+            with open(path, 'rb') as src, open(temp, 'wb') as out:
+                offset = 0
+                for line in src:
+                    line_offset = offset
+                    offset += len(line)
+                    
+                    if line_offset in drop:
+                        continue
+                    
+                    if line_offset in strip:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if record.get('success') and record.get('output'):
+                            record['output'] = ""
+                            line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+                            outputs_dropped += 1
+                    
+                    out.write(line)
+            
+            if not drop and not outputs_dropped:
+                temp.unlink()
+                return 0, 0
+            
+            try:
+                if not self._wait_for_readers(path):
+                    print(f"History compaction: {path.name} okunuyor, sonraki turda küçültülecek")
+                    temp.unlink()
+                    return 0, 0
+                self._retry_on_permission(lambda: temp.replace(path))
+            except OSError:
+                temp.unlink(missing_ok=True)
+                raise
+            return len(drop), outputs_dropped
+    
+    def start_background_compaction(self, keep_days: int, max_records_per_task: int,
+                                    output_keep_days: Optional[int] = None,
+                                    interval_hours: float = 6, initial_delay: float = 30):
+        """Compaction'ı arka plan thread'inde periyodik olarak çalıştır."""
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
+        def worker():
+            # Günlük özetler önce hazırlanır; hazır olana kadar rapor bekletilir
+            try:
+                self.load_daily_stats()
+            except Exception as e:
+                print(f"Daily stats load error: {e}")
+            if self._stop_event.wait(initial_delay):
+                return
+            while not self._stop_event.is_set():
+                self.compact(keep_days, max_records_per_task, output_keep_days, pause=0.5)
+                self._stop_event.wait(interval_hours * 3600)
+        
+        self._compaction_thread = threading.Thread(target=worker, name="history-compaction", daemon=True)
+        self._compaction_thread.start()
+    
+    def stop_background_compaction(self):
+        """Arka plan compaction'ını durdur (devam eden dosya tamamlanır)."""
+        self._stop_event.set()
     
     def export_to_csv(self, output_path: str, days: int = 30) -> bool:
         """CSV olarak dışa aktar."""
         import csv
         
-        records = self.load_all_recent(days)
+        cutoff_date = datetime.now() - timedelta(days=days)
         
         try:
             with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
-                if not records:
-                    return False
-                
-                fieldnames = ['task_name', 'start_time', 'end_time', 'duration', 'success', 'exit_code', 'error_message']
+                fieldnames = ['task_name', 'start_time', 'end_time', 'duration', 'success', 'exit_code', 'error_message',
+                              'pipeline_id', 'critical_path', 'critical_path_seconds', 'cached']
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 
-                writer.writeheader()
-                for record in records:
+                # Kayıtlar satır satır yazılır - bellek kullanımı sabit
+                written = 0
+                for record in self.iter_records(start=cutoff_date):
+                    if written == 0:
+                        writer.writeheader()
                     writer.writerow({k: record.get(k, '') for k in fieldnames})
+                    written += 1
             
-            return True
+            return written > 0
         except Exception as e:
             print(f"CSV export error: {e}")
             return False
@@ -6,32 +6,57 @@ Support: Ahmet KAHREMAN (CMX)
 """
 
 import json
-import shutil
+import threading
 from pathlib import Path
 from datetime import datetime
 from uuid import uuid4
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterable
 from utils import FileManager
 from config import AppConfig
+from task_storage import create_task_storage
 
 class TaskRepository:
     """Görevlerin veri erişim katmanı (Data Access Layer)."""
 
     def __init__(self, config: AppConfig):
         self.config = config
-        self.db_path = Path(config.tasks_db)
+        self.storage = create_task_storage(config)
+        self.db_path = self.storage.path
         self.backup_dir = Path(config.backups_dir)
+        self.backup_pattern = f"tasks_backup_*{self.storage.suffix}"
+        # Eşzamanlı kayıtlar sıraya alınır: sonra kaydeden, sonraki durumu yazar
+        # (msgpack gibi formatlar veriyi dosya kilidinden önce serileştirir)
+        self._save_lock = threading.Lock()
 
         # Gerekli dizinleri oluştur
         self.backup_dir.mkdir(exist_ok=True, parents=True)
 
+        # tasks.json'dan yeni formata otomatik geçiş
+        self.migrate_from_json()
+
+    def migrate_from_json(self) -> bool:
+        """Seçilen format boşsa mevcut tasks.json içeriğini ona aktarır."""
+        json_path = Path(self.config.tasks_db)
+        if self.storage.name == "json" or self.storage.exists() or not json_path.exists():
+            return False
+
+        tasks = FileManager.safe_read(json_path, 'json', [])
+        self.storage.save(tasks)
+        print(f"🔄 {len(tasks)} görev {json_path.name} -> {self.storage.path.name} aktarıldı ({self.storage.name})")
+        return True
+
     def load_tasks(self) -> List[Dict[str, Any]]:
-        """JSON dosyasından görevleri yükler ve varsayılan değerleri atar."""
-        data = FileManager.safe_read(self.db_path, 'json', [])
+        """Veritabanından görevleri yükler ve varsayılan değerleri atar."""
+        data = self.storage.load()
 
         # Varsayılan alanları ekle (Data normalization)
+        now = datetime.now()
         for task in data:
-            task["status"] = "idle"
+            # 'running' vb. geçici durumlar sıfırlanır; 'expired' olarak kaydedilmiş görev
+            # bitişi uzatılmadıysa işaretli kalır (indeksli depo onu bir daha döndürmez).
+            # Kapalıyken süresi dolanları zamanlayıcı işaretler ve bildirir.
+            expired = task.get("status") == "expired" and self._past_end(task, now)
+            task["status"] = "expired" if expired else "idle"
             task.setdefault("paused", False)
             task.setdefault("category", "Genel")
             task.setdefault("priority", 3)
@@ -43,30 +68,74 @@ class TaskRepository:
             task.setdefault("current_retry", 0)
             task.setdefault("last_error", "")
             task.setdefault("telegram_notify", True)
+            # Devre kesici alanları - çalışma sırasında görev sözlüğüne yeni anahtar eklenmesin
+            # (başka thread'ler aynı sözlükleri kayıt için serileştirirken)
+            task.setdefault("failed_cycles", 0)
+            task.setdefault("circuit_state", "closed")
+            task.setdefault("circuit_open_until", "")
+            task.setdefault("circuit_cooldown", 0)
 
         return data
 
+    @staticmethod
+    def _past_end(task: Dict[str, Any], now: datetime) -> bool:
+        try:
+            return now > datetime.strptime(task.get("end", ""), "%d.%m.%Y %H:%M")
+        except (TypeError, ValueError):
+            return False
+
     def save_tasks(self, tasks: List[Dict[str, Any]]) -> Tuple[bool, str]:
         """Görev listesini diske kaydeder (Atomic write)."""
         try:
-            FileManager.atomic_write(self.db_path, tasks, 'json')
+            with self._save_lock:
+                self.storage.save(tasks)
 
-            # Otomatik yedekleme
-            if self.config.auto_backup:
+            # Otomatik yedekleme (journal'lı formatlarda kurtarma journal'dan yapılır)
+            if self.config.auto_backup and not self.storage.journaled:
                 self.create_backup()
             return True, ""
         except Exception as e:
             return False, str(e)
 
+    def update_task_fields(self, tasks: List[Dict[str, Any]],
+                           updates: List[Tuple[Dict[str, Any], Iterable[str]]]) -> Tuple[bool, str]:
+        """
+        Sadece değişen alanları kaydeder (örn. success_count, next_run).
+        Satır bazında güncelleme desteklemeyen formatlarda tüm liste kaydedilir.
+        """
+        if not updates:
+            return True, ""
+
+        if not self.storage.supports_partial_updates:
+            return self.save_tasks(tasks)
+
+        try:
+            self.storage.update_fields(updates)
+            return True, ""
+        except Exception as e:
+            return False, str(e)
+
+    def get_due_tasks(self, tasks: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+        """
+        Zamanlayıcının bu turda bakması gereken görevler.
+        İndeksli formatlarda sadece zamanı gelen/süresi dolanlar, diğerlerinde tüm liste.
+        """
+        due_ids = self.storage.due_task_ids(now)
+        if due_ids is None:
+            return tasks[:]
+
+        by_id = {task['id']: task for task in tasks}
+        return [by_id[task_id] for task_id in due_ids if task_id in by_id]
+
     def create_backup(self) -> Tuple[bool, str]:
         """Mevcut veritabanının yedeğini alır."""
-        backup_path = self.backup_dir / f"tasks_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        backup_path = self.backup_dir / f"tasks_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}{self.storage.suffix}"
         try:
-            if self.db_path.exists():
-                shutil.copy2(self.db_path, backup_path)
+            if self.storage.exists():
+                self.storage.backup_to(backup_path)
 
                 # Eski backup'ları temizle
-                FileManager.cleanup_old_files(self.backup_dir, "tasks_backup_*.json", self.config.backup_keep_count)
+                FileManager.cleanup_old_files(self.backup_dir, self.backup_pattern, self.config.backup_keep_count)
                 return True, ""
             return False, "Database file does not exist"
         except Exception as e:
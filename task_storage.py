@@ -0,0 +1,315 @@
+# task_storage.py - Görev Veritabanı Depolama Formatları
+"""
+MGD Task Scheduler Pro v4.0 - Task Storage Backends
+Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
+Support: Ahmet KAHREMAN (CMX)
+
+tasks.json yanında daha hızlı yüklenen/kaydedilen alternatif formatlar:
+- json    : Varsayılan, insan tarafından okunabilir (tasks.json)
+- msgpack : Kompakt binary format (tasks.msgpack) - msgpack paketi gerekir
+- sqlite  : WAL journal ile SQLite veritabanı (tasks.db)
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from utils import FileManager, lazy_import, is_module_available
+
+# msgpack sadece msgpack formatı seçiliyse yüklenir
+MSGPACK_AVAILABLE = is_module_available("msgpack")
+msgpack = lazy_import("msgpack")
+
+
+class TaskStorage:
+    """Depolama arayüzü - Tüm formatlar bundan türer."""
+
+    name = "base"
+    suffix = ""
+    supports_partial_updates = False
+    journaled = False  # True ise çökme kurtarması journal ile yapılır, her kayıtta yedek alınmaz
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def save(self, tasks: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def update_fields(self, updates: List[Tuple[Dict[str, Any], Iterable[str]]]):
+        """Sadece belirtilen alanları güncelle (supports_partial_updates=True olanlar)."""
+        raise NotImplementedError
+
+    def due_task_ids(self, now: datetime) -> Optional[List[str]]:
+        """Zamanı gelmiş görev id'leri; desteklenmiyorsa None (tüm liste taranır)."""
+        return None
+
+    def backup_to(self, backup_path: Path):
+        """Veritabanının birebir kopyasını al."""
+        import shutil
+        shutil.copy2(self.path, backup_path)
+
+    def close(self):
+        pass
+
+
+class JsonTaskStorage(TaskStorage):
+    """Klasik tasks.json depolama (atomic write)."""
+
+    name = "json"
+    suffix = ".json"
+
+    def load(self) -> List[Dict[str, Any]]:
+        return FileManager.safe_read(self.path, 'json', [])
+
+    def save(self, tasks: List[Dict[str, Any]]):
+        FileManager.atomic_write(self.path, tasks, 'json')
+
+
+class MsgpackTaskStorage(TaskStorage):
+    """msgpack binary depolama - json'dan çok daha hızlı parse edilir."""
+
+    name = "msgpack"
+    suffix = ".msgpack"
+
+    def load(self) -> List[Dict[str, Any]]:
+        raw = FileManager.safe_read(self.path, 'bytes', None)
+        if not raw:
+            return []
+        try:
+            return msgpack.unpackb(raw, raw=False)
+        except Exception:
+            # Bozuk/yarım dosya - JSON'daki gibi .backup kopyasına düşülür
+            backup = FileManager.safe_read(self.path.with_suffix('.backup'), 'bytes', None)
+            if backup:
+                try:
+                    return msgpack.unpackb(backup, raw=False)
+                except Exception:
+                    pass
+            return []
+
+    def save(self, tasks: List[Dict[str, Any]]):
+        FileManager.atomic_write(self.path, msgpack.packb(tasks, use_bin_type=True), 'bytes')
+
+
+class SqliteTaskStorage(TaskStorage):
+    """
+    SQLite depolama - WAL journal ile eşzamanlı okuma ve güvenli yazma.
+
+    Çalışma sırasında değişen alanlar (sayaçlar, next_run vb.) ayrı kolonlarda
+    tutulur; böylece tek bir görevin sayacı değiştiğinde sadece o satır güncellenir.
+    Çökme sonrası kurtarma SQLite journal'ı üzerinden yapılır (.backup kopyası yok).
+    """
+
+    name = "sqlite"
+    suffix = ".db"
+    supports_partial_updates = True
+    journaled = True
+
+    # Satır bazında güncellenen alanlar (data JSON'u yerine kolon olarak tutulur)
+    ROW_COLUMNS = ("next_run", "last_run", "paused", "run_count", "success_count",
+                   "fail_count", "current_retry", "last_error", "status")
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id TEXT PRIMARY KEY, position INTEGER NOT NULL, data TEXT NOT NULL)"
+            )
+            self._upgrade_schema(self._conn)
+            self._conn.commit()
+        return self._conn
+
+    def _upgrade_schema(self, conn: sqlite3.Connection):
+        """Eski şemaya (sadece data kolonu) satır kolonlarını ve indeksleri ekle."""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+        added = False
+        for column in self.ROW_COLUMNS + ("next_run_at", "end_at"):
+            if column not in existing:
+                conn.execute(f"ALTER TABLE tasks ADD COLUMN {column}")
+                added = True
+
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_next_run ON tasks(next_run_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_end ON tasks(end_at)")
+
+        if added:
+            rows = conn.execute("SELECT id, data FROM tasks").fetchall()
+            for task_id, data in rows:
+                task = json.loads(data)
+                conn.execute(
+                    f"UPDATE tasks SET {self._column_assignments()} WHERE id = ?",
+                    self._column_values(task) + [task_id]
+                )
+
+    @staticmethod
+    def _sortable_time(value) -> Optional[str]:
+        """'GG.AA.YYYY SS:DD' -> 'YYYY-MM-DD SS:DD' (indeks için sıralanabilir)."""
+        try:
+            return datetime.strptime(value, "%d.%m.%Y %H:%M").strftime("%Y-%m-%d %H:%M")
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def _column_assignments(cls) -> str:
+        columns = cls.ROW_COLUMNS + ("next_run_at", "end_at")
+        return ", ".join(f"{column} = ?" for column in columns)
+
+    @classmethod
+    def _column_values(cls, task: Dict[str, Any]) -> list:
+        values = [task.get(column) for column in cls.ROW_COLUMNS]
+        values.append(cls._sortable_time(task.get("next_run")))
+        values.append(cls._sortable_time(task.get("end")))
+        return values
+
+    def load(self) -> List[Dict[str, Any]]:
+        columns = ", ".join(self.ROW_COLUMNS)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT data, {columns} FROM tasks ORDER BY position"
+            ).fetchall()
+
+        tasks = []
+        for row in rows:
+            task = json.loads(row[0])
+            for column, value in zip(self.ROW_COLUMNS, row[1:]):
+                if value is not None:
+                    task[column] = bool(value) if column == "paused" else value
+            tasks.append(task)
+        return tasks
+
+    def save(self, tasks: List[Dict[str, Any]]):
+        columns = ("id", "position", "data") + self.ROW_COLUMNS + ("next_run_at", "end_at")
+        placeholders = ", ".join("?" for _ in columns)
+        rows = [
+            [task['id'], position, json.dumps(task, ensure_ascii=False)] + self._column_values(task)
+            for position, task in enumerate(tasks)
+        ]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM tasks")
+                conn.executemany(
+                    f"INSERT INTO tasks ({', '.join(columns)}) VALUES ({placeholders})", rows
+                )
+
+    def update_fields(self, updates: List[Tuple[Dict[str, Any], Iterable[str]]]):
+        """
+        Sadece değişen alanları tek transaction içinde güncelle.
+        Yazma boyutu toplam görev sayısından bağımsızdır.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for task, fields in updates:
+                    fields = set(fields)
+                    assignments = []
+                    values = []
+
+                    for column in self.ROW_COLUMNS:
+                        if column in fields:
+                            assignments.append(f"{column} = ?")
+                            values.append(task.get(column))
+
+                    if "next_run" in fields:
+                        assignments.append("next_run_at = ?")
+                        values.append(self._sortable_time(task.get("next_run")))
+
+                    # Kolon olmayan alanlar için sadece bu satırın data JSON'u yenilenir
+                    if fields - set(self.ROW_COLUMNS):
+                        assignments.append("data = ?")
+                        values.append(json.dumps(task, ensure_ascii=False))
+                        assignments.append("end_at = ?")
+                        values.append(self._sortable_time(task.get("end")))
+
+                    if not assignments:
+                        continue
+
+                    cursor = conn.execute(
+                        f"UPDATE tasks SET {', '.join(assignments)} WHERE id = ?",
+                        values + [task['id']]
+                    )
+                    if cursor.rowcount == 0:
+                        self._insert_row(conn, task)
+
+    def _insert_row(self, conn: sqlite3.Connection, task: Dict[str, Any]):
+        """Veritabanında olmayan görevi listenin sonuna ekle."""
+        position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tasks").fetchone()[0]
+        columns = ("id", "position", "data") + self.ROW_COLUMNS + ("next_run_at", "end_at")
+        conn.execute(
+            f"INSERT INTO tasks ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [task['id'], position, json.dumps(task, ensure_ascii=False)] + self._column_values(task)
+        )
+
+    def due_task_ids(self, now: datetime) -> List[str]:
+        """
+        Zamanı gelmiş veya süresi dolmuş görevler (next_run/end indeksleri ile).
+        'expired' olarak işaretlenmiş görevler bitiş tarihi uzatılmadıkça dönmez.
+        """
+        moment = now.strftime("%Y-%m-%d %H:%M")
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id FROM tasks WHERE COALESCE(paused, 0) = 0 AND (next_run_at <= ? OR end_at < ?) "
+                "AND NOT (COALESCE(status, '') = 'expired' AND end_at < ?) "
+                "ORDER BY next_run_at",
+                (moment, moment, moment)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def backup_to(self, backup_path: Path):
+        """SQLite online backup API ile tutarlı kopya al."""
+        with self._lock:
+            target = sqlite3.connect(str(backup_path))
+            try:
+                self._connect().backup(target)
+            finally:
+                target.close()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+STORAGE_BACKENDS = {
+    "json": JsonTaskStorage,
+    "msgpack": MsgpackTaskStorage,
+    "sqlite": SqliteTaskStorage,
+}
+
+
+def available_backends() -> List[str]:
+    """Bu sistemde kullanılabilir depolama formatları."""
+    return [name for name in STORAGE_BACKENDS if name != "msgpack" or MSGPACK_AVAILABLE]
+
+
+def create_task_storage(config) -> TaskStorage:
+    """Config'den depolama nesnesi oluştur."""
+    backend = (config.tasks_storage or "json").lower()
+
+    if backend not in STORAGE_BACKENDS:
+        print(f"⚠️ Bilinmeyen depolama formatı: {backend} - json kullanılıyor")
+        backend = "json"
+
+    if backend == "msgpack" and not MSGPACK_AVAILABLE:
+        print("⚠️ msgpack yüklü değil - json kullanılıyor (pip install msgpack)")
+        backend = "json"
+
+    storage_cls = STORAGE_BACKENDS[backend]
+    return storage_cls(Path(config.tasks_db).with_suffix(storage_cls.suffix))
@@ -5,49 +5,398 @@ Author: Mustafa GÜNEŞDOĞDU (MGdizayn)
 Support: Ahmet KAHREMAN (CMX)
 """
 
-import requests
 import json
+import time
+import queue
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
 
+from utils import lazy_import
+from notification_outbox import NotificationOutbox
+
+# requests sadece ilk Telegram isteğinde yüklenir (Telegram kapalıysa hiç yüklenmez)
+requests = lazy_import("requests")
+
 
 class TelegramManager:
-    """Telegram bot yönetim sınıfı."""
+    """
+    Telegram bot yönetim sınıfı.
+
+    Bildirimler (notify_*, hoş geldin, kapanış) sınırlı bir kuyruğa yazılır ve
+    tek bir arka plan thread'i tarafından kalıcı HTTP oturumu (keep-alive) ile
+    gönderilir. Chat başına hız sınırı uygulanır; 429 ve 5xx yanıtlarında
+    bekleyerek tekrar denenir.
+    """
+    
+    DEFAULT_API_URL = "https://api.telegram.org"
     
-    def __init__(self, bot_token: str, chat_id: str):
+    # Telegram sınırları: chat başına ~1 mesaj/sn, gruplarda 20 mesaj/dk
+    GROUP_MESSAGES_PER_MINUTE = 20
+    BACKOFF_BASE = 1.0  # saniye
+    BACKOFF_MAX = 60.0  # saniye
+    
+    # Özet mesajında her grupta listelenen en fazla görev adı
+    DIGEST_MAX_NAMES = 10
+    
+    def __init__(self, bot_token: str, chat_id: str, api_url: str = DEFAULT_API_URL,
+                 queue_size: int = 500, min_interval: float = 1.0, max_retries: int = 5,
+                 digest_window: int = 0, digest_errors_immediate: bool = True,
+                 outbox: Optional[NotificationOutbox] = None):
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self.base_url = f"{(api_url or self.DEFAULT_API_URL).rstrip('/')}/bot{bot_token}"
         self.enabled = bool(bot_token and chat_id)
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        
+        # Kalıcı oturum ve gönderim kuyruğu (ilk kullanımda oluşturulur)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        
+        # Kalıcı kuyruk (varsa bellek kuyruğu yerine kullanılır)
+        self.outbox = outbox
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._busy = False
+        
+        # Chat başına son gönderim zamanları (hız sınırı)
+        self._sent_times: Dict[str, deque] = {}
+        self._rate_lock = threading.Lock()
+        
+        # Özet (digest) modu: digest_window > 0 ise görev olayları biriktirilir
+        self.digest_window = digest_window
+        self.digest_errors_immediate = digest_errors_immediate
+        self._digest_events: Dict[str, list] = {}
+        self._digest_delivered = 0  # Pencerede anında gönderilmiş olay sayısı
+        self._digest_started: Optional[datetime] = None
+        self._digest_timer: Optional[threading.Timer] = None
+        self._digest_lock = threading.Lock()
+        
+        self.stats = {"sent": 0, "failed": 0, "retried": 0, "dropped": 0,
+                      "digests": 0, "digest_events": 0, "digest_saved": 0}
     
-    def send_message(self, text: str, parse_mode: str = "HTML", disable_notification: bool = False) -> bool:
-        """Telegram mesajı gönder."""
+    # ═══════════════════════════════════════════════════════════════════════
+    # HTTP / HIZ SINIRI
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def _get_session(self):
+        """Bağlantıları yeniden kullanan requests.Session."""
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+    
+    def _post(self, method: str, timeout: float = 10, **kwargs):
+        with self._session_lock:
+            session = self._get_session()
+        return session.post(f"{self.base_url}/{method}", timeout=timeout, **kwargs)
+    
+    def _wait_for_rate_limit(self, chat_id: str):
+        """Chat başına hız sınırını aşmamak için gerekirse bekle."""
+        per_minute = self.GROUP_MESSAGES_PER_MINUTE if str(chat_id).startswith('-') else None
+        
+        with self._rate_lock:
+            sent = self._sent_times.setdefault(str(chat_id), deque(maxlen=self.GROUP_MESSAGES_PER_MINUTE))
+            now = time.monotonic()
+            wait = 0.0
+            if sent:
+                wait = max(wait, sent[-1] + self.min_interval - now)
+            if per_minute and len(sent) >= per_minute:
+                wait = max(wait, sent[0] + 60.0 - now)
+            sent.append(now + max(wait, 0.0))
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _attempt(self, method: str, payload: Dict[str, Any]) -> Tuple[bool, bool, Optional[float], str]:
+        """Tek gönderim denemesi -> (başarılı, kalıcı_hata, retry_after, hata)."""
+        self._wait_for_rate_limit(payload.get("chat_id", self.chat_id))
+        
+        try:
+            response = self._post(method, json=payload)
+        except Exception as e:
+            return False, False, None, str(e)
+        
+        if response.status_code == 200:
+            self.stats["sent"] += 1
+            return True, False, None, ""
+        
+        error = f"HTTP {response.status_code}"
+        if response.status_code == 429:
+            try:
+                return False, False, response.json().get("parameters", {}).get("retry_after"), error
+            except ValueError:
+                return False, False, None, error
+        
+        # 4xx kalıcı hatadır (ör. yanlış chat id) - tekrar denemenin anlamı yok
+        return False, response.status_code < 500, None, error
+    
+    def _backoff(self, attempt: int) -> float:
+        return min(self.BACKOFF_MAX, self.BACKOFF_BASE * (2 ** attempt))
+    
+    def _deliver(self, method: str, payload: Dict[str, Any], retries: int = 0) -> bool:
+        """İsteği gönder; 429 / 5xx / bağlantı hatasında geri çekilerek tekrar dene."""
+        for attempt in range(retries + 1):
+            ok, permanent, retry_after, error = self._attempt(method, payload)
+            if ok:
+                return True
+            if permanent:
+                break
+            
+            if attempt < retries:
+                self.stats["retried"] += 1
+                delay = retry_after or self._backoff(attempt)
+                print(f"Telegram send retry ({error}) - {delay:.0f}s sonra")
+                time.sleep(delay)
+        
+        self.stats["failed"] += 1
+        print(f"Telegram send error: {error}")
+        return False
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # GÖNDERİM KUYRUĞU
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                target = self._outbox_loop if self.outbox else self._delivery_loop
+                self._worker = threading.Thread(target=target, name="telegram-notifier", daemon=True)
+                self._worker.start()
+    
+    def _outbox_loop(self):
+        """Kalıcı kuyruktaki bildirimleri gönder (kapanana kadar)."""
+        while not self._closing.is_set():
+            self._wake.clear()
+            try:
+                entries = self.outbox.claim_due()
+            except Exception as e:
+                print(f"Telegram outbox error: {e}")
+                entries = []
+            
+            if not entries:
+                due_in = self.outbox.next_due_in() if not self._closing.is_set() else None
+                self._wake.wait(min(due_in, 30.0) if due_in is not None else 30.0)
+                continue
+            
+            self._busy = True
+            try:
+                for entry in entries:
+                    ok, permanent, retry_after, error = self._attempt(entry["method"], entry["payload"])
+                    if ok:
+                        self.outbox.mark_sent(entry["id"])
+                    elif permanent:
+                        self.stats["failed"] += 1
+                        print(f"Telegram send error: {error}")
+                        self.outbox.mark_failed(entry["id"], error)
+                    else:
+                        # Ağ yok / sunucu hatası: kayıt diskte kalır, sonra tekrar denenir
+                        self.stats["retried"] += 1
+                        self.outbox.retry_later(entry["id"], retry_after or self._backoff(entry["attempts"]), error)
+            except Exception as e:
+                print(f"Telegram notifier error: {e}")
+            finally:
+                self._busy = False
+    
+    def _delivery_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._deliver(item["method"], item["payload"], retries=self.max_retries)
+            except Exception as e:
+                print(f"Telegram notifier error: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def enqueue_message(self, text: str, parse_mode: str = "HTML", disable_notification: bool = False,
+                        dedupe_key: Optional[str] = None) -> bool:
+        """Mesajı gönderim kuyruğuna ekle (beklemeden döner)."""
         if not self.enabled:
             return False
         
-        url = f"{self.base_url}/sendMessage"
-        payload = {
+        item = {"method": "sendMessage", "payload": self._message_payload(text, parse_mode, disable_notification)}
+        
+        if self.outbox:
+            try:
+                # Kalıcı kuyruk da bellek kuyruğu ile aynı sınıra tabidir
+                if self.outbox.pending_count() >= self._queue.maxsize:
+                    self.stats["dropped"] += 1
+                    print("⚠️ Telegram kuyruğu dolu - bildirim atlandı")
+                    return False
+                added = self.outbox.put(item["method"], item["payload"], dedupe_key)
+            except Exception as e:
+                print(f"Telegram outbox error: {e}")
+                return False
+            self._ensure_worker()
+            self._wake.set()
+            return added
+        
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats["dropped"] += 1
+            print("⚠️ Telegram kuyruğu dolu - bildirim atlandı")
+            return False
+        
+        self._ensure_worker()
+        return True
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Kuyruktaki mesajlar gönderilene kadar en fazla timeout saniye bekle."""
+        deadline = time.monotonic() + timeout
+        
+        if self.outbox:
+            self._wake.set()
+            while self.outbox.pending_count():
+                remaining = deadline - time.monotonic()
+                due_in = self.outbox.next_due_in()
+                # Geri çekilmede bekleyen kayıtlar süre içinde denenmeyecekse boşuna bekleme
+                if remaining <= 0 or (not self._busy and due_in is not None and due_in > remaining):
+                    return False
+                time.sleep(0.05)
+            return True
+        
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+    
+    def close(self, timeout: float = 5.0):
+        """
+        Bekleyen özeti gönder, kuyruğu en fazla timeout saniye boşalt, thread'i durdur.
+        Outbox kullanılıyorsa gönderilemeyenler bir sonraki açılışta gönderilir.
+        """
+        self.flush_digest()
+        flushed = self.flush(timeout)
+        
+        self._closing.set()
+        self._wake.set()
+        if self._worker and self._worker.is_alive():
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._worker.join(timeout=2)
+        
+        if self.outbox:
+            if not flushed:
+                print(f"📮 {self.outbox.pending_count()} bildirim sonraki açılışta gönderilecek")
+            self.outbox.release_sending()
+            self.outbox.close()
+        
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # ÖZET (DIGEST) MODU
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    @property
+    def digest_enabled(self) -> bool:
+        return self.digest_window > 0
+    
+    def _add_digest_event(self, kind: str, task_name: str, detail: str = "", delivered: bool = False):
+        """Olayı biriktir; pencerenin ilk olayı zamanlayıcıyı başlatır.
+        
+        delivered: Olay ayrıca anında gönderildi (tasarruf hesabına girmez).
+        """
+        with self._digest_lock:
+            if not self._digest_events:
+                self._digest_started = datetime.now()
+                self._digest_timer = threading.Timer(self.digest_window, self.flush_digest)
+                self._digest_timer.daemon = True
+                self._digest_timer.start()
+            self._digest_events.setdefault(kind, []).append((task_name, detail))
+            if delivered:
+                self._digest_delivered += 1
+            self.stats["digest_events"] += 1
+        return True
+    
+    def flush_digest(self) -> bool:
+        """Biriken olayları tek özet mesajı olarak kuyruğa ekle."""
+        with self._digest_lock:
+            events, self._digest_events = self._digest_events, {}
+            delivered, self._digest_delivered = self._digest_delivered, 0
+            started = self._digest_started
+            if self._digest_timer:
+                self._digest_timer.cancel()
+                self._digest_timer = None
+        
+        if not events:
+            return False
+        
+        total = sum(len(items) for items in events.values())
+        pending = total - delivered
+        if pending <= 0:
+            # Penceredeki her olay zaten anında gönderildi; özet tekrar olur
+            return False
+        self.stats["digests"] += 1
+        self.stats["digest_saved"] += pending - 1
+        return self.enqueue_message(self._format_digest(events, started, total), disable_notification=not events.get("failed"))
+    
+    def _format_digest(self, events: Dict[str, list], started: Optional[datetime], total: int) -> str:
+        def names(items):
+            listed = ", ".join(name for name, _ in items[:self.DIGEST_MAX_NAMES])
+            extra = len(items) - self.DIGEST_MAX_NAMES
+            return f"{listed} +{extra}" if extra > 0 else listed
+        
+        started_str = started.strftime('%H:%M') if started else "--:--"
+        lines = [f"📦 <b>ÖZET</b> ({started_str} - {datetime.now().strftime('%H:%M')})", ""]
+        
+        summary = []
+        for kind, icon in (("completed", "✅"), ("failed", "❌"), ("started", "▶️"), ("retry", "🔄")):
+            if events.get(kind):
+                summary.append(f"{len(events[kind])} {icon}")
+        lines.append(", ".join(summary))
+        
+        if events.get("failed"):
+            lines.append("")
+            lines.append(f"❌ <b>Hatalı:</b> {names(events['failed'])}")
+            for name, detail in events["failed"][:3]:
+                if detail:
+                    lines.append(f"  └ {name}: <code>{detail[:100]}</code>")
+        if events.get("retry"):
+            lines.append(f"🔄 <b>Tekrar:</b> {names(events['retry'])}")
+        if events.get("completed") and len(events["completed"]) <= self.DIGEST_MAX_NAMES:
+            lines.append(f"✅ {names(events['completed'])}")
+        
+        lines.append("")
+        lines.append(f"💬 {total} bildirim tek mesajda birleştirildi")
+        return "\n".join(lines)
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # DOĞRUDAN GÖNDERİM
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    def _message_payload(self, text: str, parse_mode: str, disable_notification: bool) -> Dict[str, Any]:
+        return {
             "chat_id": self.chat_id,
             "text": text,
             "parse_mode": parse_mode,
             "disable_notification": disable_notification
         }
-        
-        try:
-            response = requests.post(url, json=payload, timeout=10)
-            return response.status_code == 200
-        except Exception as e:
-            print(f"Telegram send error: {e}")
+    
+    def send_message(self, text: str, parse_mode: str = "HTML", disable_notification: bool = False) -> bool:
+        """Telegram mesajı gönder (senkron, tek deneme)."""
+        if not self.enabled:
             return False
+        
+        return self._deliver("sendMessage", self._message_payload(text, parse_mode, disable_notification))
     
     def send_photo(self, photo_path: str, caption: str = "") -> bool:
         """Fotoğraf gönder."""
         if not self.enabled:
             return False
         
-        url = f"{self.base_url}/sendPhoto"
-        
         try:
             with open(photo_path, 'rb') as photo:
                 files = {'photo': photo}
@@ -56,7 +405,7 @@ class TelegramManager:
                     'caption': caption,
                     'parse_mode': 'HTML'
                 }
-                response = requests.post(url, files=files, data=data, timeout=30)
+                response = self._post("sendPhoto", timeout=30, files=files, data=data)
                 return response.status_code == 200
         except Exception as e:
             print(f"Telegram photo send error: {e}")
@@ -67,8 +416,6 @@ class TelegramManager:
         if not self.enabled:
             return False
         
-        url = f"{self.base_url}/sendDocument"
-        
         try:
             with open(document_path, 'rb') as doc:
                 files = {'document': doc}
@@ -77,7 +424,7 @@ class TelegramManager:
                     'caption': caption,
                     'parse_mode': 'HTML'
                 }
-                response = requests.post(url, files=files, data=data, timeout=30)
+                response = self._post("sendDocument", timeout=30, files=files, data=data)
                 return response.status_code == 200
         except Exception as e:
             print(f"Telegram document send error: {e}")
@@ -88,10 +435,10 @@ class TelegramManager:
         if not self.bot_token:
             return {"success": False, "error": "Bot token boş"}
         
-        url = f"{self.base_url}/getMe"
-        
         try:
-            response = requests.get(url, timeout=10)
+            with self._session_lock:
+                session = self._get_session()
+            response = session.get(f"{self.base_url}/getMe", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('ok'):
@@ -109,8 +456,11 @@ class TelegramManager:
     # ÖZEL BİLDİRİM MESAJLARI
     # ═══════════════════════════════════════════════════════════════════════
     
-    def notify_task_started(self, task_name: str, priority: int = 3):
+    def notify_task_started(self, task_name: str, priority: int = 3, dedupe_key: Optional[str] = None):
         """Görev başladı bildirimi."""
+        if self.digest_enabled:
+            return self._add_digest_event("started", task_name)
+        
         emoji = {1: "🔴", 2: "🟡", 3: "🔵", 4: "⚪"}.get(priority, "🔵")
         
         message = (
@@ -118,10 +468,14 @@ class TelegramManager:
             f"{emoji} <b>{task_name}</b>\n"
             f"⏰ {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}"
         )
-        return self.send_message(message)
+        return self.enqueue_message(message, dedupe_key=dedupe_key)
     
-    def notify_task_completed(self, task_name: str, duration: float, success: bool = True):
+    def notify_task_completed(self, task_name: str, duration: float, success: bool = True,
+                              dedupe_key: Optional[str] = None):
         """Görev tamamlandı bildirimi."""
+        if self.digest_enabled:
+            return self._add_digest_event("completed" if success else "failed", task_name)
+        
         icon = "✅" if success else "❌"
         status = "BAŞARILI" if success else "BAŞARISIZ"
         
@@ -135,27 +489,61 @@ class TelegramManager:
             f"⏱ Süre: {duration_str}\n"
             f"⏰ {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}"
         )
-        return self.send_message(message)
+        return self.enqueue_message(message, dedupe_key=dedupe_key)
     
-    def notify_task_error(self, task_name: str, error: str):
+    def notify_task_error(self, task_name: str, error: str, dedupe_key: Optional[str] = None):
         """Görev hatası bildirimi."""
+        if self.digest_enabled:
+            if self.digest_errors_immediate:
+                # Hata pencereyi beklemeden gönderilir; özette bağlam olarak
+                # listelenir ama tasarruf hesabına girmez
+                self._add_digest_event("failed", task_name, error, delivered=True)
+            else:
+                return self._add_digest_event("failed", task_name, error)
+        
         message = (
             f"⚠️ <b>GÖREV HATASI</b>\n\n"
             f"📌 <b>{task_name}</b>\n"
             f"❌ Hata: <code>{error[:200]}</code>\n"
             f"⏰ {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}"
         )
-        return self.send_message(message)
+        return self.enqueue_message(message, dedupe_key=dedupe_key)
     
-    def notify_task_retry(self, task_name: str, current_retry: int, max_retry: int):
+    def notify_task_retry(self, task_name: str, current_retry: int, max_retry: int,
+                          dedupe_key: Optional[str] = None):
         """Görev tekrar denemesi bildirimi."""
+        if self.digest_enabled:
+            return self._add_digest_event("retry", task_name, f"{current_retry}/{max_retry}")
+        
         message = (
             f"🔄 <b>GÖREV TEKRAR DENENİYOR</b>\n\n"
             f"📌 <b>{task_name}</b>\n"
             f"🔢 Deneme: {current_retry}/{max_retry}\n"
             f"⏰ {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}"
         )
-        return self.send_message(message, disable_notification=True)
+        return self.enqueue_message(message, disable_notification=True, dedupe_key=dedupe_key)
+    
+    def notify_circuit_open(self, task_name: str, failed_cycles: int, open_until: str,
+                            dedupe_key: Optional[str] = None):
+        """Devre açıldı - görev art arda başarısız olduğu için durduruldu (özet beklenmez)."""
+        message = (
+            f"🔌 <b>GÖREV DURDURULDU</b>\n\n"
+            f"📌 <b>{task_name}</b>\n"
+            f"❌ Art arda {failed_cycles} döngü başarısız\n"
+            f"🔁 Deneme çalıştırması: {open_until}\n"
+            f"⏰ {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}"
+        )
+        return self.enqueue_message(message, dedupe_key=dedupe_key)
+    
+    def notify_circuit_closed(self, task_name: str, dedupe_key: Optional[str] = None):
+        """Devre kapandı - deneme çalıştırması başarılı."""
+        message = (
+            f"✅ <b>GÖREV TEKRAR ÇALIŞIYOR</b>\n\n"
+            f"📌 <b>{task_name}</b>\n"
+            f"🔌 Deneme çalıştırması başarılı, normal zamanlamaya dönüldü\n"
+            f"⏰ {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}"
+        )
+        return self.enqueue_message(message, dedupe_key=dedupe_key)
     
     def send_daily_report(self, stats: Dict[str, Any]):
         """Günlük rapor gönder."""
@@ -166,11 +554,31 @@ class TelegramManager:
             f"▶️ Toplam Çalıştırma: {stats.get('total_runs', 0)}\n"
             f"✅ Başarılı: {stats.get('success', 0)}\n"
             f"❌ Başarısız: {stats.get('failed', 0)}\n"
-            f"⏸ Duraklatıldı: {stats.get('paused', 0)}\n"
+            + (f"💾 Girdi değişmediği için atlanan: {stats['cached']}\n" if stats.get('cached') else "")
+            + f"⏸ Duraklatıldı: {stats.get('paused', 0)}\n"
             f"⏹ Süresi Doldu: {stats.get('expired', 0)}\n\n"
             f"⏱ Toplam Çalışma Süresi: {stats.get('total_duration', '0')} saat"
         )
-        return self.send_message(message)
+        
+        categories = stats.get('categories') or {}
+        if categories:
+            message += "\n\n📂 <b>Kategoriler:</b>\n"
+            for name, data in sorted(categories.items(), key=lambda x: x[1]['runs'], reverse=True):
+                message += f"• {name}: {data['runs']} (✅ {data['success']} / ❌ {data['failed']})\n"
+        
+        slowest = stats.get('slowest') or []
+        if slowest:
+            message += "\n🐢 <b>En Uzun Süren:</b>\n"
+            for item in slowest:
+                message += f"• {item['name']}: ort. {item['avg_duration']:.1f}sn (en fazla {item['max_duration']:.1f}sn)\n"
+        
+        regressions = stats.get('regressions') or []
+        if regressions:
+            message += "\n⚠️ <b>Yavaşlayan Görevler:</b>\n"
+            for item in regressions:
+                message += f"• {item['name']}: {item['baseline']:.1f}sn → {item['avg_duration']:.1f}sn (x{item['factor']:.1f})\n"
+        
+        return self.enqueue_message(message.rstrip())
     
     def send_system_info(self, info: Dict[str, Any]):
         """Sistem bilgisi gönder."""
@@ -182,7 +590,7 @@ class TelegramManager:
             f"📝 Aktif Görev: {info.get('active_tasks', 0)}\n"
             f"⏰ Çalışma Süresi: {info.get('uptime', 'N/A')}"
         )
-        return self.send_message(message)
+        return self.enqueue_message(message)
     
     def send_welcome_message(self):
         """Hoş geldin mesajı."""
@@ -193,7 +601,7 @@ class TelegramManager:
             f"🏥 <i>Hospital Automation Edition</i>\n"
             f"👨‍💻 Mustafa GÜNEŞDOĞDU (MGdizayn)"
         )
-        return self.send_message(message)
+        return self.enqueue_message(message)
     
     def send_shutdown_message(self, stats: Optional[Dict[str, Any]] = None):
         """Kapanış mesajı."""
@@ -208,7 +616,7 @@ class TelegramManager:
             )
         
         message += f"⏰ {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}"
-        return self.send_message(message)
+        return self.enqueue_message(message)
 
 
 def create_telegram_manager(config) -> Optional[TelegramManager]:
@@ -220,4 +628,27 @@ def create_telegram_manager(config) -> Optional[TelegramManager]:
         print("⚠️ Telegram ayarları eksik!")
         return None
     
-    return TelegramManager(config.telegram_bot_token, config.telegram_chat_id)
+    outbox = None
+    if config.telegram_outbox_enabled:
+        outbox = NotificationOutbox(Path(config.telegram_outbox_db), config.telegram_outbox_max_age)
+    
+    manager = TelegramManager(
+        config.telegram_bot_token, config.telegram_chat_id,
+        api_url=config.telegram_api_url,
+        queue_size=config.telegram_queue_size,
+        min_interval=config.telegram_min_interval,
+        max_retries=config.telegram_max_retries,
+        digest_window=config.telegram_digest_window if config.telegram_digest_enabled else 0,
+        digest_errors_immediate=config.telegram_digest_errors_immediate,
+        outbox=outbox
+    )
+    
+    # Önceki çalışmadan kalan bildirimler hemen gönderilmeye başlanır (kuyruk sınırı içinde)
+    if outbox:
+        dropped = outbox.trim(config.telegram_queue_size)
+        if dropped:
+            manager.stats["dropped"] += dropped
+            print(f"⚠️ Telegram kuyruğu dolu - önceki çalışmadan {dropped} bildirim atlandı")
+        if outbox.pending_count():
+            manager._ensure_worker()
+    return manager
@@ -8,26 +8,91 @@ Support: Ahmet KAHREMAN (CMX)
 import os
 import sys
 import json
-import hashlib
-import shutil
+import time
+import socket
+import threading
+import importlib
+import importlib.util
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
-import subprocess
 
-try:
-    from plyer import notification as plyer_notification
-    PLYER_AVAILABLE = True
-except ImportError:
-    PLYER_AVAILABLE = False
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LAZY IMPORT - Opsiyonel/ağır modüller ilk kullanımda yüklenir
+# ═══════════════════════════════════════════════════════════════════════════
+
+# İlk kullanımda yüklenen modüllerin import süreleri (saniye)
+LAZY_IMPORT_TIMES: Dict[str, float] = {}
+
+
+def is_module_available(name: str) -> bool:
+    """Modülü import etmeden kurulu olup olmadığını kontrol et."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """İlk attribute erişiminde gerçek modülü import eden vekil (proxy)."""
+    
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+    
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            name = self.__dict__['_name']
+            started = time.perf_counter()
+            module = importlib.import_module(name)
+            LAZY_IMPORT_TIMES[name] = time.perf_counter() - started
+            self.__dict__['_module'] = module
+        return module
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+    
+    def __repr__(self):
+        state = "yüklendi" if self.__dict__['_module'] is not None else "bekliyor"
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Modülü tembel (lazy) olarak import et."""
+    return LazyModule(name)
+
+
+PLYER_AVAILABLE = is_module_available("plyer")
 
 
 class FileManager:
     """Dosya işlemleri yöneticisi."""
     
+    # Hedef dosya başına kilit - .tmp ve .backup dosyaları ortaktır, aynı dosyaya
+    # eşzamanlı iki yazma birbirinin geçici dosyasını taşıyıp silebilir
+    _write_locks: Dict[str, threading.Lock] = {}
+    _write_locks_guard = threading.Lock()
+    
+    @classmethod
+    def _write_lock(cls, file_path: Path) -> threading.Lock:
+        key = os.path.abspath(file_path)
+        with cls._write_locks_guard:
+            return cls._write_locks.setdefault(key, threading.Lock())
+    
     @staticmethod
     def atomic_write(file_path: Path, data: Any, format: str = 'json'):
-        """Atomic write ile güvenli yazma."""
+        """Atomic write ile güvenli yazma (aynı dosyaya yazmalar sıraya alınır)."""
+        with FileManager._write_lock(file_path):
+            return FileManager._atomic_write(file_path, data, format)
+    
+    @staticmethod
+    def _atomic_write(file_path: Path, data: Any, format: str):
+        import shutil
+        
         temp_path = file_path.with_suffix('.tmp')
         backup_path = file_path.with_suffix('.backup')
         
@@ -35,11 +100,15 @@ class FileManager:
             if file_path.exists():
                 shutil.copy2(file_path, backup_path)
             
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                if format == 'json':
-                    json.dump(data, f, indent=4, ensure_ascii=False)
-                else:
-                    f.write(str(data))
+            if format == 'bytes':
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+            else:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    if format == 'json':
+                        json.dump(data, f, indent=4, ensure_ascii=False)
+                    else:
+                        f.write(str(data))
             
             temp_path.replace(file_path)
             
@@ -63,30 +132,37 @@ class FileManager:
             return default
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                if format == 'json':
-                    return json.load(f)
-                else:
-                    return f.read()
+            return FileManager._read_as(file_path, format)
         except Exception:
             backup_path = file_path.with_suffix('.backup')
             if backup_path.exists():
                 try:
-                    with open(backup_path, 'r', encoding='utf-8') as f:
-                        if format == 'json':
-                            return json.load(f)
-                        else:
-                            return f.read()
+                    return FileManager._read_as(backup_path, format)
                 except:
                     pass
             return default
     
+    @staticmethod
+    def _read_as(file_path: Path, format: str):
+        """Dosyayı istenen formatta oku (json / bytes / text)."""
+        if format == 'bytes':
+            with open(file_path, 'rb') as f:
+                return f.read()
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if format == 'json':
+                return json.load(f)
+            else:
+                return f.read()
+    
     @staticmethod
     def get_file_hash(file_path: Path) -> str:
         """Dosya hash'i hesapla."""
         if not file_path.exists():
             return ""
         
+        import hashlib
+        
         hash_md5 = hashlib.md5()
         with open(file_path, "rb") as f:
             for chunk in iter(lambda: f.read(4096), b""):
@@ -104,6 +180,77 @@ class FileManager:
             print(f"Cleanup error: {e}")
 
 
+class StartupProfiler:
+    """Açılış aşamalarının sürelerini ölçer ve loglar."""
+    
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def start(self, name: str):
+        with self._lock:
+            self._started[name] = time.perf_counter()
+    
+    def finish(self, name: str) -> float:
+        """Aşamayı bitir ve süresini logla (saniye döner)."""
+        now = time.perf_counter()
+        with self._lock:
+            started = self._started.pop(name, self.origin)
+            duration = now - started
+            self.durations[name] = duration
+        print(f"⏱ Açılış [{name}]: {duration * 1000:.0f} ms (t+{(now - self.origin) * 1000:.0f} ms)")
+        return duration
+    
+    def finish_once(self, name: str):
+        """Aşama başlatılmışsa bitir (tekrarlanan çağrıları yok sayar)."""
+        with self._lock:
+            pending = name in self._started
+        if pending:
+            self.finish(name)
+    
+    @contextmanager
+    def phase(self, name: str):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.finish(name)
+    
+    def summary(self) -> str:
+        """Tüm aşamaların tek satırlık özeti."""
+        return " | ".join(f"{name}: {duration * 1000:.0f} ms" for name, duration in self.durations.items())
+
+
+class SingleInstance:
+    """Tek kopya kilidi - localhost portunu bağlayarak ikinci açılışı engeller."""
+
+    def __init__(self, port: int = 65432):
+        self.lock_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if sys.platform != 'win32':
+            # Kontrol API bağlantılarından kalan TIME_WAIT yeniden açılışı engellemesin
+            # (Windows'ta SO_REUSEADDR dinlenen portu paylaştırır, orada kullanılmaz)
+            self.lock_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.port = port
+        
+    def is_running(self):
+        try:
+            self.lock_socket.bind(("127.0.0.1", self.port))
+            # SO_REUSEADDR ile sadece bağlı (dinlemeyen) bir port ikinci kopyaya da
+            # bağlanabilir - kontrol API'si kapalı olsa da kilit soketi hep dinler
+            self.lock_socket.listen(5)
+            return False
+        except socket.error:
+            return True
+    
+    def __del__(self):
+        try:
+            self.lock_socket.close()
+        except:
+            pass
+
+
 class NotificationManager:
     """Bildirim yöneticisi."""
     
@@ -114,6 +261,7 @@ class NotificationManager:
             return False
         
         try:
+            from plyer import notification as plyer_notification
             plyer_notification.notify(
                 title=title,
                 message=message,
@@ -136,6 +284,21 @@ class DateTimeHelper:
         except:
             return None
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def parse_schedule_time(date_str: str) -> datetime:
+        """
+        Görev zamanını ("%d.%m.%Y %H:%M") parse et - hatalıysa ValueError.
+        Aynı dakikaya planlanmış görevler aynı string'i paylaştığından önbelleklenir.
+        """
+        return datetime.strptime(date_str, "%d.%m.%Y %H:%M")
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def format_schedule_time(dt: datetime) -> str:
+        """parse_schedule_time'ın tersi - zamanlayıcı her turda aynı dakikaları yazdığından önbelleklenir."""
+        return dt.strftime("%d.%m.%Y %H:%M")
+    
     @staticmethod
     def format_datetime(dt: datetime, format: str = "%d.%m.%Y %H:%M") -> str:
         """Datetime'ı string'e çevir."""
@@ -158,6 +321,15 @@ class DateTimeHelper:
             hours_interval = 24 / freq_val
             return current + timedelta(hours=hours_interval)
     
+    @staticmethod
+    def next_run_after(current: datetime, freq_type: str, freq_val: int, now: datetime) -> datetime:
+        """current'tan sonra now'ı geçen ilk çalıştırma zamanı (kaçırılan zamanlar atlanır)."""
+        next_time = DateTimeHelper.calculate_next_run(current, freq_type, freq_val)
+        interval = next_time - current
+        if next_time <= now:
+            next_time += interval * ((now - next_time) // interval + 1)
+        return next_time
+    
     @staticmethod
     def humanize_duration(seconds: float) -> str:
         """Süreyi okunabilir formata çevir."""
@@ -195,6 +367,8 @@ class ProcessManager:
     @staticmethod
     def is_process_running(pid: int) -> bool:
         """Process çalışıyor mu kontrol et."""
+        import subprocess
+        
         try:
             if sys.platform == 'win32':
                 result = subprocess.run(
@@ -212,6 +386,8 @@ class ProcessManager:
     @staticmethod
     def kill_process(pid: int) -> bool:
         """Process'i sonlandır."""
+        import subprocess
+        
         try:
             if sys.platform == 'win32':
                 subprocess.run(['taskkill', '/F', '/PID', str(pid)], check=True)
@@ -241,6 +417,8 @@ class SystemInfo:
     @staticmethod
     def get_disk_usage(path: str = ".") -> Dict[str, int]:
         """Disk kullanımı."""
+        import shutil
+        
         try:
             total, used, free = shutil.disk_usage(path)
             return {
@@ -253,6 +431,99 @@ class SystemInfo:
             return {}
 
 
+class ImportReport:
+    """Açılış import sürelerini ölçer (-X importtime tarzı rapor)."""
+    
+    # GUI açılışında yüklenen modüller: main.run_gui'nin import sırası, ardından app_window.
+    # app_window geri kalanını (task_repository, task_storage, task_history, retry_policy,
+    # event_bus, file_triggers, sharding...) çeker; -X importtime bunları ayrı satırlarda gösterir.
+    STARTUP_MODULES = ["config", "utils", "control_api", "custom_dialogs", "customtkinter",
+                       "telegram_manager", "scheduler_service", "app_window"]
+    
+    # İlk kullanımda yüklenen opsiyonel modüller
+    LAZY_MODULES = ["requests", "pystray", "PIL.Image", "plyer", "msgpack"]
+    
+    @staticmethod
+    def measure(modules: List[str]) -> List[Dict[str, Any]]:
+        """
+        Modüllerin import sürelerini ölç.
+        Normal Python'da ayrı bir süreçte `-X importtime` kullanılır; PyInstaller
+        build'inde (-X desteklenmez) her modül bu süreçte tek tek ölçülür.
+        """
+        if getattr(sys, 'frozen', False):
+            return ImportReport._measure_in_process(modules)
+        
+        import subprocess
+        
+        # Eksik modül raporu yarıda kesmesin
+        code = "\n".join(f"try:\n    import {name}\nexcept ImportError:\n    pass" for name in modules)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+            cwd=str(Path(__file__).parent.absolute())
+        )
+        
+        rows = []
+        for line in proc.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            try:
+                self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+                rows.append({
+                    "module": name.strip(),
+                    "depth": (len(name) - len(name.lstrip())) // 2,
+                    "self_ms": int(self_us) / 1000,
+                    "cumulative_ms": int(cumulative_us) / 1000
+                })
+            except ValueError:
+                continue
+        return rows
+    
+    @staticmethod
+    def _measure_in_process(modules: List[str]) -> List[Dict[str, Any]]:
+        rows = []
+        for name in modules:
+            already_loaded = name in sys.modules
+            started = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            rows.append({"module": name, "depth": 0, "self_ms": elapsed_ms,
+                         "cumulative_ms": 0.0 if already_loaded else elapsed_ms})
+        return rows
+    
+    @staticmethod
+    def print_report(top: int = 25) -> int:
+        """Açılış ve lazy modüller için import raporunu yazdır."""
+        print("=" * 70)
+        print("MGD TASK SCHEDULER PRO v4.0 - AÇILIŞ IMPORT RAPORU")
+        print("=" * 70)
+        
+        startup = ImportReport.measure(ImportReport.STARTUP_MODULES)
+        total_ms = sum(r["cumulative_ms"] for r in startup if r["depth"] == 0)
+        print(f"\n🚀 Açılışta yüklenen modüller (toplam ~{total_ms:.0f} ms) - en yavaş {top}:")
+        print("-" * 70)
+        for row in sorted(startup, key=lambda r: r["cumulative_ms"], reverse=True)[:top]:
+            print(f"{row['cumulative_ms']:>9.1f} ms  {row['self_ms']:>8.1f} ms  {row['module']}")
+        
+        print("\n💤 İlk kullanımda yüklenen (lazy) modüller:")
+        print("-" * 70)
+        for name in ImportReport.LAZY_MODULES:
+            if not is_module_available(name.split(".")[0]):
+                print(f"{'-':>9}     {name} (yüklü değil)")
+                continue
+            rows = ImportReport.measure([name])
+            own = [r for r in rows if r["module"] == name]
+            cost = own[-1]["cumulative_ms"] if own else sum(r["self_ms"] for r in rows)
+            print(f"{cost:>9.1f} ms  {name}")
+        
+        print("=" * 70)
+        return 0
+
+
 def validate_email(email: str) -> bool:
     """Email validasyonu."""
     import re